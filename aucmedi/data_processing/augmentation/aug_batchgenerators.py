@@ -26,6 +26,8 @@ from batchgenerators.transforms.color_transforms import ContrastAugmentationTran
 from batchgenerators.transforms.noise_transforms import GaussianNoiseTransform
 import warnings
 import numpy as np
+# Internal libraries
+from aucmedi.data_processing.augmentation.random_state import seeded_random_state
 
 #-----------------------------------------------------#
 #        AUCMEDI Batchgenerators Augmentation         #
@@ -230,13 +232,15 @@ class BatchgeneratorsAugmentation():
     #-----------------------------------------------------#
     #                 Perform Augmentation                #
     #-----------------------------------------------------#
-    def apply(self, image):
+    def apply(self, image, seed=None):
         """ Performs image augmentation with defined configuration on an image.
 
         This **internal** function is called in the DataGenerator during batch generation.
 
         Args:
             image (numpy.ndarray):          An image encoded as NumPy array with shape (z, y, x, channels).
+            seed (int):                     Seed for the random state of the augmentation. If `None` is provided,
+                                            the global random state is used.
         Returns:
             aug_image (numpy.ndarray):      An augmented / transformed image.
         """
@@ -245,7 +249,8 @@ class BatchgeneratorsAugmentation():
         image_bg = np.expand_dims(image_bg, axis=0)
         image_bg = np.moveaxis(image_bg, -1, 1)
         # Perform image augmentation
-        aug_image = self.operator(data=image_bg)["data"]
+        with seeded_random_state(seed):
+            aug_image = self.operator(data=image_bg)["data"]
         # Remove batch axis and return to channel last
         aug_image = np.moveaxis(aug_image, 1, -1)
         aug_image = np.squeeze(aug_image, axis=0)
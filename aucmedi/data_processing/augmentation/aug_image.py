@@ -26,6 +26,9 @@ import cv2
 import warnings
 import numpy as np
 import random
+# Internal libraries
+from aucmedi.data_processing.augmentation.random_state import seeded_random_state, \
+                                                              thread_local_copy
 
 #-----------------------------------------------------#
 #              AUCMEDI Image Augmentation             #
@@ -271,13 +274,15 @@ class ImageAugmentation():
     #-----------------------------------------------------#
     #                 Perform Augmentation                #
     #-----------------------------------------------------#
-    def apply(self, image):
+    def apply(self, image, seed=None):
         """ Performs image augmentation with defined configuration on an image.
 
         This **internal** function is called in the DataGenerator during batch generation.
 
         Args:
             image (numpy.ndarray):          An image encoded as NumPy array with shape (x, y, channels).
+            seed (int):                     Seed for the random state of the augmentation. If `None` is provided,
+                                            the global random state is used.
         Returns:
             aug_image (numpy.ndarray):      An augmented / transformed image.
         """
@@ -288,13 +293,24 @@ class ImageAugmentation():
                           np.min(image), np.max(image))
         # Cache image shape
         org_shape = image.shape
-        # Perform image augmentation
-        aug_image = self.operator(image=image)["image"]
-        # Perform padding & cropping if image shape changed
-        if self.refine and aug_image.shape != org_shape:
-            aug_image = ai.pad(aug_image, org_shape[0], org_shape[1], border_mode=cv2.BORDER_REPLICATE, 
-                                value=0)
-            aug_image = ai.RandomCrop(height=org_shape[0], width=org_shape[1])(image=aug_image)["image"]
+        # Seed internal random generators of a thread-exclusive operator copy if available
+        operator = self.operator
+        seeded = seed is not None and hasattr(operator, "set_random_seed")
+        if seeded:
+            operator = thread_local_copy(operator)
+            operator.set_random_seed(seed)
+        # Otherwise, seed the global random state
+        with seeded_random_state(None if seeded else seed):
+            # Perform image augmentation
+            aug_image = operator(image=image)["image"]
+            # Perform padding & cropping if image shape changed
+            if self.refine and aug_image.shape != org_shape:
+                aug_image = ai.pad(aug_image, org_shape[0], org_shape[1], border_mode=cv2.BORDER_REPLICATE, 
+                                    value=0)
+                cropper = ai.RandomCrop(height=org_shape[0], width=org_shape[1])
+                if seed is not None and hasattr(cropper, "set_random_seed"):
+                    cropper.set_random_seed(seed)
+                aug_image = cropper(image=aug_image)["image"]
         # Perform clipping if image is out of grayscale/RGB encodings
         if self.refine and (np.min(aug_image) < 0 or np.max(aug_image) > 255):
             aug_image = np.clip(aug_image, a_min=0, a_max=255)
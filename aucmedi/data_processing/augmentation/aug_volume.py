@@ -25,6 +25,8 @@ from volumentations import augmentations as ai
 import warnings
 import numpy as np
 import random
+# Internal libraries
+from aucmedi.data_processing.augmentation.random_state import seeded_random_state
 
 #-----------------------------------------------------#
 #             AUCMEDI Volume Augmentation             #
@@ -289,10 +291,12 @@ class VolumeAugmentation():
 
     Args:
         image (numpy.ndarray):          An image encoded as NumPy array with shape (z, y, x, channels).
+        seed (int):                     Seed for the random state of the augmentation. If `None` is provided,
+                                        the global random state is used.
     Returns:
         aug_image (numpy.ndarray):      An augmented / transformed image.
     """
-    def apply(self, image):
+    def apply(self, image, seed=None):
         # Verify that image is in grayscale/RGB encoding
         if np.min(image) < 0 or np.max(image) > 255:
             warnings.warn("Image Augmentation: A value of the image is lower than 0 or higher than 255.",
@@ -300,15 +304,16 @@ class VolumeAugmentation():
                           np.min(image), np.max(image))
         # Cache image shape
         org_shape = image.shape
-        # Perform image augmentation
-        aug_image = self.operator(image=image)["image"]
-        # Perform padding & cropping if image shape changed
-        if self.refine and aug_image.shape != org_shape:
-            aug_image = ai.pad(aug_image, new_shape=org_shape)
-            offset = (random.random(), random.random(), random.random())
-            aug_image = ai.random_crop(aug_image,
-                                       org_shape[0], org_shape[1], org_shape[2],
-                                       offset[0], offset[1], offset[2])
+        with seeded_random_state(seed):
+            # Perform image augmentation
+            aug_image = self.operator(image=image)["image"]
+            # Perform padding & cropping if image shape changed
+            if self.refine and aug_image.shape != org_shape:
+                aug_image = ai.pad(aug_image, new_shape=org_shape)
+                offset = (random.random(), random.random(), random.random())
+                aug_image = ai.random_crop(aug_image,
+                                           org_shape[0], org_shape[1], org_shape[2],
+                                           offset[0], offset[1], offset[2])
         # Perform clipping if image is out of grayscale/RGB encodings
         if self.refine and (np.min(aug_image) < 0 or np.max(aug_image) > 255):
             aug_image = np.clip(aug_image, a_min=0, a_max=255)
@@ -0,0 +1,94 @@
+#==============================================================================#
+#  Author:       Dominik Müller                                                #
+#  Copyright:    2024 IT-Infrastructure for Translational Medical Research,    #
+#                University of Augsburg                                        #
+#                                                                              #
+#  This program is free software: you can redistribute it and/or modify        #
+#  it under the terms of the GNU General Public License as published by        #
+#  the Free Software Foundation, either version 3 of the License, or           #
+#  (at your option) any later version.                                         #
+#                                                                              #
+#  This program is distributed in the hope that it will be useful,             #
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of              #
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the               #
+#  GNU General Public License for more details.                                #
+#                                                                              #
+#  You should have received a copy of the GNU General Public License           #
+#  along with this program.  If not, see <http://www.gnu.org/licenses/>.       #
+#==============================================================================#
+#-----------------------------------------------------#
+#                   Library imports                   #
+#-----------------------------------------------------#
+# External libraries
+from contextlib import contextmanager
+import threading
+import copy
+import numpy as np
+import random
+
+#-----------------------------------------------------#
+#                 Seeded Random State                 #
+#-----------------------------------------------------#
+# Lock for the global random number generators of Python and NumPy
+__random_lock__ = threading.Lock()
+
+@contextmanager
+def seeded_random_state(seed=None):
+    """ Context manager for running augmentation with a fixed global random state.
+
+    Volumentations & batchgenerators draw their random parameters from the global random number
+    generators of Python and NumPy and do not provide generators per operator. Inside this context,
+    both global generators are seeded with the provided seed, which makes the augmentation of a sample
+    independent of other threads and of the processing order. Afterwards, the previous state of the
+    generators is restored.
+
+    The global generators are shared across threads. Thus, seeded augmentation calls are
+    serialized via a lock. If `None` is provided as seed, the context does nothing.
+
+    Augmentation frameworks with generators per operator (e.g. Albumentations) should be seeded via
+    a [thread_local_copy()][aucmedi.data_processing.augmentation.random_state.thread_local_copy] of the
+    operator instead, which does not require a lock.
+
+    Args:
+        seed (int):                     Seed for the random number generators or `None`.
+    """
+    # Use global random state if no seed is provided
+    if seed is None:
+        yield
+        return
+    # Seed global random number generators exclusively
+    with __random_lock__:
+        state_py = random.getstate()
+        state_np = np.random.get_state()
+        random.seed(seed)
+        np.random.seed(seed)
+        try : yield
+        finally:
+            random.setstate(state_py)
+            np.random.set_state(state_np)
+
+def thread_local_copy(obj):
+    """ Obtain a copy of an object (e.g. an augmentation operator with internal random state),
+        which is exclusively used by the current thread.
+
+    The copy is created on first usage in a thread and recreated if another object is passed.
+
+    Args:
+        obj (object):                   Object which should be copied for the current thread.
+
+    Returns:
+        obj_copy (object):              Copy of the object for the current thread.
+    """
+    copies = getattr(__local__, "copies", None)
+    if copies is None:
+        copies = {}
+        __local__.copies = copies
+    entry = copies.get(id(obj))
+    # Verify that the cached copy belongs to the passed object
+    if entry is None or entry[0] is not obj:
+        entry = (obj, copy.deepcopy(obj))
+        copies[id(obj)] = entry
+    return entry[1]
+
+# Thread-local storage for the operator copies
+__local__ = threading.local()
@@ -21,15 +21,28 @@
 #-----------------------------------------------------#
 # External libraries
 from tensorflow.keras.utils import Sequence
+import tensorflow as tf
 import numpy as np
+import random
 from multiprocessing.pool import ThreadPool
+from multiprocessing import Pool, shared_memory, resource_tracker
+from concurrent.futures import ThreadPoolExecutor
 from itertools import repeat
+import threading
 import tempfile
+import json
+import time
+import hashlib
 import pickle
+import weakref
+import inspect
+import functools
 import os
 # Internal libraries
 from aucmedi.data_processing.io_loader import image_loader
 from aucmedi.data_processing.subfunctions import Standardize, Resize
+from aucmedi.data_processing.subfunctions.sf_pipeline import Subfunction_Pipeline
+from aucmedi.data_processing.io_cache import MemmapStore
 
 #-----------------------------------------------------#
 #                 Keras Data Generator                #
@@ -89,6 +102,9 @@ class DataGenerator(Sequence):
 
     It supports real-time batch generation as well as beforehand preprocessing of images,
     which are then temporarily stored on disk (requires enough disk space!).
+    Prepared images are stored either as one pickle file per sample (`prepare_store="pickle"`) or
+    in a single memory-mapped tensor file (`prepare_store="memmap"`), which requires a fixed image shape
+    but allows reading samples without any deserialization.
 
     The resulting batches are created based the following pipeline:
 
@@ -106,6 +122,37 @@ class DataGenerator(Sequence):
 
         It assures, that the samples contain the expected file extension, input shape and standardization.
 
+    ???+ info "Worker Pool"
+        If `workers > 1`, a single thread pool is created lazily on first usage and reused
+        for all following batches (and for the `prepare_images` pass) instead of spawning
+        new threads for each batch. The pool is shut down via `close()`, at the end of a
+        `with` block or when the DataGenerator is garbage collected.
+
+        ```python
+        with DataGenerator(samples, "images_dir/", workers=8) as datagen:
+            model.train(datagen, epochs=50)
+        ```
+
+        By default, the pool is thread-based (`executor="thread"`). For CPU-bound Python code in Subfunctions
+        or augmentation, which is serialized by the GIL, a process pool can be used instead (`executor="process"`).
+        The worker processes write their preprocessed images directly into a shared memory batch array
+        (`multiprocessing.shared_memory`) instead of pickling each image back to the main process.
+
+    ???+ info "Batch Prefetching"
+        With `prefetch=N`, the next N batches of the current epoch are generated in a background thread
+        while the model is processing the current batch. Batches are produced in index array order,
+        thus shuffling and the seed are respected. Prefetched batches are discarded at the end of an epoch.
+
+    ???+ info "Batch Buffers"
+        With `batch_buffers=N`, the image shape & dtype is inferred from the first batch and a ring of N
+        preallocated batch arrays is created. The workers write their preprocessed images directly into their
+        slot of the next buffer instead of collecting them in a list and stacking them into a new array.
+        A returned batch is overwritten after N further batches, thus copy it if it should be kept.
+
+    ???+ info "tf.data Export"
+        Via `as_tf_dataset()`, the DataGenerator pipeline can be exported as a `tf.data.Dataset`
+        with parallel sample processing and autotuned prefetching, which can be passed to `model.train()`.
+
     ???+ abstract "Build on top of the library"
         Tensorflow.Keras Iterator: https://www.tensorflow.org/api_docs/python/tf/keras/preprocessing/image/Iterator
 
@@ -133,7 +180,11 @@ class DataGenerator(Sequence):
                  resize=(224, 224), standardize_mode="z-score", data_aug=None,
                  shuffle=False, grayscale=False, sample_weights=None, workers=1,
                  prepare_images=False, loader=image_loader, seed=None,
-                 **kwargs):
+                 executor="thread", prefetch=0, batch_buffers=0, dtype=None,
+                 prepare_store="pickle", sample_cache=None, prepare_mode="sync",
+                 prepare_dir=None, standardize_batch=False,
+                 standardize_statistics=None, resize_hint=False,
+                 fuse_subfunctions=False, subfunctions_batch=False, **kwargs):
         """ Initialization function of the DataGenerator which acts as a configuration hub.
 
         If using for prediction, the 'labels' parameter has to be `None`.
@@ -159,6 +210,8 @@ class DataGenerator(Sequence):
 
             More information on IO_loader functions can be found here: [aucmedi.data_processing.io_loader][]. <br>
             Parameters defined in `**kwargs` are passed down to IO_loader functions.
+            The loader parameter `threads="auto"` (e.g. of the [sitk_loader()][aucmedi.data_processing.io_loader.sitk_loader])
+            is replaced by the number of CPU cores divided by the number of workers.
 
         Args:
             samples (list of str):              List of sample/index encoded as Strings. Provided by
@@ -184,7 +237,51 @@ class DataGenerator(Sequence):
             prepare_images (bool):              Boolean, whether all images should be prepared and backup to disk before training.
                                                 Recommended for large images or volumes to reduce CPU computing time.
             loader (io_loader function):        Function for loading samples/images from disk.
-            seed (int):                         Seed to ensure reproducibility for random function.
+            seed (int):                         Seed to ensure reproducibility for random function. The augmentation of each
+                                                sample is seeded with a seed derived from this seed, the epoch and the sample index.
+                                                Thus, augmented batches are identical regardless of the number of workers.
+            executor (str):                     Type of the worker pool if workers > 1. Options: `["thread", "process"]`.
+                                                The process pool returns images via shared memory and is recommended
+                                                for CPU-bound Subfunctions or augmentation.
+            prefetch (int):                     Number of batches which are generated in the background in advance.
+                                                If `0` is provided, batches are generated synchronously.
+            batch_buffers (int):                Number of preallocated batch arrays, which are reused as ring buffer and
+                                                directly filled by the workers. If `0` is provided, each batch is newly allocated.
+                                                A returned batch is overwritten after `batch_buffers` further batches
+                                                and has to be at least `prefetch + 2`.
+            dtype (str):                        Data type of the image batches (e.g. `"float32"`, `"float16"` or `"uint8"`).
+                                                Propagated to the standardization, which is computed in float32 and casts
+                                                a single time into the desired data type. If `None`, the data type resulting
+                                                from the pipeline is kept.
+            prepare_store (str):                Storage backend for prepared images. Options: `["pickle", "memmap"]`.
+                                                The memmap store requires a fixed image shape (e.g. via `resize`).
+            sample_cache (IO_cache):            Cache object for samples after Subfunctions & resizing, like a persistent
+                                                [DiskCache][aucmedi.data_processing.io_cache.disk_cache] or an in-memory
+                                                [MemoryCache][aucmedi.data_processing.io_cache.memory_cache]. The cache is
+                                                shared by all DataGenerators using it. If `None`, no cache is used.
+            prepare_mode (str):                 Mode of the image preparation if `prepare_images=True`. Options:
+                                                `"sync"` (prepare all images during initialization), `"background"` (prepare
+                                                images in a background thread while batches can already be generated) or
+                                                `"lazy"` (prepare images on first access).
+            prepare_dir (str):                  Persistent directory for prepared images. Already prepared samples are skipped,
+                                                which allows resuming an interrupted preparation. Prepared images of other samples
+                                                or another preprocessing configuration (recorded in the `manifest.json`) are removed.
+                                                If `None`, a temporary directory is used.
+            standardize_batch (bool):           Boolean, whether the standardization should be applied on the stacked batch
+                                                with vectorized reductions instead of on each image.
+            standardize_statistics (dict):      Dataset statistics (or path to their JSON file) computed via
+                                                [compute_dataset_statistics()][aucmedi.utils.dataset_statistics.compute_dataset_statistics].
+                                                Required for `standardize_mode="dataset"`.
+            resize_hint (bool):                 Boolean, whether the resize shape should be passed as `target_shape` to the
+                                                sample loader, which allows reduced-size decoding of JPEG images via the
+                                                [image_loader()][aucmedi.data_processing.io_loader.image_loader].
+                                                Only applied for 2D resizing without Subfunctions.
+            fuse_subfunctions (bool):           Boolean, whether the Subfunctions and resizing should be applied via a fused
+                                                [Subfunction_Pipeline][aucmedi.data_processing.subfunctions.sf_pipeline.Subfunction_Pipeline]
+                                                with less intermediate arrays. The output is identical to the sequential application.
+            subfunctions_batch (bool):          Boolean, whether the Subfunctions should be applied on the stack of loaded images of a batch
+                                                via their (vectorized) `transform_batch()` function, if all images share the same
+                                                shape. Only applied for the thread executor.
             **kwargs (dict):                    Additional parameters for the sample loader.
         """
         # Cache class variables
@@ -193,9 +290,17 @@ class DataGenerator(Sequence):
         self.metadata = metadata
         self.sample_weights = sample_weights
         self.prepare_images = prepare_images
+        self.prepare_store = prepare_store
+        self.prepare_mode = prepare_mode
+        self.sample_cache = sample_cache
+        self.standardize_statistics = standardize_statistics
         self.workers = workers
         self.sample_loader = loader
         self.kwargs = kwargs
+        self.resize_hint = resize_hint
+        self.fuse_subfunctions = fuse_subfunctions
+        self.subfunctions_batch = subfunctions_batch and \
+                                  len(subfunctions) > 0 and executor == "thread"
         self.path_imagedir = path_imagedir
         self.image_format = image_format
         self.grayscale = grayscale
@@ -206,20 +311,91 @@ class DataGenerator(Sequence):
         self.resize = resize
         self.shuffle = shuffle
         self.seed = seed
+        self.executor = executor
+        self.prefetch = prefetch
+        self.batch_buffers = batch_buffers
+        if dtype is not None : self.dtype = np.dtype(dtype)
+        else : self.dtype = None
         # Cache keras.Sequence class variables
         self.n = len(samples)
         self.max_iterations = (self.n + self.batch_size - 1) // self.batch_size
         self.iterations = self.max_iterations
         self.seed_walk = 0
+        self.epoch = 0
         self.index_array = None
-
+        # Persistent worker pool (lazy initialization)
+        self.pool = None
+        self.pool_lock = threading.Lock()
+        # Image shape & dtype (inferred from the first batch)
+        self.sample_shape = None
+        # Background batch prefetching (lazy initialization)
+        self.prefetch_executor = None
+        self.prefetch_queue = {}
+        self.prefetch_lock = threading.Lock()
+        # Ring of preallocated batch buffers (lazy initialization)
+        self.batch_buffer_ring = []
+        self.batch_buffer_pointer = 0
+        self.batch_buffer_finalizers = []
+        # Reusable shared memory batch arrays of the process pool (lazy initialization)
+        self.batch_shm_free = []
+        self.buffer_lock = threading.Lock()
+        # Pass resize shape to the sample loader for reduced-size decoding
+        # (Subfunctions could depend on the original image resolution)
+        if resize_hint and resize is not None and len(resize) == 2 and \
+            len(subfunctions) == 0:
+            self.loader_kwargs = dict(kwargs, target_shape=resize)
+        else : self.loader_kwargs = kwargs
+        # Compute configuration hash of the preprocessing pipeline for caching
+        if sample_cache is not None or prepare_images:
+            config = [self.sample_loader, self.loader_kwargs, self.image_format,
+                      self.grayscale, self.subfunctions, self.resize]
+            self.cache_config = __describe__(config)
+        # Partition CPU cores between workers and multi-threaded loaders
+        if self.loader_kwargs.get("threads", None) == "auto":
+            threads = max(1, (os.cpu_count() or 1) // max(1, workers))
+            self.loader_kwargs = dict(self.loader_kwargs, threads=threads)
         # Initialize Standardization Subfunction
         if standardize_mode is not None:
-            self.sf_standardize = Standardize(mode=standardize_mode)
+            self.sf_standardize = Standardize(mode=standardize_mode,
+                                              dtype=self.dtype,
+                                              statistics=standardize_statistics)
         else : self.sf_standardize = None
+        # Apply standardization batch-wise instead of sample-wise
+        self.standardize_batch = standardize_batch and \
+                                 self.sf_standardize is not None
         # Initialize Resizing Subfunction
         if resize is not None : self.sf_resize = Resize(shape=resize)
         else : self.sf_resize = None
+        # Compile Subfunctions & resizing into a fused pipeline
+        if fuse_subfunctions:
+            self.sf_pipeline = Subfunction_Pipeline(subfunctions,
+                                                    resize=self.sf_resize)
+        else : self.sf_pipeline = None
+        # Sanity check for worker pool type
+        if executor not in ["thread", "process"]:
+            raise ValueError("Unknown executor for DataGenerator", executor,
+                             "Possibles executors are: ['thread', 'process']")
+        # Sanity check for integer data types
+        if self.dtype is not None and \
+            not np.issubdtype(self.dtype, np.floating) and \
+            standardize_mode not in [None, "grayscale"]:
+            raise ValueError("Integer data type is only supported with " + \
+                             "standardize_mode None or 'grayscale'!",
+                             dtype, standardize_mode)
+        # Sanity check for prepared image store
+        if prepare_store not in ["pickle", "memmap"]:
+            raise ValueError("Unknown prepare_store for DataGenerator",
+                             prepare_store,
+                             "Possibles stores are: ['pickle', 'memmap']")
+        # Sanity check for image preparation mode
+        if prepare_mode not in ["sync", "background", "lazy"]:
+            raise ValueError("Unknown prepare_mode for DataGenerator",
+                             prepare_mode, "Possibles modes are: " + \
+                             "['sync', 'background', 'lazy']")
+        # Sanity check for batch buffer ring size
+        if batch_buffers and batch_buffers < prefetch + 2:
+            raise ValueError("Number of batch buffers has to be at least " + \
+                             "prefetch + 2!", batch_buffers, prefetch)
         # Sanity check for full sample list
         if samples is not None and len(samples) == 0:
             raise ValueError("Provided sample list is empty!", len(samples))
@@ -246,77 +422,351 @@ class DataGenerator(Sequence):
 
         # If prepare_image modus activated
         # -> Preprocess images beforehand and store them to disk for fast usage later
+        self.prepared_data = None
+        self.prepare_thread = None
+        self.prepare_stop = threading.Event()
+        self.prepare_status = None
         if self.prepare_images:
-            self.prepare_dir_object = tempfile.TemporaryDirectory(
-                                               prefix="aucmedi.tmp.",
-                                               suffix=".data")
-            self.prepare_dir = self.prepare_dir_object.name
+            # Use persistent or temporary directory
+            if prepare_dir is not None:
+                os.makedirs(prepare_dir, exist_ok=True)
+                self.prepare_dir = prepare_dir
+            else:
+                self.prepare_dir_object = tempfile.TemporaryDirectory(
+                                                   prefix="aucmedi.tmp.",
+                                                   suffix=".data")
+                self.prepare_dir = self.prepare_dir_object.name
+                print("A directory for image preparation was created:",
+                      self.prepare_dir)
+            # Remove prepared images of other samples or configurations
+            self.__validate_prepared__()
+            if self.prepare_store == "memmap":
+                self.prepared_data = MemmapStore(self.prepare_dir, self.n)
+            # Run image preparation
+            if self.prepare_mode == "sync" : self.prepare()
+            elif self.prepare_mode == "background":
+                self.prepare_thread = threading.Thread(target=self.prepare,
+                                                       daemon=True)
+                self.prepare_thread.start()
+
+    #-----------------------------------------------------#
+    #                  Image Preparation                  #
+    #-----------------------------------------------------#
+    def prepare(self):
+        """ Preprocess all samples (loading, Subfunctions and resizing) and store them in the prepared image store.
 
+        Already prepared samples are skipped, which allows resuming an interrupted preparation
+        in a persistent `prepare_dir`. Samples which fail are skipped as well and recorded with their
+        error message in the `manifest.json` of the `prepare_dir`. Failed samples are retried during
+        runtime and on the next call of this function.
+
+        This function is called automatically by the DataGenerator, if `prepare_images=True`.
+
+        Returns:
+            prepare_status (dict):          Dictionary with the number of prepared, skipped and failed samples
+                                            as well as duration and throughput (samples per second).
+        """
+        time_start = time.time()
+        # Identify samples which are not prepared yet
+        todo = [i for i in range(0, self.n) if not self.__is_prepared__(i)]
+        status = {"samples": self.n, "prepared": self.n - len(todo),
+                  "skipped": self.n - len(todo), "failed": {},
+                  "duration": 0.0, "throughput": 0.0}
+        self.prepare_status = status
+        # Preprocess image for each index in chunks (to allow stopping)
+        chunk_size = max(self.workers, 1) * 8
+        pos = 0
+        while pos < len(todo) and not self.prepare_stop.is_set():
+            # Allocate memmap store with the first image before parallelization
+            if self.prepared_data is not None and \
+                not self.prepared_data.is_allocated():
+                chunk = todo[pos:pos+1]
+            else : chunk = todo[pos:pos+chunk_size]
             # Preprocess image for each index - Sequential
-            if self.workers == 0 or self.workers == 1:
-                for i in range(0, len(samples)):
-                    self.preprocess_image(index=i, prepared_image=False,
-                                          run_aug=False, run_standardize=False,
-                                          dump_pickle=True)
+            if self.workers == 0 or self.workers == 1 or len(chunk) == 1:
+                results = [self.__prepare_sample__(i) for i in chunk]
+            # Preprocess image for each index - Multi-processing
+            elif self.executor == "process":
+                results = self.__get_pool__().map(__process_prepare__, chunk)
             # Preprocess image for each index - Multi-threading
             else:
-                with ThreadPool(self.workers) as pool:
-                    index_array = list(range(0, len(samples)))
-                    mp_params = zip(index_array, repeat(False), repeat(False),
-                                    repeat(False), repeat(True))
-                    pool.starmap(self.preprocess_image, mp_params)
-            print("A directory for image preparation was created:",
-                  self.prepare_dir)
+                results = self.__get_pool__().map(self.__prepare_sample__,
+                                                  chunk)
+            # Update preparation status
+            for i, error in zip(chunk, results):
+                if error is None : status["prepared"] += 1
+                else : status["failed"][i] = error
+            pos += len(chunk)
+            status["duration"] = time.time() - time_start
+            if status["duration"] > 0:
+                status["throughput"] = (status["prepared"] - status["skipped"]) / \
+                                       status["duration"]
+        if self.prepared_data is not None : self.prepared_data.flush()
+        # Store manifest of preparation
+        manifest = {**self.__prepare_identity__(),
+                    "samples": status["samples"],
+                    "prepared": status["prepared"],
+                    "skipped": status["skipped"],
+                    "duration": status["duration"],
+                    "throughput": status["throughput"],
+                    "failed": [{"index": i, "sample": str(self.samples[i]),
+                                "error": status["failed"][i]} \
+                               for i in status["failed"]]}
+        with open(os.path.join(self.prepare_dir, "manifest.json"), "w") as fw:
+            json.dump(manifest, fw, indent=2)
+        # Report preparation
+        print("Image preparation:", status["prepared"], "/", status["samples"],
+              "samples prepared (" + str(status["skipped"]), "skipped,",
+              len(status["failed"]), "failed) with",
+              "{:.2f}".format(status["throughput"]), "samples/s")
+        return status
+
+    """ Internal function for identifying a preparation by the sample list and the configuration hash of the
+        preprocessing pipeline (stored in the manifest of the prepare_dir). """
+    def __prepare_identity__(self):
+        config = repr(self.path_imagedir) + "|" + self.cache_config
+        return {"config": hashlib.sha256(config.encode("utf-8")).hexdigest(),
+                "sample_list": [str(sample) for sample in self.samples]}
+
+    """ Internal function for validating the prepared images of the prepare_dir against the manifest.
+        Prepared images of other samples or configurations are removed. """
+    def __validate_prepared__(self):
+        path_manifest = os.path.join(self.prepare_dir, "manifest.json")
+        identity = self.__prepare_identity__()
+        manifest = {}
+        if os.path.exists(path_manifest):
+            with open(path_manifest, "r") as fr : manifest = json.load(fr)
+        if all(manifest.get(k) == identity[k] for k in identity) : return
+        # Remove outdated prepared images (pickle & memmap store)
+        outdated = [f for f in os.listdir(self.prepare_dir) \
+                    if (f.startswith("img_") and ".pickle" in f) or \
+                       f in ["samples.npy", "index.npy", "manifest.json"] or \
+                       f.endswith(".tmp.npy")]
+        if outdated:
+            print("Prepared images in", self.prepare_dir, "do not match the " + \
+                  "samples or preprocessing configuration and are removed.")
+        for f in outdated : os.remove(os.path.join(self.prepare_dir, f))
+        # Store identity of the preparation before any image is prepared
+        with open(path_manifest, "w") as fw:
+            json.dump(identity, fw, indent=2)
+
+    """ Internal function for preparing a single sample with failure isolation. """
+    def __prepare_sample__(self, index):
+        try:
+            self.preprocess_image(index=index, prepared_image=False,
+                                  run_aug=False, run_standardize=False,
+                                  dump_pickle=True)
+        except Exception as e:
+            return type(e).__name__ + ": " + str(e)
+
+    """ Internal function for checking if a sample is already prepared. """
+    def __is_prepared__(self, index):
+        if self.prepared_data is not None : return index in self.prepared_data
+        return os.path.exists(self.__prepared_path__(index))
+
+    """ Internal function for obtaining the file path of a prepared sample (pickle store). """
+    def __prepared_path__(self, index):
+        return os.path.join(self.prepare_dir, "img_" + str(index) + ".pickle")
+
+    """ Internal function for loading a prepared sample from disk. """
+    def __load_prepared__(self, index):
+        # Load from memory-mapped store
+        if self.prepared_data is not None:
+            return self.prepared_data.read(index)
+        # Load from pickle
+        with open(self.__prepared_path__(index), "rb") as pickle_loader:
+            return pickle.load(pickle_loader)
+
+    """ Internal function for storing a prepared sample on disk. Lazy dumps of worker processes into
+        an unallocated memmap store are skipped to avoid concurrent allocation by multiple processes. """
+    def __dump_prepared__(self, index, img, lazy=False):
+        # Store into memory-mapped store
+        if self.prepared_data is not None:
+            if lazy and __process_datagen__ is self and \
+                not self.prepared_data.is_allocated():
+                return
+            self.prepared_data.write(index, img)
+        # Store as pickle (written atomically)
+        else:
+            path_img = self.__prepared_path__(index)
+            path_tmp = path_img + "." + str(os.getpid()) + "." + \
+                       str(threading.get_ident()) + ".tmp"
+            with open(path_tmp, "wb") as pickle_writer:
+                pickle.dump(img, pickle_writer)
+            os.replace(path_tmp, path_img)
 
     #-----------------------------------------------------#
     #              Batch Generation Function              #
     #-----------------------------------------------------#
     """ Internal function for batch generation given a list of random selected samples. """
     def _get_batches_of_transformed_samples(self, index_array):
-        # Initialize Batch stack
-        batch_stack = ([],)
-        if self.labels is not None : batch_stack += ([],)
-        if self.sample_weights is not None : batch_stack += ([],)
-
+        # Derive augmentation seed for each index
+        seeds = self.__sample_seeds__(index_array)
+        # Load images and apply Subfunctions batch-wise if activated
+        if self.subfunctions_batch:
+            images = self.__batch_subfunctions__(index_array)
+        else : images = [None] * len(index_array)
+        # Process image for each index directly into a preallocated batch buffer
+        if self.batch_buffers and self.sample_shape is not None:
+            input_stack = self.__fill_batch_buffer__(index_array, seeds, images)
+        # Process image for each index - Multi-processing via shared memory
+        elif self.workers > 1 and self.executor == "process":
+            input_stack = self.__process_batch__(index_array, seeds)
         # Process image for each index - Sequential
-        if self.workers == 0 or self.workers == 1:
-            for i in index_array:
+        elif self.workers == 0 or self.workers == 1:
+            batches_img = []
+            for i, seed, image in zip(index_array, seeds, images):
                 batch_img = self.preprocess_image(index=i,
-                                                  prepared_image=self.prepare_images)
-                batch_stack[0].append(batch_img)
+                                                  prepared_image=self.prepare_images,
+                                                  run_standardize=not self.standardize_batch,
+                                                  seed=seed, image=image)
+                batches_img.append(batch_img)
+            input_stack = np.stack(batches_img, axis=0)
         # Process image for each index - Multi-threading
         else:
-            with ThreadPool(self.workers) as pool:
-                mp_params = zip(index_array, repeat(self.prepare_images))
-                batches_img = pool.starmap(self.preprocess_image, mp_params)
-            batch_stack[0].extend(batches_img)
-
-        # Add classification to batch if available
-        if self.labels is not None:
-            batch_stack[1].extend(self.labels[index_array])
-        # Add sample weight to batch if available
-        if self.sample_weights is not None:
-            batch_stack[2].extend(self.sample_weights[index_array])
+            mp_params = zip(index_array, repeat(self.prepare_images),
+                            repeat(True), repeat(not self.standardize_batch),
+                            repeat(False), seeds, images)
+            batches_img = self.__get_pool__().starmap(self.preprocess_image,
+                                                      mp_params)
+            input_stack = np.stack(batches_img, axis=0)
+        # Cache image shape & dtype for the preallocation of batch buffers
+        if self.sample_shape is None:
+            self.sample_shape = (input_stack.shape[1:], input_stack.dtype)
+        # Apply standardization on the complete batch if activated
+        if self.standardize_batch:
+            input_stack = self.sf_standardize.transform_batch(input_stack)
 
         # Stack images and optional metadata together into a batch
-        input_stack = np.stack(batch_stack[0], axis=0)
         if self.metadata is not None:
             input_stack = (input_stack, self.metadata[index_array])
         batch = (input_stack, )
-        # Stack classifications together into a batch if available
+        # Add classifications to batch if available
         if self.labels is not None:
-            batch += (np.stack(batch_stack[1], axis=0), )
-        # Stack sample weights together into a batch if available
+            batch += (self.labels[index_array], )
+        # Add sample weights to batch if available
         if self.sample_weights is not None:
-            batch += (np.stack(batch_stack[2], axis=0), )
+            batch += (self.sample_weights[index_array], )
         # Return generated Batch
         return batch
 
+    """ Internal function for deriving the augmentation seed of each sample from the seed,
+        the current epoch and the sample index (None if no seed is provided). """
+    def __sample_seeds__(self, index_array, epoch=None):
+        if self.seed is None or self.data_aug is None:
+            return [None] * len(index_array)
+        if epoch is None : epoch = self.epoch
+        return [int(np.random.SeedSequence([self.seed, epoch, int(i)]).\
+                    generate_state(1)[0]) for i in index_array]
+
+    """ Internal function for batch generation via the process pool and shared memory. """
+    def __process_batch__(self, index_array, seeds):
+        pool = self.__get_pool__()
+        # Infer image shape & dtype from the first batch (returned via pickling)
+        if self.sample_shape is None:
+            mp_params = zip(index_array, repeat(self.prepare_images), seeds)
+            batches_img = pool.starmap(__process_image__, mp_params)
+            return np.stack(batches_img, axis=0)
+        # Obtain reusable batch array in shared memory
+        batch_shape = (len(index_array),) + self.sample_shape[0]
+        dtype = self.sample_shape[1]
+        shm = self.__acquire_batch_shm__()
+        try:
+            # Let the workers write their images directly into the batch array
+            mp_params = zip(index_array, repeat(self.prepare_images),
+                            repeat(shm.name), repeat(batch_shape),
+                            repeat(dtype.str), range(0, len(index_array)),
+                            seeds)
+            results = pool.starmap(__process_image_shm__, mp_params)
+            batch_shm = np.ndarray(batch_shape, dtype=dtype, buffer=shm.buf)
+            # Copy batch out of the shared memory (reused by the next batch)
+            input_stack = __collect_batch__(batch_shm, results).copy()
+            del batch_shm
+        finally:
+            with self.buffer_lock : self.batch_shm_free.append(shm)
+        # Return batch
+        return input_stack
+
+    """ Internal function for obtaining a free shared memory batch array of the process pool.
+        Batch arrays are allocated once for the full batch size and reused afterwards. """
+    def __acquire_batch_shm__(self):
+        with self.buffer_lock:
+            if self.batch_shm_free : return self.batch_shm_free.pop()
+            nbytes = int(np.prod((self.batch_size,) + self.sample_shape[0])) * \
+                     self.sample_shape[1].itemsize
+            shm = shared_memory.SharedMemory(create=True, size=max(nbytes, 1))
+            # Release shared memory on garbage collection or at interpreter exit
+            finalizer = weakref.finalize(self, __release_shm__, shm)
+            self.batch_buffer_finalizers.append(finalizer)
+            return shm
+
+    """ Internal function for batch generation into the next buffer of the batch buffer ring. """
+    def __fill_batch_buffer__(self, index_array, seeds, images):
+        (buffer, shm) = self.__next_batch_buffer__()
+        n = len(index_array)
+        # Let the workers write their images directly into their slot - Sequential
+        if self.workers == 0 or self.workers == 1:
+            results = [self.__fill_slot__(index_array[slot],
+                                          self.prepare_images, buffer, slot,
+                                          seeds[slot], images[slot]) \
+                       for slot in range(0, n)]
+        # Let the workers write their images directly into their slot - Multi-threading
+        elif self.executor == "thread":
+            mp_params = zip(index_array, repeat(self.prepare_images),
+                            repeat(buffer), range(0, n), seeds, images)
+            results = self.__get_pool__().starmap(self.__fill_slot__,
+                                                  mp_params)
+        # Let the workers write their images directly into their slot - Multi-processing
+        else:
+            mp_params = zip(index_array, repeat(self.prepare_images),
+                            repeat(shm.name), repeat(buffer.shape),
+                            repeat(buffer.dtype.str), range(0, n), seeds)
+            results = self.__get_pool__().starmap(__process_image_shm__,
+                                                  mp_params)
+        # Return batch view on the buffer
+        return __collect_batch__(buffer[:n], results)
+
+    """ Internal function for preprocessing an image and writing it into its batch buffer slot. """
+    def __fill_slot__(self, index, prepared_image, buffer, slot, seed=None,
+                      image=None):
+        img = self.preprocess_image(index, prepared_image,
+                                    run_standardize=not self.standardize_batch,
+                                    seed=seed, image=image)
+        return __write_slot__(img, buffer, slot)
+
+    """ Internal function for obtaining the next batch buffer of the ring (allocated on first call). """
+    def __next_batch_buffer__(self):
+        with self.buffer_lock:
+            # Allocate ring of batch buffers
+            if not self.batch_buffer_ring:
+                shape = (self.batch_size,) + self.sample_shape[0]
+                dtype = self.sample_shape[1]
+                for i in range(0, self.batch_buffers):
+                    # Use shared memory for process pools
+                    if self.workers > 1 and self.executor == "process":
+                        nbytes = int(np.prod(shape)) * dtype.itemsize
+                        shm = shared_memory.SharedMemory(create=True,
+                                                         size=max(nbytes, 1))
+                        buffer = np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+                        # Release shared memory on garbage collection or at interpreter exit
+                        finalizer = weakref.finalize(self, __release_shm__, shm)
+                        self.batch_buffer_finalizers.append(finalizer)
+                    else:
+                        shm = None
+                        buffer = np.empty(shape, dtype=dtype)
+                    self.batch_buffer_ring.append((buffer, shm))
+            # Obtain next batch buffer
+            entry = self.batch_buffer_ring[self.batch_buffer_pointer]
+            self.batch_buffer_pointer = (self.batch_buffer_pointer + 1) % \
+                                        len(self.batch_buffer_ring)
+            return entry
+
     #-----------------------------------------------------#
     #                 Image Preprocessing                 #
     #-----------------------------------------------------#
     def preprocess_image(self, index, prepared_image=False, run_aug=True,
-                         run_standardize=True, dump_pickle=False):
+                         run_standardize=True, dump_pickle=False, seed=None,
+                         image=None):
         """ Internal preprocessing function for applying Subfunctions, augmentation, resizing and standardization
             on an image given its index.
 
@@ -326,46 +776,135 @@ class DataGenerator(Sequence):
 
         Deactivating the run_aug & run_standardize option to output image without augmentation and standardization.
 
-        Activating dump_pickle will store the preprocessed image as pickle on disk instead of returning.
+        Activating dump_pickle will store the image after Subfunctions and resizing in the prepared image store
+        (pickle or memmap) on disk instead of returning.
+
+        If a prepared image is not available yet (e.g. during background preparation), it is preprocessed
+        during runtime and added to the prepared image store.
+
+        The seed is passed to the augmentation for a reproducible random state (derived by the batch generation).
+
+        An image with already applied Subfunctions (e.g. batch-wise) can be passed via the image option,
+        which skips the loading and the Subfunctions.
         """
         # Load prepared image from disk
-        if prepared_image:
-            # Load from disk
-            path_img = os.path.join(self.prepare_dir, "img_" + str(index))
-            with open(path_img + ".pickle", "rb") as pickle_loader:
-                img = pickle.load(pickle_loader)
-            # Apply image augmentation on image if activated
-            if self.data_aug is not None and run_aug:
-                img = self.data_aug.apply(img)
-            # Apply standardization on image if activated
-            if self.sf_standardize is not None and run_standardize:
-                img = self.sf_standardize.transform(img)
+        if prepared_image and image is None and self.__is_prepared__(index):
+            img = self.__load_prepared__(index)
         # Preprocess image during runtime
         else:
-            # Load image from disk
-            img = self.sample_loader(self.samples[index], self.path_imagedir,
-                                     image_format=self.image_format,
-                                     grayscale=self.grayscale,
-                                     **self.kwargs)
-            # Apply subfunctions on image
-            for sf in self.subfunctions:
-                img = sf.transform(img)
-            # Apply resizing on image if activated
-            if self.sf_resize is not None:
-                img = self.sf_resize.transform(img)
-            # Apply image augmentation on image if activated
-            if self.data_aug is not None and run_aug:
-                img = self.data_aug.apply(img)
-            # Apply standardization on image if activated
-            if self.sf_standardize is not None and run_standardize:
-                img = self.sf_standardize.transform(img)
+            # Obtain image from cache if available
+            img = None
+            if self.sample_cache is not None:
+                cache_key = self.__cache_key__(index)
+                if image is None : img = self.sample_cache.get(cache_key)
+            # Preprocess image if not cached
+            if img is None:
+                # Apply subfunctions & resizing via fused pipeline
+                if self.sf_pipeline is not None and image is None:
+                    img = self.sf_pipeline.transform(self.__load_sample__(index))
+                # Use image with already applied subfunctions
+                elif image is not None:
+                    img = image
+                else:
+                    # Load image from disk
+                    img = self.__load_sample__(index)
+                    # Apply subfunctions on image
+                    for sf in self.subfunctions:
+                        img = sf.transform(img)
+                # Apply resizing on image if activated
+                if (self.sf_pipeline is None or image is not None) and \
+                        self.sf_resize is not None:
+                    img = self.sf_resize.transform(img)
+                # Store image in cache
+                if self.sample_cache is not None:
+                    self.sample_cache.put(cache_key, img)
+            # Dump image for later usage if not prepared yet (lazy preparation)
+            if prepared_image : self.__dump_prepared__(index, img, lazy=True)
         # Dump preprocessed image to disk (for later usage via prepared_image)
         if dump_pickle:
-            path_img = os.path.join(self.prepare_dir, "img_" + str(index))
-            with open(path_img + ".pickle", "wb") as pickle_writer:
-                pickle.dump(img, pickle_writer)
+            self.__dump_prepared__(index, img)
+            return
+        # Obtain a writable copy of read-only images (e.g. cached samples) and materialize
+        # broadcasted channels (e.g. Chromer with broadcast) if in-place operations follow.
+        # Otherwise, the batch assembly copies the image into the batch.
+        inplace = (self.data_aug is not None and run_aug) or \
+                  (self.sf_standardize is not None and run_standardize)
+        if inplace and (not img.flags.writeable or 0 in img.strides):
+            img = img.copy()
+        # Apply image augmentation on image if activated
+        if self.data_aug is not None and run_aug:
+            # Pass seed only to augmentations supporting it (e.g. custom augmentations with apply(image))
+            if seed is None or not __accepts_seed__(self.data_aug.apply):
+                img = self.data_aug.apply(img)
+            else : img = self.data_aug.apply(img, seed=seed)
+        # Apply standardization on image if activated
+        if self.sf_standardize is not None and run_standardize:
+            img = self.sf_standardize.transform(img)
+        # Cast image into desired data type
+        if self.dtype is not None and run_standardize:
+            img = img.astype(self.dtype, copy=False)
         # Return preprocessed image
-        else : return img
+        return img
+
+    """ Internal function for computing the cache key of a sample based on its file identity
+        and the configuration of the preprocessing pipeline. """
+    def __cache_key__(self, index):
+        sample = self.samples[index]
+        # Identify sample file
+        if self.image_format : img_file = sample + "." + self.image_format
+        else : img_file = sample
+        if self.path_imagedir is not None:
+            path_img = os.path.abspath(os.path.join(self.path_imagedir, img_file))
+        else : path_img = img_file
+        # Obtain file identity
+        try:
+            stat = os.stat(path_img)
+            identity = (path_img, stat.st_mtime_ns, stat.st_size)
+        except OSError : identity = (path_img, None, None)
+        # Hash sample identity together with pipeline configuration
+        key = repr(identity) + "|" + self.cache_config
+        return hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+    """ Internal function for loading a sample from disk via the sample loader. """
+    def __load_sample__(self, index):
+        return self.sample_loader(self.samples[index], self.path_imagedir,
+                                  image_format=self.image_format,
+                                  grayscale=self.grayscale,
+                                  **self.loader_kwargs)
+
+    """ Internal function for loading the images of a batch and applying the Subfunctions batch-wise.
+
+        Samples which are already prepared or cached are skipped (None in the returned list).
+        If the loaded images differ in shape or data type, the Subfunctions are applied image-wise.
+    """
+    def __batch_subfunctions__(self, index_array):
+        # Identify samples which require loading
+        load = []
+        for i in index_array:
+            if self.prepare_images and self.__is_prepared__(i) : continue
+            if self.sample_cache is not None and \
+                self.__cache_key__(i) in self.sample_cache : continue
+            load.append(i)
+        images = [None] * len(index_array)
+        if len(load) == 0 : return images
+        # Load images from disk
+        if self.workers == 0 or self.workers == 1:
+            loaded = [self.__load_sample__(i) for i in load]
+        else : loaded = self.__get_pool__().map(self.__load_sample__, load)
+        # Apply subfunctions on the stacked images
+        if all(img.shape == loaded[0].shape and img.dtype == loaded[0].dtype \
+               for img in loaded):
+            batch = np.stack(loaded, axis=0)
+            for sf in self.subfunctions:
+                batch = sf.transform_batch(batch)
+            loaded = list(batch)
+        # Apply subfunctions image-wise for heterogeneous shapes
+        else:
+            for sf in self.subfunctions:
+                loaded = [sf.transform(img) for img in loaded]
+        # Map images back to their batch position
+        positions = {i: loaded[j] for j, i in enumerate(load)}
+        return [positions.get(i) for i in index_array]
 
     #-----------------------------------------------------#
     #              Sample Generation Function             #
@@ -377,12 +916,40 @@ class DataGenerator(Sequence):
         # Build index array for the start
         if self.index_array is None:
             self.__set_index_array__()
-        # Select samples for next batch
-        index_array = self.index_array[
-            self.batch_size * idx : self.batch_size * (idx + 1)
-        ]
-        # Generate batch
-        return self._get_batches_of_transformed_samples(index_array)
+        # Generate batch synchronously if prefetching is not activated
+        if not self.prefetch:
+            index_array = self.__get_index_slice__(idx)
+            return self._get_batches_of_transformed_samples(index_array)
+        # Obtain batch from prefetching queue & schedule next batches
+        with self.prefetch_lock:
+            future = self.prefetch_queue.pop(idx, None)
+            if future is None : future = self.__schedule_batch__(idx)
+            for i in range(idx + 1, min(idx + 1 + self.prefetch,
+                                        self.max_iterations)):
+                if i not in self.prefetch_queue:
+                    self.prefetch_queue[i] = self.__schedule_batch__(i)
+        # Return batch after generation is completed
+        return future.result()
+
+    """ Internal function for selecting the sample indices of a batch. """
+    def __get_index_slice__(self, idx):
+        return self.index_array[self.batch_size * idx : \
+                                self.batch_size * (idx + 1)]
+
+    """ Internal function for scheduling a batch generation in the background. """
+    def __schedule_batch__(self, idx):
+        if self.prefetch_executor is None:
+            self.prefetch_executor = ThreadPoolExecutor(max_workers=1)
+        index_array = self.__get_index_slice__(idx)
+        return self.prefetch_executor.submit(
+                    self._get_batches_of_transformed_samples, index_array)
+
+    """ Internal function for discarding all prefetched batches. """
+    def __clear_prefetch_queue__(self):
+        with self.prefetch_lock:
+            for future in self.prefetch_queue.values():
+                future.cancel()
+            self.prefetch_queue = {}
 
     #-----------------------------------------------------#
     #                 Generator Functions                 #
@@ -414,4 +981,302 @@ class DataGenerator(Sequence):
 
     """ Internal function at the end of an epoch. """
     def on_epoch_end(self):
-        self.__set_index_array__()
\ No newline at end of file
+        if self.prefetch : self.__clear_prefetch_queue__()
+        self.epoch += 1
+        self.__set_index_array__()
+
+    #-----------------------------------------------------#
+    #                   tf.data Export                    #
+    #-----------------------------------------------------#
+    def as_tf_dataset(self, repeat=False, num_parallel_calls=tf.data.AUTOTUNE,
+                      deterministic=True):
+        """ Export function for building a `tf.data.Dataset` with the same pipeline as the DataGenerator.
+
+        Each sample is processed via `preprocess_image()` (loader, Subfunctions, resize, augmentation and
+        standardization) in a parallel map of tf.data. Afterwards, samples are batched together with optional
+        metadata, labels and sample weights, and batches are prefetched with an autotuned buffer size.
+
+        The structure of a batch as well as shuffling, seeds and the epoch-wise augmentation are identical
+        to the batches of the DataGenerator. Thus, `model.fit()` can overlap preprocessing and training without
+        a keras Sequence. The dataset uses data-based auto-sharding for distribution across replicas.
+
+        ```python
+        datagen = DataGenerator(samples, "images_dir/", labels=class_ohe, data_aug=aug,
+                                shuffle=True, seed=0, resize=model.meta_input,
+                                standardize_mode=model.meta_standardize)
+        model.train(datagen.as_tf_dataset(), epochs=50)
+        ```
+
+        Args:
+            repeat (bool):                      Boolean, whether the dataset should be repeated infinitely.
+                                                Required if a fixed number of iterations per epoch is used for training.
+            num_parallel_calls (int):           Number of samples which are processed in parallel.
+                                                By default, the parallelism is tuned automatically by tf.data.
+            deterministic (bool):               Boolean, whether the sample order should be retained in the parallel map.
+        Returns:
+            dataset (tf.data.Dataset):          A dataset which yields batches identical to the DataGenerator.
+        """
+        # Infer image shape & dtype from the first sample (without augmentation)
+        img = self.preprocess_image(0, self.prepare_images, run_aug=False)
+        (shape, dtype) = (img.shape, img.dtype)
+        # Use variable spatial dimensions if images are not resized
+        if self.resize is None : shape = (None,) * (img.ndim-1) + shape[-1:]
+        # Cache metadata, labels & sample weights as tensors
+        metadata = None if self.metadata is None else tf.constant(self.metadata)
+        labels = None if self.labels is None else tf.constant(self.labels)
+        sample_weights = None if self.sample_weights is None else \
+                         tf.constant(np.asarray(self.sample_weights))
+        epoch_counter = [0]
+
+        # Generate (index, seed) pairs for each pass through the dataset
+        def generate_indices():
+            epoch = epoch_counter[0]
+            epoch_counter[0] += 1
+            index_array = np.arange(self.n)
+            if self.shuffle and self.seed is not None:
+                index_array = np.random.RandomState(self.seed + epoch).\
+                                       permutation(self.n)
+            elif self.shuffle : index_array = np.random.permutation(self.n)
+            seeds = self.__sample_seeds__(index_array, epoch)
+            for index, seed in zip(index_array, seeds):
+                yield (index, -1 if seed is None else seed)
+
+        # Preprocess a sample (executed in Python by tf.numpy_function)
+        def process_sample(index, seed):
+            seed = None if seed < 0 else int(seed)
+            img = self.preprocess_image(int(index), self.prepare_images,
+                                        seed=seed)
+            return np.ascontiguousarray(img, dtype=dtype)
+
+        # Build sample with metadata, label & sample weight
+        def map_sample(index, seed):
+            img = tf.numpy_function(process_sample, [index, seed],
+                                    tf.as_dtype(dtype))
+            img.set_shape(shape)
+            sample = (img, )
+            if metadata is not None:
+                sample = ((img, tf.gather(metadata, index)), )
+            if labels is not None:
+                sample += (tf.gather(labels, index), )
+            if sample_weights is not None:
+                sample += (tf.gather(sample_weights, index), )
+            return sample
+
+        # Build dataset
+        signature = (tf.TensorSpec(shape=(), dtype=tf.int64),
+                     tf.TensorSpec(shape=(), dtype=tf.int64))
+        dataset = tf.data.Dataset.from_generator(generate_indices,
+                                                 output_signature=signature)
+        cardinality = tf.data.experimental.assert_cardinality(self.n)
+        dataset = dataset.apply(cardinality)
+        dataset = dataset.map(map_sample,
+                              num_parallel_calls=num_parallel_calls,
+                              deterministic=deterministic)
+        dataset = dataset.batch(self.batch_size)
+        if repeat : dataset = dataset.repeat()
+        dataset = dataset.prefetch(tf.data.AUTOTUNE)
+        # Shard batches across replicas based on data
+        options = tf.data.Options()
+        options.experimental_distribute.auto_shard_policy = \
+            tf.data.experimental.AutoShardPolicy.DATA
+        return dataset.with_options(options)
+
+    #-----------------------------------------------------#
+    #                 Worker Pool Handling                #
+    #-----------------------------------------------------#
+    """ Internal function for obtaining the persistent worker pool (created on first call). """
+    def __get_pool__(self):
+        with self.pool_lock:
+            if self.pool is None and self.executor == "process":
+                # Share the resource tracker of shared memory with the workers
+                resource_tracker.ensure_running()
+                self.pool = Pool(self.workers,
+                                 initializer=__init_process_worker__,
+                                 initargs=(self,))
+            elif self.pool is None:
+                self.pool = ThreadPool(self.workers)
+            return self.pool
+
+    def close(self):
+        """ Shut down the persistent worker pool, the prefetching & background preparation thread
+            and release the batch buffers of the DataGenerator.
+
+        Both are recreated automatically if further batches are requested afterwards.
+        """
+        pool_lock = getattr(self, "pool_lock", None)
+        if pool_lock is None : return
+        # Stop background preparation
+        prepare_thread = getattr(self, "prepare_thread", None)
+        if prepare_thread is not None and \
+            prepare_thread is not threading.current_thread():
+            self.prepare_stop.set()
+            prepare_thread.join()
+            self.prepare_thread = None
+            self.prepare_stop.clear()
+        # Shut down prefetching before the worker pool it is relying on
+        if self.prefetch_executor is not None:
+            self.__clear_prefetch_queue__()
+            self.prefetch_executor.shutdown(wait=True)
+            self.prefetch_executor = None
+        with pool_lock:
+            if self.pool is not None:
+                self.pool.close()
+                self.pool.join()
+                self.pool = None
+        # Release batch buffers
+        with self.buffer_lock:
+            finalizers = self.batch_buffer_finalizers
+            self.batch_buffer_ring = []
+            self.batch_buffer_pointer = 0
+            self.batch_buffer_finalizers = []
+            self.batch_shm_free = []
+        for finalizer in finalizers : finalizer()
+
+    """ Context manager functions which ensure shut down of the worker pool. """
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    """ Internal function for shutting down the worker pool during garbage collection. """
+    def __del__(self):
+        self.close()
+
+    """ Internal functions for pickling support (pools, queues and locks are not picklable).
+        The temporary directory object is owned exclusively by the original instance. """
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["pool"] = None
+        state["prefetch_executor"] = None
+        state["prefetch_queue"] = {}
+        state["batch_buffer_ring"] = []
+        state["batch_buffer_pointer"] = 0
+        state["batch_buffer_finalizers"] = []
+        state["batch_shm_free"] = []
+        del state["pool_lock"]
+        del state["prefetch_lock"]
+        del state["buffer_lock"]
+        state["prepare_thread"] = None
+        del state["prepare_stop"]
+        state.pop("prepare_dir_object", None)
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.pool_lock = threading.Lock()
+        self.prefetch_lock = threading.Lock()
+        self.buffer_lock = threading.Lock()
+        self.prepare_stop = threading.Event()
+#-----------------------------------------------------#
+#                     Subroutines                     #
+#-----------------------------------------------------#
+# DataGenerator copy of the current worker process
+__process_datagen__ = None
+# Attached shared memory batch arrays of the current worker process
+__process_shm__ = {}
+
+# Internal function for initializing a worker process of the process pool
+def __init_process_worker__(datagen):
+    global __process_datagen__
+    __process_datagen__ = datagen
+    # Reseed the random state inherited from the parent process (fork) per worker
+    if datagen.seed is None : seed_seq = np.random.SeedSequence()
+    else : seed_seq = np.random.SeedSequence([datagen.seed, os.getpid()])
+    state = seed_seq.generate_state(2)
+    np.random.seed(int(state[0]))
+    random.seed(int(state[1]))
+
+# Internal function for preprocessing an image in a worker process
+def __process_image__(index, prepared_image, seed):
+    run_standardize = not __process_datagen__.standardize_batch
+    return __process_datagen__.preprocess_image(index, prepared_image,
+                                                run_standardize=run_standardize,
+                                                seed=seed)
+
+# Internal function for preparing an image in a worker process
+def __process_prepare__(index):
+    return __process_datagen__.__prepare_sample__(index)
+
+# Internal function for preprocessing an image in a worker process and writing
+# it into its slot of a shared memory batch array
+def __process_image_shm__(index, prepared_image, shm_name, batch_shape, dtype,
+                          slot, seed=None):
+    run_standardize = not __process_datagen__.standardize_batch
+    img = __process_datagen__.preprocess_image(index, prepared_image,
+                                               run_standardize=run_standardize,
+                                               seed=seed)
+    # Return image directly if it does not fit into the batch array
+    if img.shape != tuple(batch_shape[1:]) or img.dtype != np.dtype(dtype):
+        return img
+    # Write image into shared memory (attached once per batch array)
+    shm = __process_shm__.get(shm_name)
+    if shm is None:
+        shm = shared_memory.SharedMemory(name=shm_name)
+        __process_shm__[shm_name] = shm
+    batch_shm = np.ndarray(batch_shape, dtype=dtype, buffer=shm.buf)
+    result = __write_slot__(img, batch_shm, slot)
+    del batch_shm
+    return result
+
+# Internal function for checking whether the apply function of an augmentation accepts a seed
+def __accepts_seed__(apply):
+    return __signature_seed__(getattr(apply, "__func__", apply))
+
+@functools.lru_cache(maxsize=None)
+def __signature_seed__(func):
+    try : parameters = inspect.signature(func).parameters
+    except (TypeError, ValueError) : return False
+    return "seed" in parameters or \
+           any(p.kind == p.VAR_KEYWORD for p in parameters.values())
+
+# Internal function for detaching from a shared memory batch buffer and removing it
+def __release_shm__(shm):
+    # Memory is freed by the OS once all batch views are released
+    try : shm.close()
+    except BufferError : pass
+    try : shm.unlink()
+    except FileNotFoundError : pass
+
+# Maximum array size in bytes for hashing the array content in a configuration
+# description (larger arrays like in-memory images of the cache_loader are
+# identified by object id, shape and dtype)
+__describe_nbytes__ = 65536
+
+# Internal function for describing a configuration object (e.g. Subfunctions or
+# loader parameters) as string for hashing
+def __describe__(obj, depth=0):
+    if obj is None or isinstance(obj, (bool, int, float, str, bytes)):
+        return repr(obj)
+    elif isinstance(obj, np.ndarray) and obj.nbytes > __describe_nbytes__:
+        return "ndarray(" + str(obj.shape) + "," + str(obj.dtype) + \
+               ",id=" + str(id(obj)) + ")"
+    elif isinstance(obj, np.ndarray):
+        return "ndarray(" + str(obj.shape) + "," + str(obj.dtype) + "," + \
+               hashlib.sha256(np.ascontiguousarray(obj).tobytes()).hexdigest() + ")"
+    elif isinstance(obj, (list, tuple)):
+        return "[" + ",".join(__describe__(x, depth+1) for x in obj) + "]"
+    elif isinstance(obj, dict):
+        return "{" + ",".join(repr(k) + ":" + __describe__(obj[k], depth+1) \
+                              for k in sorted(obj, key=repr)) + "}"
+    elif callable(obj) and hasattr(obj, "__qualname__"):
+        return obj.__module__ + "." + obj.__qualname__
+    elif type(obj).__repr__ is not object.__repr__ or depth > 8:
+        return repr(obj)
+    elif not hasattr(obj, "__dict__") : return repr(obj)
+    else:
+        return type(obj).__module__ + "." + type(obj).__qualname__ + \
+               __describe__(vars(obj), depth+1)
+
+# Internal function for writing an image into its slot of a batch array
+# (returns the image if it does not fit into the batch array, otherwise None)
+def __write_slot__(img, batch, slot):
+    if img.shape != batch.shape[1:] or img.dtype != batch.dtype : return img
+    batch[slot] = img
+
+# Internal function for building a batch from a filled batch array and the
+# images which did not fit into it
+def __collect_batch__(batch, results):
+    if all(img is None for img in results) : return batch
+    return np.stack([batch[i] if img is None else img \
+                     for i, img in enumerate(results)], axis=0)
@@ -0,0 +1,57 @@
+#==============================================================================#
+#  Author:       Dominik Müller                                                #
+#  Copyright:    2024 IT-Infrastructure for Translational Medical Research,    #
+#                University of Augsburg                                        #
+#                                                                              #
+#  This program is free software: you can redistribute it and/or modify        #
+#  it under the terms of the GNU General Public License as published by        #
+#  the Free Software Foundation, either version 3 of the License, or           #
+#  (at your option) any later version.                                         #
+#                                                                              #
+#  This program is distributed in the hope that it will be useful,             #
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of              #
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the               #
+#  GNU General Public License for more details.                                #
+#                                                                              #
+#  You should have received a copy of the GNU General Public License           #
+#  along with this program.  If not, see <http://www.gnu.org/licenses/>.       #
+#==============================================================================#
+#-----------------------------------------------------#
+#                    Documentation                    #
+#-----------------------------------------------------#
+""" The IO Cache classes of AUCMEDI allow storing preprocessed samples for fast reuse.
+
+These classes are used **internally** by the [DataGenerator][aucmedi.data_processing.data_generator.DataGenerator].
+
+!!! info "IO_cache Classes"
+    | Class                                                                 | Description                                                  |
+    | --------------------------------------------------------------------- | ------------------------------------------------------------ |
+    | [MemmapStore][aucmedi.data_processing.io_cache.memmap_store]          | Memory-mapped tensor store for fixed-shape prepared images.  |
+    | [DiskCache][aucmedi.data_processing.io_cache.disk_cache]              | Persistent content-addressed cache reusable across runs.     |
+    | [MemoryCache][aucmedi.data_processing.io_cache.memory_cache]          | Bounded in-memory cache with LRU eviction.                   |
+    | [SharedMemoryCache][aucmedi.data_processing.io_cache.shared_memory_cache] | Shared memory cache attachable by other processes zero-copy. |
+
+???+ example
+    ```python
+    # Import required libraries
+    from aucmedi import *
+
+    # Prepare images beforehand into a single memory-mapped file
+    data_gen = DataGenerator(samples, "dataset/images/", labels=class_ohe,
+                             image_format=image_format, resize=(224, 224),
+                             prepare_images=True, prepare_store="memmap")
+
+    # Reuse preprocessed samples across runs and processes
+    from aucmedi.data_processing.io_cache import DiskCache
+    data_gen = DataGenerator(samples, "dataset/images/", labels=class_ohe,
+                             image_format=image_format, resize=(224, 224),
+                             sample_cache=DiskCache("/tmp/aucmedi_cache/"))
+    ```
+"""
+#-----------------------------------------------------#
+#                   Library imports                   #
+#-----------------------------------------------------#
+from aucmedi.data_processing.io_cache.memmap_store import MemmapStore
+from aucmedi.data_processing.io_cache.disk_cache import DiskCache
+from aucmedi.data_processing.io_cache.memory_cache import MemoryCache
+from aucmedi.data_processing.io_cache.shared_memory_cache import SharedMemoryCache
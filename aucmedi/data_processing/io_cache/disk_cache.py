@@ -0,0 +1,210 @@
+#==============================================================================#
+#  Author:       Dominik Müller                                                #
+#  Copyright:    2024 IT-Infrastructure for Translational Medical Research,    #
+#                University of Augsburg                                        #
+#                                                                              #
+#  This program is free software: you can redistribute it and/or modify        #
+#  it under the terms of the GNU General Public License as published by        #
+#  the Free Software Foundation, either version 3 of the License, or           #
+#  (at your option) any later version.                                         #
+#                                                                              #
+#  This program is distributed in the hope that it will be useful,             #
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of              #
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the               #
+#  GNU General Public License for more details.                                #
+#                                                                              #
+#  You should have received a copy of the GNU General Public License           #
+#  along with this program.  If not, see <http://www.gnu.org/licenses/>.       #
+#==============================================================================#
+#-----------------------------------------------------#
+#                   Library imports                   #
+#-----------------------------------------------------#
+# External libraries
+import os
+import zipfile
+import threading
+import numpy as np
+
+#-----------------------------------------------------#
+#        Persistent Disk Cache for AUCMEDI IO         #
+#-----------------------------------------------------#
+class DiskCache:
+    """ A persistent, content-addressed disk cache for preprocessed samples, which can be reused across runs.
+
+    The cache stores each sample as `.npy` file named by a cache key. The key is computed by the
+    [DataGenerator][aucmedi.data_processing.data_generator.DataGenerator] as hash of the sample file identity
+    (path, modification time and size), the loader and its parameters, the Subfunction configurations
+    and the resize shape. Thus, any DataGenerator pointed at the same cache directory (e.g. in the folds of
+    [Bagging][aucmedi.ensemble.bagging], for test-time augmentation or in a new process) reuses
+    already preprocessed samples instead of loading and preprocessing them again.
+
+    If a `max_size` is provided, the least recently used samples are evicted as soon as the cache exceeds
+    the size limit (in bytes).
+
+    Samples can be stored compressed (`compress=True`, as `.npz` file) to reduce the disk usage, or be
+    memory-mapped on reading (`mmap=True`) to avoid reading unused parts of large volumes.
+
+    ???+ warning
+        Cached are the samples after Subfunctions and resizing (before augmentation and standardization).
+        Random Subfunctions (e.g. `Crop(mode="random")`) are frozen by the cache, analog to `prepare_images`.
+
+    ???+ example
+        ```python
+        from aucmedi import *
+        from aucmedi.data_processing.io_cache import DiskCache
+
+        cache = DiskCache("/tmp/aucmedi_cache/", max_size=50*1024**3)    # 50 GB
+        data_gen = DataGenerator(samples, "dataset/images/", labels=class_ohe,
+                                 image_format=image_format, resize=(224, 224),
+                                 sample_cache=cache)
+        ```
+    """
+    #---------------------------------------------#
+    #                Initialization               #
+    #---------------------------------------------#
+    def __init__(self, path, max_size=None, compress=False, mmap=False):
+        """ Initialization function for creating or reusing a DiskCache.
+
+        Args:
+            path (str):                 Path to the cache directory.
+            max_size (int):             Maximum size of the cache in bytes. If `None`, no eviction is performed.
+            compress (bool):            Boolean, whether samples should be stored compressed.
+            mmap (bool):                Boolean, whether samples should be memory-mapped (copy-on-write) on reading.
+                                        Not supported for compressed samples.
+        """
+        # Sanity check for memory-mapping of compressed samples
+        if compress and mmap:
+            raise ValueError("Compressed samples can not be memory-mapped!",
+                             compress, mmap)
+        # Cache class variables
+        self.path = path
+        self.max_size = max_size
+        self.compress = compress
+        self.mmap = mmap
+        if compress : self.suffix = ".npz"
+        else : self.suffix = ".npy"
+        self.hits = 0
+        self.misses = 0
+        self.size = None
+        self.lock = threading.Lock()
+        # Create cache directory
+        os.makedirs(path, exist_ok=True)
+
+    #---------------------------------------------#
+    #                 Cache Usage                 #
+    #---------------------------------------------#
+    def get(self, key):
+        """ Obtain a sample from the cache.
+
+        Args:
+            key (str):                  Cache key of the sample.
+
+        Returns:
+            image (numpy.ndarray):      Cached image or `None`, if the sample is not cached.
+        """
+        path_file = self.__get_path__(key)
+        try:
+            if self.compress:
+                with np.load(path_file, allow_pickle=False) as archive:
+                    image = archive["image"]
+            elif self.mmap:
+                image = np.load(path_file, mmap_mode="c", allow_pickle=False)
+            else : image = np.load(path_file, allow_pickle=False)
+        except (FileNotFoundError, ValueError, EOFError, KeyError,
+                zipfile.BadZipFile):
+            with self.lock : self.misses += 1
+            return None
+        # Mark sample as recently used
+        try : os.utime(path_file)
+        except FileNotFoundError : pass
+        with self.lock : self.hits += 1
+        return image
+
+    def put(self, key, image):
+        """ Store a sample in the cache.
+
+        The file is written atomically. Thus, multiple processes can share the same cache directory.
+
+        Args:
+            key (str):                  Cache key of the sample.
+            image (numpy.ndarray):      Image encoded as NumPy matrix.
+        """
+        path_file = self.__get_path__(key)
+        os.makedirs(os.path.dirname(path_file), exist_ok=True)
+        # Write into temporary file and move it afterwards into place
+        path_tmp = path_file + "." + str(os.getpid()) + "." + \
+                   str(threading.get_ident()) + ".tmp"
+        with open(path_tmp, "wb") as file_writer:
+            if self.compress : np.savez_compressed(file_writer, image=image)
+            else : np.save(file_writer, image, allow_pickle=False)
+        os.replace(path_tmp, path_file)
+        # Evict least recently used samples if cache exceeds size limit
+        if self.max_size is not None:
+            with self.lock:
+                if self.size is None : self.size = self.__compute_size__()
+                else : self.size += os.path.getsize(path_file)
+                if self.size > self.max_size : self.__evict__()
+
+    def __contains__(self, key):
+        return os.path.exists(self.__get_path__(key))
+
+    def __len__(self):
+        return len(self.__list_files__())
+
+    def clear(self):
+        """ Remove all samples from the cache. """
+        with self.lock:
+            for (path_file, stat) in self.__list_files__():
+                os.remove(path_file)
+            self.size = 0
+
+    #---------------------------------------------#
+    #              Internal Functions             #
+    #---------------------------------------------#
+    """ Internal function for obtaining the file path of a key (sharded into subdirectories). """
+    def __get_path__(self, key):
+        return os.path.join(self.path, key[:2], key + self.suffix)
+
+    """ Internal function for listing all cached files with their status information. """
+    def __list_files__(self):
+        files = []
+        for subdir in os.scandir(self.path):
+            if not subdir.is_dir() : continue
+            for entry in os.scandir(subdir.path):
+                if not entry.name.endswith(self.suffix) : continue
+                try : files.append((entry.path, entry.stat()))
+                except FileNotFoundError : continue
+        return files
+
+    """ Internal function for computing the cache size in bytes. """
+    def __compute_size__(self):
+        return sum(stat.st_size for (path_file, stat) in self.__list_files__())
+
+    """ Internal function for evicting the least recently used samples. """
+    def __evict__(self):
+        files = sorted(self.__list_files__(), key=lambda x: x[1].st_mtime)
+        self.size = sum(stat.st_size for (path_file, stat) in files)
+        for (path_file, stat) in files:
+            if self.size <= self.max_size : break
+            try : os.remove(path_file)
+            except FileNotFoundError : pass
+            self.size -= stat.st_size
+
+    """ Internal function for a stable representation (used in cache configurations). """
+    def __repr__(self):
+        return "DiskCache(" + repr(self.path) + ", max_size=" + \
+               repr(self.max_size) + ", compress=" + repr(self.compress) + \
+               ", mmap=" + repr(self.mmap) + ")"
+
+    #---------------------------------------------#
+    #               Pickling Support              #
+    #---------------------------------------------#
+    """ Internal functions for pickling support (locks are not picklable). """
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state["lock"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.lock = threading.Lock()
@@ -0,0 +1,205 @@
+#==============================================================================#
+#  Author:       Dominik Müller                                                #
+#  Copyright:    2024 IT-Infrastructure for Translational Medical Research,    #
+#                University of Augsburg                                        #
+#                                                                              #
+#  This program is free software: you can redistribute it and/or modify        #
+#  it under the terms of the GNU General Public License as published by        #
+#  the Free Software Foundation, either version 3 of the License, or           #
+#  (at your option) any later version.                                         #
+#                                                                              #
+#  This program is distributed in the hope that it will be useful,             #
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of              #
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the               #
+#  GNU General Public License for more details.                                #
+#                                                                              #
+#  You should have received a copy of the GNU General Public License           #
+#  along with this program.  If not, see <http://www.gnu.org/licenses/>.       #
+#==============================================================================#
+#-----------------------------------------------------#
+#                   Library imports                   #
+#-----------------------------------------------------#
+# External libraries
+import os
+import threading
+import numpy as np
+
+#-----------------------------------------------------#
+#         Memory-mapped Tensor Store for AUCMEDI      #
+#-----------------------------------------------------#
+class MemmapStore:
+    """ A memory-mapped tensor store which keeps all prepared samples in a single fixed-shape `.npy` file.
+
+    The store consists of two files inside the store directory:
+
+    - `samples.npy`: NumPy array of shape (n_samples, ...) containing all images.
+    - `index.npy`: Offset index which maps a sample index to its row in `samples.npy` (`-1` for missing samples).
+
+    Reading a sample is a simple slicing operation on the memory-mapped file without any deserialization.
+    Shape and data type of the store are inferred from the first written image.
+
+    ???+ warning
+        All images have to share the same shape and data type (e.g. by using the `resize` parameter of
+        the [DataGenerator][aucmedi.data_processing.data_generator.DataGenerator]).
+
+    ???+ example
+        ```python
+        from aucmedi.data_processing.io_cache import MemmapStore
+
+        store = MemmapStore("prepared_data/", n_samples=len(samples))
+        store.write(0, image)
+        image = store.read(0)
+        batch = store.read([0, 5, 7])
+        ```
+
+    The store can be pickled and is reopened via the file path (e.g. in worker processes).
+    """
+    #---------------------------------------------#
+    #                Initialization               #
+    #---------------------------------------------#
+    def __init__(self, path, n_samples):
+        """ Initialization function for creating or reopening a MemmapStore.
+
+        Args:
+            path (str):                 Path to the store directory.
+            n_samples (int):            Number of samples which can be stored.
+        """
+        # Cache class variables
+        self.path = path
+        self.n_samples = n_samples
+        self.path_data = os.path.join(path, "samples.npy")
+        self.path_index = os.path.join(path, "index.npy")
+        self.shape = None
+        self.dtype = None
+        self.data = None
+        self.index = None
+        self.lock = threading.Lock()
+        # Reopen store if already existent
+        if os.path.exists(self.path_data) and os.path.exists(self.path_index):
+            self.open()
+
+    #---------------------------------------------#
+    #             Store Initialization            #
+    #---------------------------------------------#
+    def create(self, shape, dtype):
+        """ Allocate the store files for images with the provided shape and data type.
+
+        The files are allocated under temporary names and moved into place afterwards. Thus, an existing
+        `index.npy` always marks a completely allocated store.
+
+        Args:
+            shape (tuple of int):       Shape of a single image.
+            dtype (numpy.dtype):        Data type of the images.
+        """
+        os.makedirs(self.path, exist_ok=True)
+        suffix = "." + str(os.getpid()) + ".tmp.npy"
+        data = np.lib.format.open_memmap(self.path_data + suffix, mode="w+",
+                                         dtype=np.dtype(dtype),
+                                         shape=(self.n_samples,) + tuple(shape))
+        index = np.lib.format.open_memmap(self.path_index + suffix, mode="w+",
+                                          dtype=np.int64,
+                                          shape=(self.n_samples,))
+        index[:] = -1
+        data.flush()
+        index.flush()
+        os.replace(self.path_data + suffix, self.path_data)
+        os.replace(self.path_index + suffix, self.path_index)
+        # Cache memory maps
+        self.shape = tuple(shape)
+        self.dtype = np.dtype(dtype)
+        self.data = data
+        self.index = index
+
+    def is_allocated(self):
+        """ Check whether the store files are allocated.
+
+        Returns:
+            allocated (bool):           Boolean, whether the store files exist.
+        """
+        return self.shape is not None or os.path.exists(self.path_index)
+
+    def open(self):
+        """ Open the memory-mapped files of an existing store. """
+        self.data = np.load(self.path_data, mmap_mode="r+")
+        self.index = np.load(self.path_index, mmap_mode="r+")
+        self.shape = self.data.shape[1:]
+        self.dtype = self.data.dtype
+        if len(self.index) != self.n_samples:
+            raise ValueError("MemmapStore: Number of samples does not match " + \
+                             "the existing store!", len(self.index),
+                             self.n_samples)
+
+    #---------------------------------------------#
+    #                 Store Usage                 #
+    #---------------------------------------------#
+    def write(self, index, image):
+        """ Write an image into the store.
+
+        On the first call, the store files are allocated based on the image shape and data type.
+
+        Args:
+            index (int):                Sample index.
+            image (numpy.ndarray):      Image encoded as NumPy matrix.
+        """
+        # Allocate or reopen store if required
+        with self.lock:
+            if self.data is None and os.path.exists(self.path_index):
+                self.open()
+            elif self.data is None : self.create(image.shape, image.dtype)
+        # Verify fixed shape
+        if image.shape != self.shape:
+            raise ValueError("MemmapStore: Image shape does not match the " + \
+                             "store shape! Ensure a fixed image shape (e.g. " + \
+                             "via resize) or use the pickle store.",
+                             image.shape, self.shape)
+        # Store image and register its offset
+        self.data[index] = image
+        self.index[index] = index
+
+    def read(self, index):
+        """ Read one or multiple images from the store.
+
+        Args:
+            index (int or list of int):     Sample index or list of sample indices.
+
+        Returns:
+            image (numpy.ndarray):          Image (or stacked images) encoded as NumPy matrix.
+        """
+        if self.data is None:
+            with self.lock:
+                if self.data is None : self.open()
+        # Obtain offsets of the samples
+        offsets = self.index[index]
+        if np.any(offsets < 0):
+            raise KeyError("MemmapStore: Sample is not available in store!",
+                           index)
+        # Read image(s) via slicing or fancy-indexing
+        return np.array(self.data[offsets])
+
+    def __contains__(self, index):
+        if self.index is None:
+            if not os.path.exists(self.path_index) : return False
+            with self.lock:
+                if self.index is None : self.open()
+        return self.index[index] >= 0
+
+    def flush(self):
+        """ Flush all changes of the memory-mapped files to disk. """
+        if self.data is not None : self.data.flush()
+        if self.index is not None : self.index.flush()
+
+    #---------------------------------------------#
+    #               Pickling Support              #
+    #---------------------------------------------#
+    """ Internal functions for pickling support (memory maps are reopened via the file path). """
+    def __getstate__(self):
+        self.flush()
+        state = self.__dict__.copy()
+        state["data"] = None
+        state["index"] = None
+        del state["lock"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.lock = threading.Lock()
@@ -0,0 +1,162 @@
+#==============================================================================#
+#  Author:       Dominik Müller                                                #
+#  Copyright:    2024 IT-Infrastructure for Translational Medical Research,    #
+#                University of Augsburg                                        #
+#                                                                              #
+#  This program is free software: you can redistribute it and/or modify        #
+#  it under the terms of the GNU General Public License as published by        #
+#  the Free Software Foundation, either version 3 of the License, or           #
+#  (at your option) any later version.                                         #
+#                                                                              #
+#  This program is distributed in the hope that it will be useful,             #
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of              #
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the               #
+#  GNU General Public License for more details.                                #
+#                                                                              #
+#  You should have received a copy of the GNU General Public License           #
+#  along with this program.  If not, see <http://www.gnu.org/licenses/>.       #
+#==============================================================================#
+#-----------------------------------------------------#
+#                   Library imports                   #
+#-----------------------------------------------------#
+# External libraries
+from collections import OrderedDict
+import threading
+import numpy as np
+
+#-----------------------------------------------------#
+#          In-Memory LRU Cache for AUCMEDI IO         #
+#-----------------------------------------------------#
+class MemoryCache:
+    """ A bounded in-memory cache for preprocessed samples with least recently used (LRU) eviction.
+
+    The cache is filled lazily by the [DataGenerator][aucmedi.data_processing.data_generator.DataGenerator]
+    with samples after Subfunctions and resizing (before augmentation and standardization).
+    Thus, from the second epoch on, loading, Subfunctions and resizing are skipped for cached samples.
+
+    In contrast to the [cache_loader][aucmedi.data_processing.io_loader.cache_loader], the samples do not
+    have to be loaded beforehand and the memory consumption is limited by `max_size` (in bytes).
+
+    Cached samples are returned as read-only arrays. Broadcasted axes (e.g. channels of the
+    [Chromer][aucmedi.data_processing.subfunctions.chromer] with `broadcast=True`) are stored only once
+    and returned as broadcast views. The cache provides `hits` and `misses` counters.
+
+    ???+ warning
+        With `executor="process"`, each worker process holds its own copy of the cache.
+
+    ???+ example
+        ```python
+        from aucmedi import *
+        from aucmedi.data_processing.io_cache import MemoryCache
+
+        cache = MemoryCache(max_size=8*1024**3)      # 8 GB
+        data_gen = DataGenerator(samples, "dataset/images/", labels=class_ohe,
+                                 image_format=image_format, resize=(224, 224),
+                                 sample_cache=cache)
+        model.train(data_gen, epochs=10)
+        print(cache.hits, cache.misses)
+        ```
+    """
+    #---------------------------------------------#
+    #                Initialization               #
+    #---------------------------------------------#
+    def __init__(self, max_size=None):
+        """ Initialization function for creating a MemoryCache.
+
+        Args:
+            max_size (int):             Maximum size of the cache in bytes. If `None`, no eviction is performed.
+        """
+        self.max_size = max_size
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.storage = OrderedDict()
+        self.lock = threading.Lock()
+
+    #---------------------------------------------#
+    #                 Cache Usage                 #
+    #---------------------------------------------#
+    def get(self, key):
+        """ Obtain a sample from the cache.
+
+        Args:
+            key (str):                  Cache key of the sample.
+
+        Returns:
+            image (numpy.ndarray):      Cached image (read-only) or `None`, if the sample is not cached.
+        """
+        with self.lock:
+            image = self.storage.get(key)
+            if image is None:
+                self.misses += 1
+                return None
+            # Mark sample as recently used
+            self.storage.move_to_end(key)
+            self.hits += 1
+        return image
+
+    def put(self, key, image):
+        """ Store a copy of a sample in the cache.
+
+        Samples larger than `max_size` are not cached.
+
+        Args:
+            key (str):                  Cache key of the sample.
+            image (numpy.ndarray):      Image encoded as NumPy matrix.
+        """
+        if self.max_size is not None and __nbytes__(image) > self.max_size:
+            return
+        image = __compact_copy__(image)
+        image.flags.writeable = False
+        with self.lock:
+            # Replace already cached sample
+            if key in self.storage:
+                self.size -= __nbytes__(self.storage.pop(key))
+            self.storage[key] = image
+            self.size += __nbytes__(image)
+            # Evict least recently used samples
+            while self.max_size is not None and self.size > self.max_size:
+                (key_lru, image_lru) = self.storage.popitem(last=False)
+                self.size -= __nbytes__(image_lru)
+
+    def __contains__(self, key):
+        return key in self.storage
+
+    def __len__(self):
+        return len(self.storage)
+
+    def clear(self):
+        """ Remove all samples from the cache. """
+        with self.lock:
+            self.storage.clear()
+            self.size = 0
+
+    #---------------------------------------------#
+    #               Pickling Support              #
+    #---------------------------------------------#
+    """ Internal functions for pickling support (locks are not picklable). """
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state["lock"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.lock = threading.Lock()
+
+#-----------------------------------------------------#
+#                  Internal Functions                 #
+#-----------------------------------------------------#
+# Compute the memory consumption of an image (broadcasted axes are counted once)
+def __nbytes__(image):
+    size = image.itemsize
+    for dim, stride in zip(image.shape, image.strides):
+        if stride != 0 : size *= dim
+    return size
+
+# Copy an image while keeping broadcasted axes (stride 0) as broadcast views
+def __compact_copy__(image):
+    if 0 not in image.strides : return image.copy()
+    base = image[tuple(slice(0, 1) if stride == 0 else slice(None) \
+                       for stride in image.strides)]
+    return np.broadcast_to(base.copy(), image.shape)
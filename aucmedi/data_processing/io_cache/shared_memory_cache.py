@@ -0,0 +1,266 @@
+#==============================================================================#
+#  Author:       Dominik Müller                                                #
+#  Copyright:    2024 IT-Infrastructure for Translational Medical Research,    #
+#                University of Augsburg                                        #
+#                                                                              #
+#  This program is free software: you can redistribute it and/or modify        #
+#  it under the terms of the GNU General Public License as published by        #
+#  the Free Software Foundation, either version 3 of the License, or           #
+#  (at your option) any later version.                                         #
+#                                                                              #
+#  This program is distributed in the hope that it will be useful,             #
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of              #
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the               #
+#  GNU General Public License for more details.                                #
+#                                                                              #
+#  You should have received a copy of the GNU General Public License           #
+#  along with this program.  If not, see <http://www.gnu.org/licenses/>.       #
+#==============================================================================#
+#-----------------------------------------------------#
+#                   Library imports                   #
+#-----------------------------------------------------#
+# External libraries
+from multiprocessing import shared_memory, resource_tracker
+import hashlib
+import threading
+import weakref
+import numpy as np
+
+#-----------------------------------------------------#
+#        Shared Memory Cache for AUCMEDI IO           #
+#-----------------------------------------------------#
+# Structure of an index entry
+ENTRY_DTYPE = np.dtype([("key", "S64"), ("offset", "<i8"), ("nbytes", "<i8"),
+                        ("dtype", "S16"), ("ndim", "<i8"), ("shape", "<i8", (8,))])
+# Alignment of samples in the buffer (in bytes)
+ALIGNMENT = 64
+
+class SharedMemoryCache:
+    """ A cache for samples in a single contiguous shared memory buffer, which can be shared between processes.
+
+    The cache consists of one shared memory block containing an index table and the sample data.
+    Samples are appended incrementally and returned as read-only zero-copy views on the buffer.
+
+    In contrast to a Python dictionary, the cache is not copied if it is passed to another process
+    (e.g. the subprocesses of [Bagging][aucmedi.ensemble.bagging] or worker processes with `executor="process"`).
+    Only the name of the shared memory block is pickled and the process attaches to the existing buffer.
+    Samples added afterwards are visible to all attached processes.
+
+    The cache can be passed to the [cache_loader][aucmedi.data_processing.io_loader.cache_loader]
+    (`cache` parameter) or be used as `sample_cache` of the
+    [DataGenerator][aucmedi.data_processing.data_generator.DataGenerator].
+
+    ???+ warning
+        Samples can not be replaced or removed individually. If the `capacity` (in bytes) or `max_samples`
+        is exceeded, further samples are not cached. Writing into the cache is not synchronized between
+        processes, thus the cache should be filled by a single process at a time.
+
+        The shared memory is released via `close()` or when the creating instance is garbage collected
+        (at the latest at interpreter exit).
+
+    ???+ example
+        ```python
+        from aucmedi import *
+        from aucmedi.data_processing.io_loader import cache_loader
+        from aucmedi.data_processing.io_cache import SharedMemoryCache
+
+        cache = SharedMemoryCache(capacity=8*1024**3)      # 8 GB
+        for index, image in zip(samples, images):
+            cache.put(index, image)
+
+        data_gen = DataGenerator(samples, None, labels=class_ohe,
+                                 resize=None, grayscale=False, two_dim=True,
+                                 loader=cache_loader, cache=cache)
+        ```
+    """
+    #---------------------------------------------#
+    #                Initialization               #
+    #---------------------------------------------#
+    def __init__(self, capacity, max_samples=100000):
+        """ Initialization function for creating a SharedMemoryCache.
+
+        Args:
+            capacity (int):             Size of the buffer for sample data in bytes.
+            max_samples (int):          Maximum number of samples in the cache.
+        """
+        # Cache class variables
+        self.capacity = int(capacity)
+        self.max_samples = int(max_samples)
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+        # Share the resource tracker of shared memory with child processes
+        resource_tracker.ensure_running()
+        # Allocate shared memory for header, index table and sample data
+        self.data_offset = __align__(16 + self.max_samples * ENTRY_DTYPE.itemsize)
+        self.shm = shared_memory.SharedMemory(create=True,
+                                              size=self.data_offset + \
+                                                   self.capacity)
+        self.name = self.shm.name
+        self.owner = True
+        # Release shared memory on garbage collection or at interpreter exit
+        self.finalizer = weakref.finalize(self, __release__, self.shm, True)
+        self.__attach__()
+        self.header[:] = 0
+
+    #---------------------------------------------#
+    #                 Cache Usage                 #
+    #---------------------------------------------#
+    def get(self, key):
+        """ Obtain a sample from the cache.
+
+        Args:
+            key (str):                  Cache key of the sample.
+
+        Returns:
+            image (numpy.ndarray):      Cached image (read-only view) or `None`, if the sample is not cached.
+        """
+        with self.lock:
+            i = self.__lookup__(key)
+            if i is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        entry = self.table[i]
+        image = np.ndarray(tuple(entry["shape"][:entry["ndim"]]),
+                           dtype=np.dtype(entry["dtype"].decode("ascii")),
+                           buffer=self.shm.buf,
+                           offset=self.data_offset + int(entry["offset"]))
+        image.flags.writeable = False
+        return image
+
+    def put(self, key, image):
+        """ Store a copy of a sample in the cache.
+
+        Already cached samples are kept and samples exceeding the capacity are not cached.
+
+        Args:
+            key (str):                  Cache key of the sample.
+            image (numpy.ndarray):      Image encoded as NumPy matrix.
+        """
+        image = np.ascontiguousarray(image)
+        if image.dtype.hasobject or image.ndim > ENTRY_DTYPE["shape"].shape[0]:
+            raise ValueError("Image can not be stored in shared memory!",
+                             image.dtype, image.shape)
+        with self.lock:
+            if self.__lookup__(key) is not None : return
+            count = int(self.header[0])
+            offset = __align__(int(self.header[1]))
+            # Skip sample if cache is full
+            if count >= self.max_samples or \
+                offset + image.nbytes > self.capacity:
+                return
+            # Copy sample data into the buffer
+            start = self.data_offset + offset
+            buffer = np.ndarray(image.shape, dtype=image.dtype,
+                                buffer=self.shm.buf, offset=start)
+            buffer[...] = image
+            del buffer
+            # Add index entry and publish it afterwards
+            shape = np.zeros(ENTRY_DTYPE["shape"].shape, dtype=np.int64)
+            shape[:image.ndim] = image.shape
+            self.table[count] = (__hash_key__(key), offset, image.nbytes,
+                                 image.dtype.str, image.ndim, shape)
+            self.header[1] = offset + image.nbytes
+            self.header[0] = count + 1
+
+    def __getitem__(self, key):
+        image = self.get(key)
+        if image is None : raise KeyError(key)
+        return image
+
+    def __setitem__(self, key, image):
+        self.put(key, image)
+
+    def __contains__(self, key):
+        with self.lock : return self.__lookup__(key) is not None
+
+    def __len__(self):
+        return int(self.header[0])
+
+    def clear(self):
+        """ Remove all samples from the cache.
+
+        Already obtained samples of any process are overwritten by new samples afterwards.
+        """
+        with self.lock:
+            self.header[:] = 0
+            self.index = {}
+            self.n_indexed = 0
+
+    def close(self):
+        """ Detach from the shared memory and release it, if this instance created it. """
+        if self.shm is None : return
+        self.header = None
+        self.table = None
+        self.finalizer()
+        self.shm = None
+
+    #---------------------------------------------#
+    #              Internal Functions             #
+    #---------------------------------------------#
+    """ Internal function for creating the header & index table views on the shared memory. """
+    def __attach__(self):
+        self.header = np.ndarray((2,), dtype=np.int64, buffer=self.shm.buf)
+        self.table = np.ndarray((self.max_samples,), dtype=ENTRY_DTYPE,
+                                buffer=self.shm.buf, offset=16)
+        self.index = {}
+        self.n_indexed = 0
+
+    """ Internal function for obtaining the index table position of a key (updates the local index). """
+    def __lookup__(self, key):
+        count = int(self.header[0])
+        # Reset local index if the cache was cleared
+        if count < self.n_indexed:
+            self.index = {}
+            self.n_indexed = 0
+        # Add entries, which were appended in the meantime
+        for i in range(self.n_indexed, count):
+            self.index[bytes(self.table[i]["key"])] = i
+        self.n_indexed = count
+        return self.index.get(__hash_key__(key), None)
+
+    """ Internal function for a stable representation (used in cache configurations). """
+    def __repr__(self):
+        return "SharedMemoryCache(" + repr(self.name) + ", capacity=" + \
+               repr(self.capacity) + ", max_samples=" + \
+               repr(self.max_samples) + ")"
+
+    #---------------------------------------------#
+    #               Pickling Support              #
+    #---------------------------------------------#
+    """ Internal functions for pickling support (only the name of the shared memory is pickled). """
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        for var in ["lock", "shm", "header", "table", "index", "n_indexed",
+                    "finalizer"]:
+            del state[var]
+        state["owner"] = False
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.lock = threading.Lock()
+        self.shm = shared_memory.SharedMemory(name=self.name)
+        self.finalizer = weakref.finalize(self, __release__, self.shm, False)
+        self.__attach__()
+
+#-----------------------------------------------------#
+#                  Internal Functions                 #
+#-----------------------------------------------------#
+# Compute fixed-size index key of a sample key
+def __hash_key__(key):
+    return hashlib.sha256(str(key).encode("utf-8")).hexdigest().encode("ascii")
+
+# Align an offset to the sample alignment
+def __align__(offset):
+    return (offset + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+
+# Detach from a shared memory block and remove it from the system (if unlink is set)
+def __release__(shm, unlink):
+    # Memory is freed by the OS once all views on the buffer are released
+    try : shm.close()
+    except BufferError : pass
+    if unlink:
+        try : shm.unlink()
+        except FileNotFoundError : pass
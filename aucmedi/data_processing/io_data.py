@@ -82,7 +82,8 @@ def input_interface(interface, path_imagedir, path_data=None, training=True,
         ```
 
     Args:
-        path_imagedir (str):            Path to the directory containing the images.
+        path_imagedir (str):            Path to the directory containing the images. Can also be an archive created via
+                                        [pack_archive()][aucmedi.data_processing.io_loader.archive_loader.pack_archive].
         interface (str):                String defining format interface for loading/storing data.
         path_data (str):                Path to the index/class annotation file if required. (csv/json)
         training (bool):                Boolean option whether annotation data is available.
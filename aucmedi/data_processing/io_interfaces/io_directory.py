@@ -23,6 +23,8 @@
 import os
 import numpy as np
 import pandas as pd
+# Internal libraries
+from aucmedi.data_processing.io_loader.archive_loader import Archive
 
 #-----------------------------------------------------#
 #      Data Loader Interface based on Directories     #
@@ -88,19 +90,25 @@ def directory_loader(path_imagedir, allowed_image_formats, training=True):
     # Initialize some variables
     image_format = None
     index_list = []
+    # Use virtual file system if the image directory is an archive
+    if Archive.is_archive(path_imagedir):
+        archive = Archive.open(path_imagedir, revalidate=True)
+        listdir = lambda path: archive.listdir(os.path.relpath(path, path_imagedir))
+        isdir = lambda path: archive.isdir(os.path.relpath(path, path_imagedir))
+    else : listdir, isdir = os.listdir, os.path.isdir
     # Format - including class annotations encoded via subdirectories
     if training:
         class_names = []
         classes_sparse = []
         # Iterate over subdirectories
-        for c, subdirectory in enumerate(sorted(os.listdir(path_imagedir))):
+        for c, subdirectory in enumerate(sorted(listdir(path_imagedir))):
             # Skip items which are not a directory (metadata)
-            if not os.path.isdir(os.path.join(path_imagedir, subdirectory)):
+            if not isdir(os.path.join(path_imagedir, subdirectory)):
                 continue
             class_names.append(subdirectory)
             # Iterate over each sample
             path_sd = os.path.join(path_imagedir, subdirectory)
-            for file in sorted(os.listdir(path_sd)):
+            for file in sorted(listdir(path_sd)):
                 sample = os.path.join(subdirectory, file)
                 index_list.append(sample)
                 classes_sparse.append(c)
@@ -112,7 +120,7 @@ def directory_loader(path_imagedir, allowed_image_formats, training=True):
     # Format - excluding class annotations -> only testing images
     else:
         # Iterate over all images
-        for file in sorted(os.listdir(path_imagedir)):
+        for file in sorted(listdir(path_imagedir)):
             # Identify image format by peaking first image
             if image_format is None:
                 format = file.split(".")[-1]
@@ -24,6 +24,8 @@ import os
 import numpy as np
 import json
 import pandas as pd
+# Internal libraries
+from aucmedi.data_processing.io_loader.archive_loader import Archive
 
 #-----------------------------------------------------#
 #         Data Loader Interface based on JSON         #
@@ -71,9 +73,15 @@ def json_loader(path_data, path_imagedir, allowed_image_formats, training=True,
     # Load JSON file
     with open(path_data, "r") as json_reader:
         dt_json = json.load(json_reader)
+    # Use virtual file system if the image directory is an archive
+    if Archive.is_archive(path_imagedir):
+        archive = Archive.open(path_imagedir, revalidate=True)
+        listdir = lambda path: archive.listdir(os.path.relpath(path, path_imagedir))
+        exists = lambda path: archive.exists(os.path.relpath(path, path_imagedir))
+    else : listdir, exists = os.listdir, os.path.exists
     # Identify image format by peaking first image
     image_format = None
-    for file in os.listdir(path_imagedir):
+    for file in listdir(path_imagedir):
         format = file.split(".")[-1]
         if format.lower() in allowed_image_formats or \
            format.upper() in allowed_image_formats:
@@ -96,7 +104,7 @@ def json_loader(path_data, path_imagedir, allowed_image_formats, training=True,
         else : img_file = sample
         path_img = os.path.join(path_imagedir, img_file)
         # Check existance
-        if not os.path.exists(path_img):
+        if not exists(path_img):
             raise Exception("Image does not exist / not accessible!",
                             'Sample: "' + sample + '"', path_img)
 
@@ -30,6 +30,7 @@ These functions are called **internally** via the [DataGenerator][aucmedi.data_p
     | [sitk_loader()][aucmedi.data_processing.io_loader.sitk_loader]   | SimpleITK Loader for loading NIfTI (nii) or Metafile (mha) formats.    |
     | [numpy_loader()][aucmedi.data_processing.io_loader.numpy_loader] | NumPy Loader for image loading of .npy files.    |
     | [cache_loader()][aucmedi.data_processing.io_loader.cache_loader] | Cache Loader for passing already loaded images. |
+    | [archive_loader()][aucmedi.data_processing.io_loader.archive_loader] | Archive Loader for samples packed via [pack_archive()][aucmedi.data_processing.io_loader.archive_loader.pack_archive]. |
 
     Parameters defined in `**kwargs` are passed down to IO_loader functions.
 
@@ -63,3 +64,5 @@ from aucmedi.data_processing.io_loader.image_loader import image_loader
 from aucmedi.data_processing.io_loader.numpy_loader import numpy_loader
 from aucmedi.data_processing.io_loader.sitk_loader import sitk_loader
 from aucmedi.data_processing.io_loader.cache_loader import cache_loader
+from aucmedi.data_processing.io_loader.archive_loader import archive_loader, \
+                                                            pack_archive
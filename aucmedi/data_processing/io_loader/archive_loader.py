@@ -0,0 +1,354 @@
+#==============================================================================#
+#  Author:       Dominik Müller                                                #
+#  Copyright:    2024 IT-Infrastructure for Translational Medical Research,    #
+#                University of Augsburg                                        #
+#                                                                              #
+#  This program is free software: you can redistribute it and/or modify        #
+#  it under the terms of the GNU General Public License as published by        #
+#  the Free Software Foundation, either version 3 of the License, or           #
+#  (at your option) any later version.                                         #
+#                                                                              #
+#  This program is distributed in the hope that it will be useful,             #
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of              #
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the               #
+#  GNU General Public License for more details.                                #
+#                                                                              #
+#  You should have received a copy of the GNU General Public License           #
+#  along with this program.  If not, see <http://www.gnu.org/licenses/>.       #
+#==============================================================================#
+#-----------------------------------------------------#
+#                   Library imports                   #
+#-----------------------------------------------------#
+# External libraries
+import os
+import io
+import json
+import threading
+import numpy as np
+from PIL import Image
+
+#-----------------------------------------------------#
+#                   Static Variables                  #
+#-----------------------------------------------------#
+ARCHIVE_INDEX = "aucmedi.archive.json"
+""" File name of the archive index. """
+
+#-----------------------------------------------------#
+#            Archive Loader for AUCMEDI IO            #
+#-----------------------------------------------------#
+def archive_loader(sample, path_imagedir, image_format=None, grayscale=False,
+                   two_dim=True, target_shape=None, **kwargs):
+    """ Archive Loader for loading samples from a packed archive within the AUCMEDI pipeline.
+
+    The Archive Loader is an IO_loader function, which have to be passed to the
+    [DataGenerator][aucmedi.data_processing.data_generator.DataGenerator].
+
+    An archive is created via [pack_archive()][aucmedi.data_processing.io_loader.archive_loader.pack_archive]
+    and consists of an index and a few large shard files, which contain the concatenated samples.
+    The shards are memory-mapped once per process and samples are read by offset. Thus, no file has to be
+    opened per sample, which avoids the open/stat latency of many small files on network filesystems.
+
+    Archives with encoded images (e.g. PNG or JPEG bytes) are decoded via Pillow like the
+    [image_loader()][aucmedi.data_processing.io_loader.image_loader]. Archives with arrays
+    (packed via a loader) are returned as read-only zero-copy views on the shard. The
+    [DataGenerator][aucmedi.data_processing.data_generator.DataGenerator] copies them before any in-place processing.
+
+    ???+ example
+        ```python
+        # Import required libraries
+        from aucmedi import *
+        from aucmedi.data_processing.io_loader import archive_loader, pack_archive
+
+        # Initialize input data reader
+        ds = input_interface(interface="csv",
+                             path_imagedir="dataset/images/",
+                             path_data="dataset/annotations.csv",
+                             ohe=False, col_sample="ID", col_class="diagnosis")
+        (samples, class_ohe, nclasses, class_names, image_format) = ds
+
+        # Pack images into an archive
+        pack_archive(samples, "dataset/images/", "dataset/images.archive/",
+                     image_format=image_format)
+
+        # The input_interface works directly on the archive
+        ds = input_interface(interface="csv",
+                             path_imagedir="dataset/images.archive/",
+                             path_data="dataset/annotations.csv",
+                             ohe=False, col_sample="ID", col_class="diagnosis")
+
+        # Initialize DataGenerator with archive_loader
+        data_gen = DataGenerator(samples, "dataset/images.archive/", labels=class_ohe,
+                                 image_format=image_format, loader=archive_loader)
+        ```
+
+    Args:
+        sample (str):               Sample name/index of an image.
+        path_imagedir (str):        Path to the archive directory.
+        image_format (str):         Image format to add at the end of the sample index for image loading.
+        grayscale (bool):           Boolean, whether images are grayscale or RGB.
+        two_dim (bool):             Boolean, whether image is 2D or 3D.
+        target_shape (tuple of int):Shape (height, width) to which encoded JPEG images will be resized afterwards.
+                                    Allows reduced-size decoding like the [image_loader()][aucmedi.data_processing.io_loader.image_loader].
+        **kwargs (dict):            Additional parameters for the sample loader.
+    """
+    # Get image file
+    if image_format : img_file = sample + "." + image_format
+    else : img_file = sample
+    # Read sample from the memory-mapped archive
+    archive = Archive.open(path_imagedir)
+    (data, dtype, shape) = archive.read(img_file)
+    # Decode encoded image via the PIL package
+    if dtype is None:
+        img_raw = Image.open(io.BytesIO(data))
+        # Decode JPEG images at reduced scale if target shape is known
+        if target_shape is not None:
+            img_raw.draft(None, (target_shape[1], target_shape[0]))
+        # Convert image to grayscale or rgb
+        if grayscale : img_converted = img_raw.convert('LA')
+        else : img_converted = img_raw.convert('RGB')
+        # Convert image to NumPy
+        img = np.asarray(img_converted)
+        # Perform additional preprocessing if grayscale image
+        if grayscale:
+            # Remove maximum value and keep only intensity
+            img = img[:,:,0]
+            # Reshape image to create a single channel
+            img = np.reshape(img, img.shape + (1,))
+        # Return image
+        return img
+    # Obtain array as view on the archive
+    img = data.view(dtype).reshape(shape)
+    # Add channel axis for grayscale images
+    if grayscale and ((two_dim and len(img.shape) == 2) or \
+                      (not two_dim and len(img.shape) == 3)):
+        img = np.reshape(img, img.shape + (1,))
+    # Verify image shape
+    n_dims = 3 if two_dim else 4
+    n_channels = 1 if grayscale else 3
+    if len(img.shape) != n_dims or img.shape[-1] != n_channels:
+        raise ValueError("Archive Loader: Expected " + str(n_dims) + "D array " + \
+                         "with " + str(n_channels) + " channel(s), but got:",
+                         img.shape, len(img.shape))
+    # Return image
+    return img
+
+#-----------------------------------------------------#
+#                   Archive Packing                   #
+#-----------------------------------------------------#
+def pack_archive(samples, path_imagedir, path_archive, image_format=None,
+                 loader=None, shard_size=1024**3, **kwargs):
+    """ Function for packing the samples of a dataset into a sharded archive for the
+        [archive_loader()][aucmedi.data_processing.io_loader.archive_loader].
+
+    By default, the encoded bytes of each file (e.g. PNG or JPEG) are concatenated into the shards.
+    If a `loader` is provided, the samples are loaded via the IO_loader function and the
+    resulting arrays are stored instead, which skips decoding during training.
+
+    The archive index is written at the end, thus an incomplete archive is never used.
+    The sample names within the archive are identical to the files in the image directory, which allows
+    using the archive directly as `path_imagedir` for the
+    [input_interface()][aucmedi.data_processing.io_data.input_interface].
+
+    Args:
+        samples (list of str):      List of sample names/indices (e.g. from the input_interface).
+        path_imagedir (str):        Path to the directory containing the images.
+        path_archive (str):         Path to the archive directory which should be created.
+        image_format (str):         Image format to add at the end of the sample index for image loading.
+        loader (io_loader function):    Function for loading samples as arrays. If `None`, encoded files are packed.
+        shard_size (int):           Maximum size of a shard in bytes.
+        **kwargs (dict):            Additional parameters for the sample loader.
+    Returns:
+        path_archive (str):         Path to the archive directory.
+    """
+    os.makedirs(path_archive, exist_ok=True)
+    index = {"version": 1, "shards": [], "samples": {}}
+    shard = None
+    try:
+        for sample in samples:
+            # Get image file
+            if image_format : img_file = sample + "." + image_format
+            else : img_file = sample
+            # Obtain encoded file or array of the sample
+            if loader is None:
+                with open(os.path.join(path_imagedir, img_file), "rb") as fd:
+                    data = fd.read()
+                entry = []
+            else:
+                img = np.ascontiguousarray(loader(sample, path_imagedir,
+                                                  image_format=image_format,
+                                                  **kwargs))
+                data = img.tobytes()
+                entry = [img.dtype.str, list(img.shape)]
+            # Start new shard if current shard is full
+            if shard is None or (shard.tell() > 0 and \
+                                 shard.tell() + len(data) > shard_size):
+                if shard is not None : shard.close()
+                shard_file = "shard_" + str(len(index["shards"])).zfill(5) + ".bin"
+                shard = open(os.path.join(path_archive, shard_file), "wb")
+                index["shards"].append(shard_file)
+            # Append sample to shard (aligned to 64 bytes)
+            offset = shard.tell()
+            shard.write(data)
+            shard.write(b"\0" * (-len(data) % 64))
+            key = __normalize_key__(img_file)
+            index["samples"][key] = [len(index["shards"]) - 1, offset,
+                                     len(data)] + entry
+    finally:
+        if shard is not None : shard.close()
+    # Write archive index atomically
+    path_index = os.path.join(path_archive, ARCHIVE_INDEX)
+    with open(path_index + ".tmp", "w") as fd:
+        json.dump(index, fd)
+    os.replace(path_index + ".tmp", path_index)
+    # Discard a previously opened version of the archive in this process
+    Archive.invalidate(path_archive)
+    return path_archive
+
+#-----------------------------------------------------#
+#                    Archive Reader                   #
+#-----------------------------------------------------#
+class Archive():
+    """ Reader for an archive created via [pack_archive()][aucmedi.data_processing.io_loader.archive_loader.pack_archive].
+
+    The shards are memory-mapped on first access. Opened archives are shared within a process
+    via `Archive.open()`. The archive index is only checked for modifications if requested explicitly
+    (`revalidate=True`), thus reading a sample does not require any filesystem access besides the shards.
+    Besides reading samples, the archive provides a virtual listing of its files and directories
+    for the format interfaces.
+    """
+    # Opened archives of this process
+    __archives__ = {}
+    __archives_lock__ = threading.Lock()
+
+    def __init__(self, path_archive):
+        """ Initialization function for opening an archive.
+
+        Args:
+            path_archive (str):     Path to the archive directory.
+        """
+        self.path_archive = path_archive
+        with open(os.path.join(path_archive, ARCHIVE_INDEX), "r") as fd:
+            stat = os.fstat(fd.fileno())
+            index = json.load(fd)
+        self.identity = (stat.st_mtime_ns, stat.st_size)
+        self.shard_files = index["shards"]
+        self.entries = index["samples"]
+        # Build directory structure
+        self.directories = {"": set()}
+        for key in self.entries:
+            parts = key.split("/")
+            for i in range(0, len(parts)):
+                parent = "/".join(parts[:i])
+                self.directories.setdefault(parent, set()).add(parts[i])
+        self.shards = [None] * len(self.shard_files)
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def is_archive(path):
+        """ Check whether a path is an archive directory. """
+        if path is None : return False
+        return os.path.isfile(os.path.join(path, ARCHIVE_INDEX))
+
+    @classmethod
+    def open(cls, path_archive, revalidate=False):
+        """ Obtain the opened archive of this process (opened on first call).
+
+        Args:
+            path_archive (str):     Path to the archive directory.
+            revalidate (bool):      Boolean, whether the archive should be reopened if its index was modified.
+        Returns:
+            archive (Archive):      Opened archive of this process.
+        """
+        key = (os.getpid(), os.path.abspath(path_archive))
+        archive = cls.__archives__.get(key)
+        if archive is not None and not revalidate : return archive
+        # Check index of an opened archive for modifications
+        if archive is not None:
+            stat = os.stat(os.path.join(path_archive, ARCHIVE_INDEX))
+            if archive.identity == (stat.st_mtime_ns, stat.st_size):
+                return archive
+        with cls.__archives_lock__:
+            if cls.__archives__.get(key) is archive:
+                cls.__archives__[key] = cls(path_archive)
+            return cls.__archives__[key]
+
+    @classmethod
+    def invalidate(cls, path_archive):
+        """ Discard the opened archive of this process (reopened on next call of `Archive.open()`). """
+        key = (os.getpid(), os.path.abspath(path_archive))
+        with cls.__archives_lock__:
+            cls.__archives__.pop(key, None)
+
+    #---------------------------------------------#
+    #                Sample Reading               #
+    #---------------------------------------------#
+    def read(self, file):
+        """ Read a sample from the archive.
+
+        Args:
+            file (str):                 File name of the sample within the archive.
+        Returns:
+            data (numpy.ndarray):       Bytes of the sample as read-only uint8 view on the memory-mapped shard.
+            dtype (str):                Data type of a packed array or `None` for encoded files.
+            shape (tuple of int):       Shape of a packed array or `None` for encoded files.
+        """
+        entry = self.entries.get(__normalize_key__(file))
+        if entry is None:
+            raise FileNotFoundError("Sample does not exist in archive!",
+                                    file, self.path_archive)
+        shard = self.__get_shard__(entry[0])
+        data = shard[entry[1]:entry[1] + entry[2]]
+        if len(entry) > 3 : return data, np.dtype(entry[3]), tuple(entry[4])
+        else : return data, None, None
+
+    """ Internal function for obtaining a memory-mapped shard (opened on first access). """
+    def __get_shard__(self, shard_id):
+        with self.lock:
+            if self.shards[shard_id] is None:
+                path_shard = os.path.join(self.path_archive,
+                                          self.shard_files[shard_id])
+                if os.path.getsize(path_shard) == 0 : shard = np.zeros(0, np.uint8)
+                else : shard = np.asarray(np.memmap(path_shard, dtype=np.uint8,
+                                                    mode="r"))
+                # Prevent modifications of the shared shard by in-place operations
+                shard.flags.writeable = False
+                self.shards[shard_id] = shard
+            return self.shards[shard_id]
+
+    #---------------------------------------------#
+    #               Virtual Listing               #
+    #---------------------------------------------#
+    def listdir(self, path=""):
+        """ List the files and directories of a directory within the archive. """
+        return sorted(self.directories.get(__normalize_key__(path), []))
+
+    def isdir(self, path):
+        """ Check whether a directory exists within the archive. """
+        return __normalize_key__(path) in self.directories
+
+    def exists(self, path):
+        """ Check whether a file or directory exists within the archive. """
+        key = __normalize_key__(path)
+        return key in self.entries or key in self.directories
+
+    #---------------------------------------------#
+    #                   Pickling                  #
+    #---------------------------------------------#
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["shards"] = [None] * len(self.shard_files)
+        del state["lock"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.lock = threading.Lock()
+
+#-----------------------------------------------------#
+#                     Subroutines                     #
+#-----------------------------------------------------#
+# Internal function for normalizing a file path to an archive key
+def __normalize_key__(path):
+    key = os.path.normpath(path).replace(os.sep, "/")
+    if key == "." : return ""
+    return key
@@ -21,6 +21,8 @@
 #-----------------------------------------------------#
 # External libraries
 import numpy as np
+# Internal libraries
+from aucmedi.data_processing.io_cache import SharedMemoryCache
 
 #-----------------------------------------------------#
 #             Cache Loader for AUCMEDI IO             #
@@ -36,11 +38,16 @@ def cache_loader(sample, path_imagedir=None, image_format=None,
     Thus, for multiple images or common data set sizes, this is NOT recommended!
 
     !!! warning
-        This functions requires to pass a Dictionary to the parameter `cache`!
+        This functions requires to pass a Dictionary or a
+        [SharedMemoryCache][aucmedi.data_processing.io_cache.shared_memory_cache] to the parameter `cache`!
 
     Dictionary structure: key=index as String; value=Image as NumPy array <br>
     e.g. cache = {"my_index_001": my_image}
 
+    A [SharedMemoryCache][aucmedi.data_processing.io_cache.shared_memory_cache] stores all images in a single
+    shared memory buffer, which can be filled incrementally and is attached zero-copy by other processes
+    (e.g. the subprocesses of [Bagging][aucmedi.ensemble.bagging]) instead of pickling every image.
+
     ???+ example
         ```python
         # Import required libraries
@@ -68,11 +75,12 @@ def cache_loader(sample, path_imagedir=None, image_format=None,
         image_format (str):         Image format to add at the end of the sample index for image loading.
         grayscale (bool):           Boolean, whether images are grayscale or RGB.
         two_dim (bool):             Boolean, whether image is 2D or 3D.
-        cache (dict):               A Python dictionary containing one or multiple images.
+        cache (dict):               A Python dictionary or SharedMemoryCache containing one or multiple images.
         **kwargs (dict):            Additional parameters for the sample loader.
     """
     # Verify if a cache is provided
-    if cache is None or type(cache) is not dict:
+    if cache is None or (type(cache) is not dict and \
+                         not isinstance(cache, SharedMemoryCache)):
         raise TypeError("No dictionary was provided to cache_loader()!")
     # Obtain image from cache
     img = cache[sample]
@@ -28,7 +28,7 @@ from PIL import Image
 #             Image Loader for AUCMEDI IO             #
 #-----------------------------------------------------#
 def image_loader(sample, path_imagedir, image_format=None, grayscale=False,
-                 **kwargs):
+                 target_shape=None, **kwargs):
     """ Image Loader for image loading within the AUCMEDI pipeline.
 
     The Image Loader is an IO_loader function, which have to be passed to the
@@ -38,6 +38,14 @@ def image_loader(sample, path_imagedir, image_format=None, grayscale=False,
         The Image Loader utilizes Pillow for image loading: <br>
         https://github.com/python-pillow/Pillow
 
+    ???+ info "Reduced-size JPEG Decoding"
+        If a `target_shape` is provided, JPEG images are decoded directly at a reduced scale
+        (1/2, 1/4 or 1/8) via the Pillow draft mode. The smallest scale is selected, whose image
+        is still at least as large as the target shape. This skips most of the decoding work
+        for large images, which are resized afterwards anyway. <br>
+        The result is only approximately equal to a full decoding with subsequent resizing.
+        Other image formats are decoded in full size.
+
     ???+ example
         ```python
         # Import required libraries
@@ -66,6 +74,8 @@ def image_loader(sample, path_imagedir, image_format=None, grayscale=False,
         path_imagedir (str):        Path to the directory containing the images.
         image_format (str):         Image format to add at the end of the sample index for image loading.
         grayscale (bool):           Boolean, whether images are grayscale or RGB.
+        target_shape (tuple of int):Shape (height, width) to which the image will be resized afterwards.
+                                    Allows reduced-size decoding of JPEG images. If `None`, images are decoded in full size.
         **kwargs (dict):            Additional parameters for the sample loader.
     """
     # Get image path
@@ -74,6 +84,9 @@ def image_loader(sample, path_imagedir, image_format=None, grayscale=False,
     path_img = os.path.join(path_imagedir, img_file)
     # Load image via the PIL package
     img_raw = Image.open(path_img)
+    # Decode JPEG images at reduced scale if target shape is known
+    if target_shape is not None:
+        img_raw.draft(None, (target_shape[1], target_shape[0]))
     # Convert image to grayscale or rgb
     if grayscale : img_converted = img_raw.convert('LA')
     else : img_converted = img_raw.convert('RGB')
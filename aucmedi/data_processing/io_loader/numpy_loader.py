@@ -27,13 +27,23 @@ import numpy as np
 #             Numpy Loader for AUCMEDI IO             #
 #-----------------------------------------------------#
 def numpy_loader(sample, path_imagedir, image_format=None, grayscale=False,
-                 two_dim=True, **kwargs):
+                 two_dim=True, mmap_mode="r", allow_pickle=True, **kwargs):
     """ NumPy Loader for image loading within the AUCMEDI pipeline.
 
     The NumPy Loader is an IO_loader function, which have to be passed to the
     [DataGenerator][aucmedi.data_processing.data_generator.DataGenerator].
 
-    The NumPy load function `np.load(path_img, allow_pickle=True)` is used.
+    The NumPy load function `np.load()` is used.
+
+    ???+ info "Memory-mapped loading"
+        Plain `.npy` files are memory-mapped read-only by default (`mmap_mode="r"`) and returned as
+        read-only NumPy arrays. Instead of reading the complete array, only the pages which are accessed by
+        the following Subfunctions (e.g. a Crop) are read from disk. The
+        [DataGenerator][aucmedi.data_processing.data_generator.DataGenerator] copies read-only images before
+        in-place operations. Files which can not be memory-mapped (e.g. object arrays or pickles) are loaded completely.
+
+        With `allow_pickle=False`, loading files which contain pickled data raises a ValueError
+        instead of executing the pickle.
 
     ???+ example
         ```python
@@ -61,14 +71,23 @@ def numpy_loader(sample, path_imagedir, image_format=None, grayscale=False,
         image_format (str):         Image format to add at the end of the sample index for image loading.
         grayscale (bool):           Boolean, whether images are grayscale or RGB.
         two_dim (bool):             Boolean, whether image is 2D or 3D.
+        mmap_mode (str):            Memory-map mode for `np.load()`. Options: `["c", "r", "r+", None]`.
+                                    If `None`, the complete array is read into memory.
+        allow_pickle (bool):        Boolean, whether files containing pickled data are allowed to be loaded.
         **kwargs (dict):            Additional parameters for the sample loader.
     """
     # Get image path
     if image_format : img_file = sample + "." + image_format
     else : img_file = sample
     path_img = os.path.join(path_imagedir, img_file)
-    # Load image via the NumPy package
-    img = np.load(path_img, allow_pickle=True)
+    # Load image via the NumPy package (memory-mapped if possible)
+    img = None
+    if mmap_mode is not None:
+        # Return plain array view on the memory map (no np.memmap subclass)
+        try : img = np.asarray(np.load(path_img, mmap_mode=mmap_mode,
+                                       allow_pickle=False))
+        except ValueError : pass
+    if img is None : img = np.load(path_img, allow_pickle=allow_pickle)
     # Verify image shape for grayscale & 2D
     if grayscale and two_dim:
         # Add channel axis and return image
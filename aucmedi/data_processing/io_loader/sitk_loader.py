@@ -21,14 +21,26 @@
 #-----------------------------------------------------#
 # External libraries
 import os
+import hashlib
 import numpy as np
 import SimpleITK as sitk
 
+#-----------------------------------------------------#
+#              Interpolators for Resampling           #
+#-----------------------------------------------------#
+SITK_INTERPOLATORS = {"linear": sitk.sitkLinear,
+                      "bspline": sitk.sitkBSpline,
+                      "nearest": sitk.sitkNearestNeighbor}
+# Voxel margin around regions required by the interpolators
+SITK_MARGINS = {"linear": 1, "bspline": 4, "nearest": 1}
+
 #-----------------------------------------------------#
 #              SITK Loader for AUCMEDI IO             #
 #-----------------------------------------------------#
 def sitk_loader(sample, path_imagedir, image_format=None, grayscale=True,
-                resampling=(1.0, 1.0, 1.0), outside_value=0, **kwargs):
+                resampling=(1.0, 1.0, 1.0), outside_value=0, region=None,
+                resampling_cache=None, interpolator="linear", threads=None,
+                **kwargs):
     """ SimpleITK Loader for loading of CT/MRI scans in NIfTI (nii) or Metafile (mha) format within the AUCMEDI pipeline.
 
     The SimpleITK Loader is an IO_loader function, which have to be passed to the
@@ -43,6 +55,45 @@ def sitk_loader(sample, path_imagedir, image_format=None, grayscale=True,
         The SimpleITK Loader utilizes SimpleITK for sample loading: <br>
         https://simpleitk.readthedocs.io/en/master/IO.html
 
+    ???+ info "Region Loading"
+        With the parameter `region`, only a sub-volume of the (resampled) volume is returned. The region is defined
+        as tuple `(start, size)` with z,y,x voxel coordinates of the output voxel grid after resampling.
+        Alternatively, a function can be passed, which receives the output shape (z,y,x) of the full volume and
+        returns such a tuple (e.g. for randomly sampled patches).
+
+        Only the input voxels required for the region are read via a streaming `ImageFileReader`
+        (for formats which support streaming like mha or nrrd, other formats are read completely
+        and extracted afterwards) and only the region is resampled.
+        The result is identical to a loading of the full volume with subsequent cropping.
+
+    ???+ info "Resampling Cache"
+        Resampling is deterministic, but the most expensive step of loading. With a `resampling_cache`
+        (e.g. a [DiskCache][aucmedi.data_processing.io_cache.disk_cache]), the resampled volumes are stored
+        and reused in following epochs, runs or processes. The cache key consists of the file identity
+        (path, modification time and size), the voxel spacing, the interpolator and the outside value.
+        A region is cropped from the cached resampled volume.
+
+    ???+ info "Interpolation & Multi-Threading"
+        The interpolator of the resampling can be selected to trade accuracy for speed:
+        `"nearest"` (fastest), `"linear"` (default) or `"bspline"` (most accurate, slowest). <br>
+        Region loading with `"bspline"` is only approximately equal to the full volume, because the B-spline
+        coefficients are computed on the read sub-volume.
+
+        By default, SimpleITK uses its global default number of threads for reading and resampling.
+        In combination with multiple DataGenerator workers, this results into an oversubscription of the CPU.
+        The parameter `threads` defines the number of threads for the reading & resampling of each sample.
+        With `threads="auto"`, the DataGenerator partitions the CPU cores between its workers
+        (cores // workers threads per sample).
+
+        ```python
+        from aucmedi.data_processing.io_cache import DiskCache
+        cache = DiskCache("/tmp/aucmedi_resampled/", compress=True)
+        data_gen = DataGenerator(samples, "dataset/nii_files/", labels=class_ohe,
+                                image_format=image_format, resize=None,
+                                grayscale=True, loader=sitk_loader,
+                                resampling_cache=cache)
+        ```
+
     ???+ example
         ```python
         # Import required libraries
@@ -61,6 +112,12 @@ def sitk_loader(sample, path_imagedir, image_format=None, grayscale=True,
                                 image_format=image_format, resize=None,
                                 grayscale=True, resampling=(2.10, 1.48, 1.48),
                                 loader=sitk_loader)
+
+        # Load only a region of 64x64x64 voxels starting at voxel (10,20,20)
+        data_gen = DataGenerator(samples, "dataset/mha_files/", labels=class_ohe,
+                                image_format=image_format, resize=None,
+                                grayscale=True, loader=sitk_loader,
+                                region=((10, 20, 20), (64, 64, 64)))
         ```
 
     Args:
@@ -70,36 +127,114 @@ def sitk_loader(sample, path_imagedir, image_format=None, grayscale=True,
         grayscale (bool):           Boolean, whether images are grayscale or RGB.
         resampling (tuple of float):Tuple of 3x floats with z,y,x mapping encoding voxel spacing.
                                     If passing `None`, no normalization will be performed.
+        outside_value (float):      Value for voxels outside of the input volume during resampling.
+        region (tuple or function): Region `(start, size)` in z,y,x voxel coordinates of the (resampled) volume, or a
+                                    function returning the region for the full output shape.
+                                    If passing `None`, the complete volume is loaded.
+        resampling_cache (IO_cache):Cache object for resampled volumes. If `None`, no cache is used.
+        interpolator (str):         Interpolator for resampling. Options: `["linear", "bspline", "nearest"]`.
+        threads (int or str):       Number of threads for reading & resampling. `"auto"` uses all CPU cores, which are
+                                    partitioned between the workers by the DataGenerator.
+                                    If `None`, the global default number of threads of SimpleITK is used.
         **kwargs (dict):            Additional parameters for the sample loader.
     """
     # Get image path
     if image_format : img_file = sample + "." + image_format
     else : img_file = sample
     path_img = os.path.join(path_imagedir, img_file)
-    # Load image via the SimpleITK package
-    sample_itk = sitk.ReadImage(path_img)
-    # Perform resampling
+    # Verify interpolator
+    if interpolator not in SITK_INTERPOLATORS:
+        raise ValueError("Unknown interpolator for sitk_loader", interpolator,
+                         "Possibles interpolators are: " + \
+                         str(list(SITK_INTERPOLATORS.keys())))
+    # Obtain number of threads
+    if threads == "auto" : threads = os.cpu_count() or 1
+    # Obtain resampled volume from cache or resample and store it
+    if resampling is not None and resampling_cache is not None:
+        cache_key = __resampling_key__(path_img, resampling, interpolator,
+                                       outside_value)
+        img = resampling_cache.get(cache_key)
+        if img is None:
+            img = sitk_loader(sample, path_imagedir, image_format=image_format,
+                              grayscale=grayscale, resampling=resampling,
+                              outside_value=outside_value,
+                              interpolator=interpolator, threads=threads)
+            resampling_cache.put(cache_key, img)
+        # Crop region from resampled volume
+        if region is not None:
+            (start, size) = __compute_region__(region, img.shape[:3][::-1])
+            img = img[tuple(slice(start[d], start[d] + size[d]) \
+                            for d in reversed(range(3)))]
+        return img
+    # Read image information via the SimpleITK package
+    reader = sitk.ImageFileReader()
+    reader.SetFileName(path_img)
+    if threads is not None : reader.SetNumberOfThreads(int(threads))
+    reader.ReadImageInformation()
+    shape = reader.GetSize()
+    spacing = reader.GetSpacing()
+    origin = reader.GetOrigin()
+    direction = reader.GetDirection()
+    # Reverse resampling spacing to sITK mapping (z,y,x -> x,y,z)
+    if resampling is not None : new_spacing = tuple(resampling[::-1])
+    else : new_spacing = spacing
+    # Estimate output shape after resampling
     if resampling is not None:
-        # Extract information from sample
-        shape = sample_itk.GetSize()
-        spacing = sample_itk.GetSpacing()
-        # Reverse resampling spacing to sITK mapping (z,y,x -> x,y,z)
-        new_spacing = resampling[::-1]
-        # Estimate output shape after resampling
         output_shape = []
         for t in zip(shape, spacing, new_spacing):
             s = int(t[0] * t[1] / t[2])
             output_shape.append(s)
         output_shape = tuple(output_shape)
-        # Perform resampling via sITK
-        sample_itk_resampled = sitk.Resample(sample_itk,
-                                             output_shape,
-                                             sitk.Transform(),
-                                             sitk.sitkLinear,
-                                             sample_itk.GetOrigin(),
-                                             new_spacing,
-                                             sample_itk.GetDirection(),
-                                             outside_value)
+    else : output_shape = tuple(shape)
+    # Read only the input voxels required for the region
+    if region is not None:
+        (region_index, region_size) = __compute_region__(region, output_shape)
+        # Compute origin of the region in physical space
+        output_origin = __index_to_physical__(region_index, origin,
+                                              new_spacing, direction)
+        output_shape = region_size
+        # Map region to continuous input index & add interpolation margin
+        extract_index = []
+        extract_size = []
+        for d in range(len(shape)):
+            # Extract region directly without resampling
+            if resampling is None:
+                extract_index.append(region_index[d])
+                extract_size.append(region_size[d])
+                continue
+            factor = new_spacing[d] / spacing[d]
+            margin = SITK_MARGINS[interpolator]
+            lower = int(np.floor(region_index[d] * factor)) - margin
+            upper = int(np.ceil((region_index[d] + region_size[d] - 1) * \
+                                factor)) + margin
+            lower = min(max(lower, 0), shape[d] - 1)
+            upper = min(max(upper, lower), shape[d] - 1)
+            extract_index.append(lower)
+            extract_size.append(upper - lower + 1)
+        # Perform streaming read of the sub-volume
+        reader.SetExtractIndex(extract_index)
+        reader.SetExtractSize(extract_size)
+        sample_itk = reader.Execute()
+        # Extraction without resampling is already the region
+        if resampling is None : resampling_required = False
+        else : resampling_required = True
+    # Load complete image
+    else:
+        sample_itk = reader.Execute()
+        output_origin = origin
+        resampling_required = resampling is not None
+    # Perform resampling via sITK
+    if resampling_required:
+        resampler = sitk.ResampleImageFilter()
+        resampler.SetSize([int(s) for s in output_shape])
+        resampler.SetTransform(sitk.Transform())
+        resampler.SetInterpolator(SITK_INTERPOLATORS[interpolator])
+        resampler.SetOutputOrigin(output_origin)
+        resampler.SetOutputSpacing(new_spacing)
+        resampler.SetOutputDirection(direction)
+        resampler.SetDefaultPixelValue(outside_value)
+        if threads is not None : resampler.SetNumberOfThreads(int(threads))
+        sample_itk_resampled = resampler.Execute(sample_itk)
     # Skip resampling if None
     else : sample_itk_resampled = sample_itk
     # Convert to NumPy
@@ -108,3 +243,44 @@ def sitk_loader(sample, path_imagedir, image_format=None, grayscale=True,
     if len(img.shape) == 3 : img = np.expand_dims(img, axis=-1)
     # Return image
     return img
+
+#-----------------------------------------------------#
+#                  Internal Functions                 #
+#-----------------------------------------------------#
+# Obtain region in sITK mapping (x,y,z) and verify it inside the output volume
+def __compute_region__(region, output_shape):
+    # Obtain region from function based on output shape (z,y,x)
+    if callable(region) : region = region(tuple(output_shape[::-1]))
+    (start, size) = region
+    # Reverse region to sITK mapping (z,y,x -> x,y,z)
+    start = [int(i) for i in start[::-1]]
+    size = [int(i) for i in size[::-1]]
+    # Verify region
+    if len(start) != len(output_shape) or len(size) != len(output_shape):
+        raise ValueError("Region has to be defined for each volume axis!",
+                         region, output_shape[::-1])
+    for d in range(len(output_shape)):
+        if start[d] < 0 or size[d] <= 0 or \
+            start[d] + size[d] > output_shape[d]:
+            raise ValueError("Region is outside of the (resampled) volume!",
+                             region, tuple(output_shape[::-1]))
+    return start, size
+
+# Compute cache key of a resampled volume based on file identity & resampling
+def __resampling_key__(path_img, resampling, interpolator, outside_value):
+    path_img = os.path.abspath(path_img)
+    try:
+        stat = os.stat(path_img)
+        identity = (path_img, stat.st_mtime_ns, stat.st_size)
+    except OSError : identity = (path_img, None, None)
+    config = (tuple(float(s) for s in resampling), interpolator,
+              float(outside_value))
+    key = repr(identity) + "|" + repr(config)
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+# Compute physical point of a voxel index in a grid with origin, spacing & direction
+def __index_to_physical__(index, origin, spacing, direction):
+    n = len(index)
+    direction = np.reshape(direction, (n, n))
+    offset = direction.dot(np.asarray(index) * np.asarray(spacing))
+    return tuple(float(o) for o in np.asarray(origin) + offset)
@@ -54,23 +54,37 @@ class Chromer(Subfunction_Base):
 
     Typical use case is converting a grayscale to RGB in order to utilize
     transfer learning weights based on ImageNet.
+
+    ???+ info "Broadcasted RGB"
+        With `broadcast=True`, the grayscale -> RGB transformation returns a read-only broadcast view
+        of the single channel instead of three copies. The view is kept by the
+        [DataGenerator][aucmedi.data_processing.data_generator.DataGenerator] until the image is written
+        into the batch, unless augmentation or sample-wise standardization follow (which materialize the channels).
+        A [MemoryCache][aucmedi.data_processing.io_cache.memory_cache] stores the channel only once, while
+        other caches store the materialized channels. Following Subfunctions must not modify images in-place.
     """
     #---------------------------------------------#
     #                Initialization               #
     #---------------------------------------------#
-    def __init__(self, target="rgb"):
+    def __init__(self, target="rgb", validate=True, broadcast=False):
         """ Initialization function for creating a Chromer Subfunction which can be passed to a
             [DataGenerator][aucmedi.data_processing.data_generator.DataGenerator].
 
         Args:
             target (str):               Transformation mode for desired target format.
+            validate (bool):            Boolean, whether the value range [0,255] of each image should be verified.
+                                        Disabling avoids scanning the complete image on each call.
+            broadcast (bool):           Boolean, whether the grayscale -> RGB transformation should return a
+                                        read-only broadcast view instead of replicating the channel.
         """
         # Verify target format
         if target not in ["grayscale", "rgb"]:
             raise ValueError("Unknown target format for Chromer Subfunction",
                              target, "Possibles target formats are: ['grayscale', 'rgb']")
-        # Cache target format
+        # Cache parameter
         self.target = target
+        self.validate = validate
+        self.broadcast = broadcast
 
     #---------------------------------------------#
     #                Transformation               #
@@ -78,18 +92,23 @@ class Chromer(Subfunction_Base):
     def transform(self, image):
         # Verify that image is in correct format
         if self.target == "rgb" and (image.shape[-1] != 1 or \
-                                     np.max(image) > 255 or \
-                                     np.min(image) < 0):
+                                     (self.validate and \
+                                      (np.max(image) > 255 or \
+                                       np.min(image) < 0))):
             raise ValueError("Subfunction Chromer: Image is not in grayscale format!",
                              "Ensure that it is grayscale normalized and has",
                              "a single channel.")
         elif self.target == "grayscale" and (image.shape[-1] != 3 or \
-                                             np.max(image) > 255 or \
-                                             np.min(image) < 0):
+                                             (self.validate and \
+                                              (np.max(image) > 255 or \
+                                               np.min(image) < 0))):
             raise ValueError("Subfunction Chromer: Image is not in RGB format!",
                              "Ensure that it is normalized [0,255] and has 3 channels.")
+        # Run grayscale -> RGB via broadcast view
+        if self.target == "rgb" and self.broadcast:
+            image_chromed = np.broadcast_to(image, image.shape[:-1] + (3,))
         # Run grayscale -> RGB
-        if self.target == "rgb":
+        elif self.target == "rgb":
             image_chromed = np.concatenate((image,)*3, axis=-1)
         # Run RGB -> grayscale
         else:
@@ -104,6 +123,14 @@ class Chromer(Subfunction_Base):
         # Return chromed image
         return image_chromed
 
+    #---------------------------------------------#
+    #          Batch-wise Transformation          #
+    #---------------------------------------------#
+    def transform_batch(self, batch):
+        # Color transformation & validation operate on the channel axis or
+        # on all values, thus the transformation is directly vectorized
+        return self.transform(batch)
+
 
 # convert grayscale to RGB
 # convert RGB to grayscale
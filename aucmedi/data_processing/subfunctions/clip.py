@@ -79,3 +79,11 @@ class Clip(Subfunction_Base):
                                                 a_max=max)
         # Return clipped image
         return image_clipped
+
+    #---------------------------------------------#
+    #          Batch-wise Transformation          #
+    #---------------------------------------------#
+    def transform_batch(self, batch):
+        # Clipping is applied element-wise (per channel on the last axis),
+        # thus the transformation is directly vectorized for a stack of images
+        return self.transform(batch)
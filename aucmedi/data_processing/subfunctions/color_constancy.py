@@ -24,6 +24,9 @@ import numpy as np
 # Internal libraries/scripts
 from aucmedi.data_processing.subfunctions.sf_base import Subfunction_Base
 
+# Number of elements per chunk for the streaming illuminant estimation
+CHUNK_SIZE = 2**18
+
 #-----------------------------------------------------#
 #         Subfunction class: Color Constancy          #
 #-----------------------------------------------------#
@@ -53,14 +56,23 @@ class ColorConstancy(Subfunction_Base):
     #---------------------------------------------#
     #                Initialization               #
     #---------------------------------------------#
-    def __init__(self, power=6):
+    def __init__(self, power=6, downsample=None, inplace=False):
         """ Initialization function for creating a ColorConstancy Subfunction which can be passed to a
             [DataGenerator][aucmedi.data_processing.data_generator.DataGenerator].
 
+        The illuminant is estimated via a streaming reduction over chunks of the image, which avoids
+        full-size temporaries. The correction is applied on a single float32 copy of the image.
+
         Args:
-            power (int):            Exponent for the image.
+            power (int):                Exponent for the image.
+            downsample (int):           Stride for subsampling the spatial axes during the illuminant estimation.
+                                        The correction is still applied on the full image.
+            inplace (bool):             Boolean, whether float32 images should be corrected in place
+                                        instead of on a copy.
         """
         self.power = power
+        self.downsample = downsample
+        self.inplace = inplace
 
     #---------------------------------------------#
     #                Transformation               #
@@ -70,14 +82,86 @@ class ColorConstancy(Subfunction_Base):
         if image.shape[-1] != 3:
             raise ValueError("Image have to be RGB for Color Constancy application!",
                              "Last axis of image is not 3 (RGB):", image.shape)
-        # Apply color constancy filtering (Shades of Gray)
-        img = image.astype('float32')
-        img_power = np.power(img, self.power)
-        axes = tuple(range(len(image.shape[:-1])))
-        rgb_vec = np.power(np.mean(img_power, axes), 1/self.power)
-        rgb_norm = np.sqrt(np.sum(np.power(rgb_vec, 2.0)))
-        rgb_vec = rgb_vec / rgb_norm
-        rgb_vec = 1 / (rgb_vec * np.sqrt(3))
-        img_filtered = np.multiply(img, rgb_vec)
+        # Estimate illuminant of the image (Shades of Gray)
+        rgb_vec = self.__illuminant__(image)
+        # Apply color constancy filtering
+        img_filtered = self.__apply__(image, rgb_vec)
         # Return filtered image
         return img_filtered
+
+    #---------------------------------------------#
+    #          Batch-wise Transformation          #
+    #---------------------------------------------#
+    def transform_batch(self, batch):
+        # Verify if images are RGB
+        if batch.shape[-1] != 3:
+            raise ValueError("Image have to be RGB for Color Constancy application!",
+                             "Last axis of image is not 3 (RGB):", batch.shape[1:])
+        # Estimate illuminant for each sample (Shades of Gray)
+        rgb_vecs = np.stack([self.__illuminant__(image) for image in batch])
+        rgb_vecs = rgb_vecs.reshape((len(batch),) + (1,) * (batch.ndim - 2) + (3,))
+        # Apply color constancy filtering
+        img_filtered = self.__apply__(batch, rgb_vecs)
+        # Return filtered images
+        return img_filtered
+
+    #---------------------------------------------#
+    #               Internal Functions            #
+    #---------------------------------------------#
+    """ Internal function for applying the correction via a single float32 multiplication. """
+    def __apply__(self, image, rgb_vec):
+        if self.inplace and image.dtype == np.float32 and image.flags.writeable:
+            return np.multiply(image, rgb_vec, out=image)
+        return np.multiply(image, rgb_vec, dtype=np.float32)
+
+    """ Internal function for estimating the normalized inverse illuminant of an image. """
+    def __illuminant__(self, image):
+        # Subsample spatial axes for estimation
+        if self.downsample is not None and self.downsample > 1:
+            image = image[(slice(None, None, self.downsample),) * (image.ndim - 1)]
+        # Compute Minkowski norm for each channel
+        rgb_vec = np.power(__power_mean__(image, self.power), 1/self.power)
+        rgb_norm = np.sqrt(np.sum(np.power(rgb_vec, 2.0)))
+        rgb_vec = rgb_vec / rgb_norm
+        rgb_vec = (1 / (rgb_vec * np.sqrt(3))).astype(np.float32)
+        return rgb_vec
+
+#-----------------------------------------------------#
+#                  Internal Functions                 #
+#-----------------------------------------------------#
+""" Internal function for computing the mean of the powered image per channel via a streaming reduction
+    over chunks of the first axis (reusing float32 buffers). """
+def __power_mean__(image, power):
+    channels = image.shape[-1]
+    rows = image.shape[0]
+    step = max(1, CHUNK_SIZE // max(1, int(np.prod(image.shape[1:]))))
+    shape = (min(step, rows),) + image.shape[1:]
+    buffer = np.empty(shape, dtype=np.float32)
+    buffer_base = np.empty(shape, dtype=np.float32)
+    ones = np.ones(buffer.size // channels, dtype=np.float32)
+    total = np.zeros(channels, dtype=np.float64)
+    for start in range(0, rows, step):
+        chunk = image[start:start+step]
+        chunk_power = buffer[:len(chunk)]
+        __chunk_power__(chunk, power, chunk_power, buffer_base[:len(chunk)])
+        # Sum up pixels per channel via matrix-vector product (BLAS)
+        pixels = chunk_power.reshape(-1, channels)
+        total += np.dot(ones[:len(pixels)], pixels)
+    return total / (image.size // channels)
+
+""" Internal function for computing the power of a chunk in float32.
+    Integer exponents are computed via repeated squaring instead of the (slower) generic power. """
+def __chunk_power__(chunk, power, out, base):
+    if not (float(power).is_integer() and power >= 1):
+        return np.power(chunk, power, out=out, dtype=np.float32)
+    np.copyto(base, chunk, casting="same_kind")
+    exponent = int(power)
+    initialized = False
+    while exponent:
+        if exponent & 1:
+            if initialized : np.multiply(out, base, out=out)
+            else : np.copyto(out, base)
+            initialized = True
+        exponent >>= 1
+        if exponent : np.multiply(base, base, out=base)
+    return out
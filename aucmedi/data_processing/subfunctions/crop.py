@@ -75,8 +75,9 @@ class Crop(Subfunction_Base):
             self.aug_transform = mod.Compose([mod.RandomCrop(**params)])
         else : raise ValueError("Unknown mode for crop Subfunction", mode,
                                 "Possibles modes are: ['center', 'random']")
-        # Cache shape
+        # Cache shape & mode
         self.shape = shape
+        self.mode = mode
 
     #---------------------------------------------#
     #                Transformation               #
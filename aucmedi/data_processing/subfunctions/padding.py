@@ -58,24 +58,44 @@ class Padding(Subfunction_Base):
     #                Transformation               #
     #---------------------------------------------#
     def transform(self, image):
+        # Compute padding width
+        pad_list = self.__pad_list__(image.shape)
+        # Identify correct NumPy pad mode
+        if self.mode == "square" : pad_mode = "edge"
+        else : pad_mode = self.mode
+        # Perform padding into desired shape
+        image_padded = np.pad(image, pad_list, mode=pad_mode)
+        # Return padded image
+        return image_padded
+
+    #---------------------------------------------#
+    #          Batch-wise Transformation          #
+    #---------------------------------------------#
+    def transform_batch(self, batch):
+        # Identify padding width based on the identical image shape
+        pad_list = self.__pad_list__(batch.shape[1:])
+        # Identify correct NumPy pad mode
+        if self.mode == "square" : pad_mode = "edge"
+        else : pad_mode = self.mode
+        # Perform padding of all images at once (without padding the batch axis)
+        return np.pad(batch, [[0, 0]] + pad_list, mode=pad_mode)
+
+    #---------------------------------------------#
+    #      Internal Function: Padding Width       #
+    #---------------------------------------------#
+    def __pad_list__(self, shape):
         # Identify new shape
         if self.mode == "square":
-            max_axis = max(image.shape[:-1])
-            new_shape = [max_axis for x in range(0, len(image.shape[:-1]))]
+            max_axis = max(shape[:-1])
+            new_shape = [max_axis for x in range(0, len(shape[:-1]))]
         else:
-            new_shape = [max(self.shape[i],image.shape[i]) \
-                         for i in range(0, len(image.shape[:-1]))]
+            new_shape = [max(self.shape[i],shape[i]) \
+                         for i in range(0, len(shape[:-1]))]
         # Compute padding width
         ## Code inspiration from: https://github.com/MIC-DKFZ/batchgenerators/blob/master/batchgenerators/augmentations/utils.py
         ## Leave a star for them if you are reading this. The MIC-DKFZ is doing some great work ;)
-        difference = new_shape - np.asarray(image.shape[0:-1])
+        difference = new_shape - np.asarray(shape[0:-1])
         pad_below = difference // 2
         pad_above = difference // 2 + difference % 2
         pad_list = list([list(i) for i in zip(pad_below, pad_above)]) + [[0, 0]]
-        # Identify correct NumPy pad mode
-        if self.mode == "square" : pad_mode = "edge"
-        else : pad_mode = self.mode
-        # Perform padding into desired shape
-        image_padded = np.pad(image, pad_list, mode=pad_mode)
-        # Return padded image
-        return image_padded
+        return pad_list
@@ -20,8 +20,9 @@
 #                   Library imports                   #
 #-----------------------------------------------------#
 # External libraries
-import albumentations
-import volumentations
+import numpy as np
+import cv2
+from scipy import ndimage
 # Internal libraries/scripts
 from aucmedi.data_processing.subfunctions.sf_base import Subfunction_Base
 
@@ -34,14 +35,21 @@ class Resize(Subfunction_Base):
     ???+ info "2D image"
         Shape have to be defined as tuple with x and y size: `Resize(shape=(224, 224))`
 
-        Resizing is done via albumentations resize transform which uses bi-linear interpolation by default. <br>
+        Resizing is done via cv2 resize with the same semantics as the albumentations resize transform
+        which uses bi-linear interpolation by default. <br>
         https://albumentations.ai/docs/api_reference/augmentations/geometric/resize/
 
     ???+ info "3D volume"
         Shape has to be defined as tuple with x, y and z size: `Resize(shape=(128, 128, 128))`
 
-        Resizing is done via volumentations resize transform which uses bi-linear interpolation by default. <br>
+        Resizing is done with the same semantics as the volumentations resize transform
+        which uses bi-linear interpolation by default. <br>
         https://github.com/muellerdo/volumentations
+
+        For nearest-neighbor and linear interpolation, a separable resampler is used which
+        interpolates each axis independently instead of the full-volume zoom.
+
+    Images which already match the desired shape are returned without resizing.
     """
     #---------------------------------------------#
     #                Initialization               #
@@ -55,27 +63,107 @@ class Resize(Subfunction_Base):
             interpolation (int):        Interpolation mode for resizing. Using encoding from cv2:
                                         https://docs.opencv.org/3.4/da/d54/group__imgproc__transform.html
         """
-        # Initialize parameter
-        params = {"p":1.0, "always_apply":True, "interpolation":interpolation}
-        # Select augmentation module and add further parameter depending on dimension
-        if len(shape) == 2:
-            params["height"] = shape[0]
-            params["width"] = shape[1]
-            mod = albumentations
-        elif len(shape) == 3:
-            params["shape"] = shape
-            mod = volumentations
-        else : raise ValueError("Shape for Resize has to be 2D or 3D!", shape)
-        # Initialize resizing transform
-        self.aug_transform = mod.Compose([mod.Resize(**params)])
-        # Cache shape
+        # Verify dimension of shape
+        if len(shape) not in [2, 3]:
+            raise ValueError("Shape for Resize has to be 2D or 3D!", shape)
+        # Cache parameter
         self.shape = shape
+        self.interpolation = interpolation
 
     #---------------------------------------------#
     #                Transformation               #
     #---------------------------------------------#
     def transform(self, image):
         # Perform resizing into desired shape
-        image_resized = self.aug_transform(image=image)["image"]
+        if len(self.shape) == 2:
+            image_resized = self.__resize_2D__(image)
+        else : image_resized = self.__resize_3D__(image)
         # Return resized image
         return image_resized
+
+    #---------------------------------------------#
+    #               Internal Functions            #
+    #---------------------------------------------#
+    """ Internal function for resizing an image via cv2 (albumentations semantics). """
+    def __resize_2D__(self, image):
+        height, width = self.shape
+        # Skip resizing if image already matches the desired shape
+        if image.shape[:2] == (height, width) : return image
+        # Resize image with up to 4 channels at once
+        if image.ndim == 2 or image.shape[-1] <= 4:
+            image_resized = cv2.resize(image, dsize=(width, height),
+                                       interpolation=self.interpolation)
+        # Resize image in chunks of 4 channels (2 channels are not supported by all cv2 functions)
+        else:
+            bounds = []
+            for i in range(0, image.shape[-1], 4):
+                if image.shape[-1] - i == 2 : bounds += [(i, i+1), (i+1, i+2)]
+                else : bounds.append((i, min(i+4, image.shape[-1])))
+            chunks = [cv2.resize(np.ascontiguousarray(image[..., start:end]),
+                                 dsize=(width, height),
+                                 interpolation=self.interpolation) \
+                      for (start, end) in bounds]
+            chunks = [c if c.ndim == 3 else c[..., np.newaxis] for c in chunks]
+            image_resized = np.concatenate(chunks, axis=-1)
+        # Preserve channel axis which is dropped by cv2 for a single channel
+        if image.ndim == 3 and image_resized.ndim == 2:
+            image_resized = image_resized[..., np.newaxis]
+        return image_resized
+
+    """ Internal function for resizing a volume (volumentations semantics). """
+    def __resize_3D__(self, image):
+        # Cast volume into float32 like volumentations
+        image = image.astype(np.float32, copy=False)
+        shape = tuple(self.shape)
+        # Skip resizing if volume already matches the desired shape
+        if image.shape[:3] == shape : return np.ascontiguousarray(image)
+        # Resample each axis independently via separable interpolation
+        if self.interpolation in [0, 1]:
+            # Process shrinking axes first to reduce the intermediate size
+            ratios = [shape[axis] / image.shape[axis] for axis in range(0, 3)]
+            for axis in np.argsort(ratios, kind="stable"):
+                image = __resample_axis__(image, int(axis), shape[axis],
+                                          self.interpolation)
+            return np.ascontiguousarray(image)
+        # Resample full volume via spline interpolation (skimage semantics)
+        factors = [shape[axis] / image.shape[axis] for axis in range(0, 3)]
+        factors += [1.0] * (image.ndim - 3)
+        image_resized = ndimage.zoom(image, factors, order=self.interpolation,
+                                     mode="mirror", grid_mode=True)
+        np.clip(image_resized, image.min(), image.max(), out=image_resized)
+        return image_resized
+
+#-----------------------------------------------------#
+#                 Separable Resampling                #
+#-----------------------------------------------------#
+""" Internal function for resampling a single axis via nearest-neighbor (order 0) or linear (order 1)
+    interpolation with half-pixel aligned grids and mirrored boundaries like scipy.ndimage.zoom. """
+def __resample_axis__(image, axis, size, order):
+    n = image.shape[axis]
+    if n == size : return image
+    # Compute sampling coordinates in the input grid
+    coords = (np.arange(size, dtype=np.float64) + 0.5) * (n / size) - 0.5
+    # Nearest-neighbor interpolation
+    if order == 0:
+        index = __mirror_index__(np.floor(coords + 0.5).astype(np.intp), n)
+        return np.take(image, index, axis=axis)
+    # Linear interpolation between both neighbors
+    lower = np.floor(coords)
+    weight = (coords - lower).astype(image.dtype)
+    lower = lower.astype(np.intp)
+    index_lower = __mirror_index__(lower, n)
+    index_upper = __mirror_index__(lower + 1, n)
+    weight = weight.reshape([-1 if i == axis else 1 for i in range(image.ndim)])
+    image_lower = np.take(image, index_lower, axis=axis)
+    image_upper = np.take(image, index_upper, axis=axis)
+    image_upper -= image_lower
+    image_upper *= weight
+    image_upper += image_lower
+    return image_upper
+
+""" Internal function for mapping indices outside of the grid via mirroring. """
+def __mirror_index__(index, n):
+    if n == 1 : return np.zeros_like(index)
+    period = 2 * (n - 1)
+    index = np.abs(index) % period
+    return np.where(index >= n, period - index, index)
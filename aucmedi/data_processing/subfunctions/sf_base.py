@@ -21,6 +21,7 @@
 #-----------------------------------------------------#
 # External libraries
 from abc import ABC, abstractmethod
+import numpy as np
 
 #-----------------------------------------------------#
 #         Abstract Base Class for Subfunctions        #
@@ -53,6 +54,11 @@ class Subfunction_Base(ABC):
         | `__init__()`        | Object creation function.                  |
         | `transform()`       | Transform the image.                       |
 
+    ???+ info "Optional Functions"
+        | Function            | Description                                |
+        | ------------------- | ------------------------------------------ |
+        | `transform_batch()` | Transform a stack of images with identical shape (default: `transform()` on each image). |
+
     """
     #---------------------------------------------#
     #                Initialization               #
@@ -81,3 +87,20 @@ class Subfunction_Base(ABC):
             image (numpy.ndarray):      Transformed image encoded as NumPy matrix with 1 or 3 channels. (e.g. 224x224x3)
         """
         return image
+
+    #---------------------------------------------#
+    #          Batch-wise Transformation          #
+    #---------------------------------------------#
+    def transform_batch(self, batch):
+        """ Transform a stack of images with identical shape according to the subfunction.
+
+        By default, `transform()` is applied on each image. Subfunctions can override this function with
+        a vectorized implementation, which is used by the DataGenerator if `subfunctions_batch=True`.
+
+        Args:
+            batch (numpy.ndarray):      Stack of images encoded as NumPy matrix (e.g. 32x224x224x3).
+
+        Returns:
+            batch (numpy.ndarray):      Stack of transformed images encoded as NumPy matrix.
+        """
+        return np.stack([self.transform(image) for image in batch], axis=0)
@@ -0,0 +1,257 @@
+#==============================================================================#
+#  Author:       Dominik Müller                                                #
+#  Copyright:    2024 IT-Infrastructure for Translational Medical Research,    #
+#                University of Augsburg                                        #
+#                                                                              #
+#  This program is free software: you can redistribute it and/or modify        #
+#  it under the terms of the GNU General Public License as published by        #
+#  the Free Software Foundation, either version 3 of the License, or           #
+#  (at your option) any later version.                                         #
+#                                                                              #
+#  This program is distributed in the hope that it will be useful,             #
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of              #
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the               #
+#  GNU General Public License for more details.                                #
+#                                                                              #
+#  You should have received a copy of the GNU General Public License           #
+#  along with this program.  If not, see <http://www.gnu.org/licenses/>.       #
+#==============================================================================#
+#-----------------------------------------------------#
+#                   Library imports                   #
+#-----------------------------------------------------#
+# External libraries
+import numpy as np
+# Internal libraries/scripts
+from aucmedi.data_processing.subfunctions.padding import Padding
+from aucmedi.data_processing.subfunctions.crop import Crop
+from aucmedi.data_processing.subfunctions.clip import Clip
+from aucmedi.data_processing.subfunctions.standardize import Standardize
+
+#-----------------------------------------------------#
+#          Fused Pipeline of Subfunctions             #
+#-----------------------------------------------------#
+class Subfunction_Pipeline:
+    """ A pipeline which fuses a chain of Subfunctions (plus resizing) into fewer operations with less
+        intermediate arrays.
+
+    The pipeline is created by the [DataGenerator][aucmedi.data_processing.data_generator.DataGenerator]
+    if `fuse_subfunctions=True` and is applied instead of the sequential `transform()` calls.
+    The output is numerically identical to the sequential application of the Subfunctions.
+
+    ???+ info "Fusion Rules"
+        | Subfunctions                                       | Fused Operation                                               |
+        | -------------------------------------------------- | ------------------------------------------------------------- |
+        | `Padding` (mode square/edge/constant) + `Crop` (mode center) | Slicing of the crop window from the original image and padding of only the missing border. |
+        | `Crop` (mode center)                               | Slicing as view without copying (e.g. passed directly into the following Resize). |
+        | `Clip` + `Standardize` (mode z-score/minmax/grayscale) | Clipping into a single working array, which is normalized in-place. |
+        | `Clip`                                             | In-place clipping of intermediate arrays.                     |
+
+        All other Subfunctions (including custom Subfunctions) are applied via their `transform()` function.
+        Images provided by the loader are never modified in-place.
+
+    ???+ example
+        ```python
+        from aucmedi.data_processing.subfunctions import *
+        from aucmedi.data_processing.subfunctions.sf_pipeline import Subfunction_Pipeline
+
+        pipeline = Subfunction_Pipeline([Padding(mode="square"), Crop(shape=(224, 224))],
+                                        resize=Resize(shape=(128, 128)))
+        image_processed = pipeline.transform(image)
+        ```
+    """
+    #---------------------------------------------#
+    #                Initialization               #
+    #---------------------------------------------#
+    def __init__(self, subfunctions, resize=None):
+        """ Initialization function for compiling a chain of Subfunctions into a fused pipeline.
+
+        Args:
+            subfunctions (list of Subfunctions):    List of Subfunctions class instances, which are applied sequentially.
+            resize (Resize):                        Resize Subfunction, which is applied after the Subfunctions.
+                                                    If `None`, no resizing is performed.
+        """
+        steps = list(subfunctions)
+        if resize is not None : steps.append(resize)
+        self.subfunctions = steps
+        # Compile steps into stages
+        self.stages = []
+        i = 0
+        while i < len(steps):
+            sf = steps[i]
+            sf_next = steps[i+1] if i+1 < len(steps) else None
+            # Fuse padding and center cropping
+            if __is_fusable_padding__(sf) and __is_center_crop__(sf_next):
+                self.stages.append((self.__pad_crop__, (sf, sf_next)))
+                i += 2
+            # Fuse clipping and standardization
+            elif __is_fusable_clip__(sf) and __is_fusable_standardize__(sf_next):
+                self.stages.append((self.__clip_standardize__, (sf, sf_next)))
+                i += 2
+            # Perform center cropping via slicing
+            elif __is_center_crop__(sf):
+                self.stages.append((self.__crop__, (sf,)))
+                i += 1
+            # Perform in-place clipping
+            elif __is_fusable_clip__(sf):
+                self.stages.append((self.__clip__, (sf,)))
+                i += 1
+            # Apply Subfunction via its transform function
+            else:
+                self.stages.append((self.__transform__, (sf,)))
+                i += 1
+
+    #---------------------------------------------#
+    #                Transformation               #
+    #---------------------------------------------#
+    def transform(self, image):
+        """ Apply the fused pipeline on an image.
+
+        Args:
+            image (numpy.ndarray):      Image encoded as NumPy matrix with 1 or 3 channels. (e.g. 224x224x3)
+
+        Returns:
+            image (numpy.ndarray):      Transformed image encoded as NumPy matrix.
+        """
+        # The input image is not owned by the pipeline (no in-place operations)
+        owned = False
+        for (stage, sfs) in self.stages:
+            (image, owned) = stage(image, owned, *sfs)
+        return image
+
+    #---------------------------------------------#
+    #               Internal Stages               #
+    #---------------------------------------------#
+    """ Internal stage for applying a Subfunction via its transform function. """
+    def __transform__(self, image, owned, sf):
+        # Result could be a view on the input, thus it is not owned
+        return sf.transform(image), False
+
+    """ Internal stage for center cropping via slicing. """
+    def __crop__(self, image, owned, sf):
+        window = __center_window__(image.shape[:-1], sf.shape)
+        # Apply Subfunction for invalid crop shapes (raises the same exception)
+        if window is None : return self.__transform__(image, owned, sf)
+        # Volumes are cast to float32 (analog to volumentations)
+        if len(sf.shape) == 3 : return image[window].astype(np.float32), True
+        return image[window], owned
+
+    """ Internal stage for padding & center cropping in one step. """
+    def __pad_crop__(self, image, owned, sf_pad, sf_crop):
+        shape = np.asarray(image.shape[:-1])
+        # Compute padded shape & padding below (analog to Padding)
+        if sf_pad.mode == "square":
+            padded_shape = np.full(len(shape), max(shape))
+        else:
+            padded_shape = np.asarray([max(sf_pad.shape[i], shape[i]) \
+                                       for i in range(0, len(shape))])
+        pad_below = (padded_shape - shape) // 2
+        # Compute crop window in the padded image (analog to Crop)
+        crop_shape = np.asarray(sf_crop.shape)
+        if len(crop_shape) != len(shape) or np.any(crop_shape > padded_shape):
+            image = sf_pad.transform(image)
+            return self.__transform__(image, True, sf_crop)
+        start = (padded_shape - crop_shape) // 2 - pad_below
+        stop = start + crop_shape
+        # Obtain intersection of crop window & original image
+        lower = np.clip(start, 0, shape)
+        upper = np.clip(stop, 0, shape)
+        if np.any(lower >= upper):
+            image = sf_pad.transform(image)
+            return self.__transform__(image, True, sf_crop)
+        window = tuple(slice(lower[i], upper[i]) for i in range(len(shape)))
+        image = image[window]
+        # Volumes are cast to float32 (analog to volumentations)
+        if len(shape) == 3:
+            image = image.astype(np.float32)
+            owned = True
+        # Pad only the border outside of the original image
+        pad_list = [[lower[i] - start[i], stop[i] - upper[i]] \
+                    for i in range(len(shape))] + [[0, 0]]
+        if not np.any(pad_list) : return image, owned
+        if sf_pad.mode == "square" : pad_mode = "edge"
+        else : pad_mode = sf_pad.mode
+        return np.pad(image, pad_list, mode=pad_mode), True
+
+    """ Internal stage for clipping (in-place on owned images). """
+    def __clip__(self, image, owned, sf):
+        if owned and __clip_dtype__(image, sf) == image.dtype:
+            np.clip(image, a_min=sf.min, a_max=sf.max, out=image)
+            return image, True
+        return np.clip(image, a_min=sf.min, a_max=sf.max), True
+
+    """ Internal stage for clipping & standardization with a single working array. """
+    def __clip_standardize__(self, image, owned, sf_clip, sf_std):
+        (image, owned) = self.__clip__(image, owned, sf_clip)
+        # Cast image once into working precision if a dtype is provided
+        if sf_std.dtype is not None:
+            if sf_std.dtype == np.float64 : work_dtype = np.float64
+            else : work_dtype = np.float32
+            owned = owned or image.dtype != work_dtype
+            image = image.astype(work_dtype, copy=False)
+        # Compute normalization in-place on the working array
+        if sf_std.mode == "z-score":
+            mean = np.mean(image)
+            std = np.std(image)
+            image_norm = __subtract_inplace__(image, mean, owned)
+            image_norm = __add_inplace__(image_norm, sf_std.e)
+            image_norm /= (std + sf_std.e)
+        else:
+            max_value = np.max(image)
+            min_value = np.min(image)
+            image_norm = __subtract_inplace__(image, min_value, owned)
+            image_norm = __add_inplace__(image_norm, sf_std.e)
+            image_norm /= (max_value - min_value + sf_std.e)
+            if sf_std.mode == "grayscale":
+                image_norm *= 255
+                np.around(image_norm, decimals=0, out=image_norm)
+        # Cast standardized image into desired output data type
+        if sf_std.dtype is not None:
+            image_norm = image_norm.astype(sf_std.dtype, copy=False)
+        return image_norm, True
+
+#-----------------------------------------------------#
+#                  Internal Functions                 #
+#-----------------------------------------------------#
+# Check whether a Subfunction is a padding, which can be fused with cropping
+def __is_fusable_padding__(sf):
+    return type(sf) is Padding and sf.mode in ["square", "edge", "constant"]
+
+# Check whether a Subfunction is a center cropping
+def __is_center_crop__(sf):
+    return type(sf) is Crop and sf.mode == "center"
+
+# Check whether a Subfunction is a clipping across all channels
+def __is_fusable_clip__(sf):
+    return type(sf) is Clip and not sf.per_channel
+
+# Check whether a Subfunction is a standardization across all channels
+def __is_fusable_standardize__(sf):
+    return type(sf) is Standardize and not sf.per_channel and \
+           sf.mode in ["z-score", "minmax", "grayscale"]
+
+# Compute data type of a clipped image
+def __clip_dtype__(image, sf):
+    return np.clip(np.zeros(1, dtype=image.dtype),
+                   a_min=sf.min, a_max=sf.max).dtype
+
+# Subtract a value from an image (in-place if owned and data type is preserved)
+def __subtract_inplace__(image, value, owned):
+    if owned and np.result_type(image, value) == image.dtype:
+        return np.subtract(image, value, out=image)
+    return image - value
+
+# Add a value to an intermediate image (in-place if data type is preserved)
+def __add_inplace__(image, value):
+    if np.result_type(image, value) == image.dtype:
+        return np.add(image, value, out=image)
+    return image + value
+
+# Compute center crop window (analog to albumentations & volumentations)
+def __center_window__(shape, crop_shape):
+    if len(crop_shape) != len(shape) : return None
+    window = []
+    for (size, crop_size) in zip(shape, crop_shape):
+        if crop_size > size : return None
+        start = (size - crop_size) // 2
+        window.append(slice(start, start + crop_size))
+    return tuple(window)
@@ -22,6 +22,7 @@
 # External libraries
 from tensorflow.keras.applications import imagenet_utils
 import numpy as np
+import json
 # Internal libraries/scripts
 from aucmedi.data_processing.subfunctions.sf_base import Subfunction_Base
 
@@ -35,7 +36,7 @@ class Standardize(Subfunction_Base):
 
     Default mode: `"z-score"`
 
-    Possible modes: `["z-score", "minmax", "grayscale", "tf", "caffe", "torch"]`
+    Possible modes: `["z-score", "minmax", "grayscale", "tf", "caffe", "torch", "dataset"]`
 
 
     ???+ info "Mode Descriptions"
@@ -48,6 +49,23 @@ class Standardize(Subfunction_Base):
         | `"caffe"`           | Will convert the images from RGB to BGR, then will zero-center each color channel with respect to the ImageNet dataset, without scaling. (RGB encoding required!) |
         | `"tf"`              | Will scale pixels between -1 and 1, sample-wise. (Grayscale/RGB encoding required!) |
         | `"torch"`           | Will scale pixels between 0 and 1 and then will normalize each channel with respect to the ImageNet dataset. (RGB encoding required!) |
+        | `"dataset"`         | Z-score normalization with fixed dataset-wide mean & standard deviation (statistics required!). |
+
+    ???+ info "Dataset-wide standardization"
+        The mode `"dataset"` requires `statistics` computed via
+        [compute_dataset_statistics()][aucmedi.utils.dataset_statistics.compute_dataset_statistics].
+        The mean & standard deviation are fixed constants (per channel if `per_channel=True`), thus
+        the standardization is a single multiply-add per voxel which is identical for all samples.
+
+    ???+ info "Output data type"
+        By default, the output data type results from the applied operations (e.g. float64 for uint8 images).
+        If a `dtype` is provided, the image is cast a single time to float32 (or float64 for `dtype="float64"`),
+        normalized in this precision and returned in the desired `dtype`.
+
+    ???+ info "Batch-wise standardization"
+        Via `transform_batch()`, a complete stack of images with shape (batch, ..., channels) is standardized
+        with vectorized reductions over the image axes (per sample or per sample & channel) instead of
+        one call per image. The result matches the sample-wise `transform()` for floating point images.
 
     ??? abstract "Reference - Implementation"
         Keras preprocess_input() for `"tf", "caffe", "torch"`
@@ -57,7 +75,8 @@ class Standardize(Subfunction_Base):
     #---------------------------------------------#
     #                Initialization               #
     #---------------------------------------------#
-    def __init__(self, mode="z-score", per_channel=False, smooth=0.000001):
+    def __init__(self, mode="z-score", per_channel=False, smooth=0.000001,
+                 dtype=None, statistics=None):
         """ Initialization function for creating a Standardize Subfunction which can be passed to a
             [DataGenerator][aucmedi.data_processing.data_generator.DataGenerator].
 
@@ -65,19 +84,48 @@ class Standardize(Subfunction_Base):
             mode (str):             Selected mode which standardization/normalization technique should be applied.
             per_channel (bool):     Option to apply standardization per channel instead of across complete image.
             smooth (float):         Smoothing factor to avoid zero devisions (epsilon).
+            dtype (str):            Output data type of the standardized image (e.g. `"float32"` or `"float16"`).
+                                    If `None`, no casting is performed.
+            statistics (dict or str):   Dataset statistics (or path to their JSON file) for the mode `"dataset"`.
         """
         # Verify mode existence
-        if mode not in ["z-score", "minmax", "grayscale", "tf", "caffe", "torch"]:
+        if mode not in ["z-score", "minmax", "grayscale", "tf", "caffe", "torch",
+                        "dataset"]:
             raise ValueError("Subfunction - Standardize: Unknown modus", mode)
         # Cache class variables
         self.mode = mode
         self.per_channel = per_channel
         self.e = smooth
+        if dtype is not None : self.dtype = np.dtype(dtype)
+        else : self.dtype = None
+        # Precompute scale & offset for dataset-wide standardization
+        if mode == "dataset":
+            if statistics is None:
+                raise ValueError("Subfunction - Standardize: Mode 'dataset' requires statistics!")
+            if isinstance(statistics, str):
+                with open(statistics, "r") as fd:
+                    statistics = json.load(fd)
+            if per_channel:
+                mean = np.asarray(statistics["mean"], dtype=np.float64)
+                std = np.asarray(statistics["std"], dtype=np.float64)
+            else:
+                mean = np.float64(statistics["mean_global"])
+                std = np.float64(statistics["std_global"])
+            # Express z-score as image * scale + offset
+            self.scale = 1.0 / (std + self.e)
+            self.offset = (self.e - mean) * self.scale
 
     #---------------------------------------------#
     #                Transformation               #
     #---------------------------------------------#
     def transform(self, image):
+        # Apply dataset-wide standardization
+        if self.mode == "dataset" : return self.transform_dataset(image)
+        # Cast image once into working precision if a dtype is provided
+        if self.dtype is not None:
+            if self.dtype == np.float64 : work_dtype = np.float64
+            else : work_dtype = np.float32
+            image = image.astype(work_dtype, copy=False)
         # Apply normalization per channel
         if self.per_channel:
             image_norm = image.copy()
@@ -85,6 +133,9 @@ class Standardize(Subfunction_Base):
                 image_norm[..., c] = self.normalize(image[..., c])
         # Apply normalization across complete image
         else : image_norm = self.normalize(image)
+        # Cast standardized image into desired output data type
+        if self.dtype is not None:
+            image_norm = image_norm.astype(self.dtype, copy=False)
         # Return standardized image
         return image_norm
 
@@ -122,7 +173,93 @@ class Standardize(Subfunction_Base):
                     "Provided min/max values for image are:", np.min(image), np.max(image),
                     "Ensure that all images are normalized to [0,255] before using the following modes:",
                     "['tf', 'caffe', 'torch']")
+            # Obtain writable copy of read-only images (e.g. memory-mapped samples)
+            # as the architecture standardization operates in-place on float images
+            if not image.flags.writeable : image = image.copy()
             # Perform architecture standardization
             image_norm = imagenet_utils.preprocess_input(image, mode=self.mode)
         # Return normalized image
+        return image_norm
+
+    #---------------------------------------------#
+    #          Batch-wise Transformation          #
+    #---------------------------------------------#
+    def transform_batch(self, batch):
+        """ Standardize a stack of images with shape (batch, ..., channels) via vectorized reductions.
+
+        Args:
+            batch (numpy.ndarray):      Stack of images encoded as NumPy matrix (e.g. 32x224x224x3).
+
+        Returns:
+            batch (numpy.ndarray):      Stack of standardized images encoded as NumPy matrix.
+        """
+        # Apply dataset-wide standardization
+        if self.mode == "dataset" : return self.transform_dataset(batch)
+        # Run sample-wise transformation for per channel ImageNet modes
+        if self.per_channel and self.mode in ["caffe", "torch"]:
+            return np.stack([self.transform(image) for image in batch], axis=0)
+        # Cast batch once into working precision if a dtype is provided
+        if self.dtype is not None:
+            if self.dtype == np.float64 : work_dtype = np.float64
+            else : work_dtype = np.float32
+            batch = batch.astype(work_dtype, copy=False)
+        # Compute custom modes in floating point precision
+        elif self.mode in ["z-score", "minmax", "grayscale"] and \
+            not np.issubdtype(batch.dtype, np.floating):
+            batch = batch.astype(np.float64)
+        # Identify reduction axes (per sample or per sample & channel)
+        if self.per_channel : axes = tuple(range(1, batch.ndim - 1))
+        else : axes = tuple(range(1, batch.ndim))
+        # Perform z-score normalization
+        if self.mode == "z-score":
+            # Compute mean and standard deviation from the centered batch
+            mean = np.mean(batch, axis=axes, keepdims=True)
+            batch_norm = batch - mean
+            std = np.sqrt(np.mean(np.square(batch_norm), axis=axes,
+                                  keepdims=True))
+            # Scaling
+            batch_norm += self.e
+            batch_norm /= (std + self.e)
+        # Perform MinMax normalization between [0,1] or to grayscale range
+        elif self.mode in ["minmax", "grayscale"]:
+            # Identify minimum and maximum
+            max_value = np.max(batch, axis=axes, keepdims=True)
+            min_value = np.min(batch, axis=axes, keepdims=True)
+            # Scaling
+            batch_norm = batch - min_value
+            batch_norm += self.e
+            batch_norm /= (max_value - min_value + self.e)
+            if self.mode == "grayscale":
+                batch_norm *= 255
+                np.around(batch_norm, decimals=0, out=batch_norm)
+        else:
+            # Verify if batch is in [0,255] format
+            if np.min(batch) < 0 or np.max(batch) > 255:
+                raise ValueError("Subfunction Standardize: Image values are not in range [0,255]!",
+                    "Provided min/max values for batch are:", np.min(batch), np.max(batch),
+                    "Ensure that all images are normalized to [0,255] before using the following modes:",
+                    "['tf', 'caffe', 'torch']")
+            # Perform architecture standardization
+            batch_norm = imagenet_utils.preprocess_input(batch, mode=self.mode)
+        # Cast standardized batch into desired output data type
+        if self.dtype is not None:
+            batch_norm = batch_norm.astype(self.dtype, copy=False)
+        # Return standardized batch
+        return batch_norm
+
+    #---------------------------------------------#
+    #         Dataset-wide Transformation         #
+    #---------------------------------------------#
+    def transform_dataset(self, image):
+        # Identify working precision (float32 or float64)
+        if image.dtype == np.float64 or self.dtype == np.float64:
+            work_dtype = np.float64
+        else : work_dtype = np.float32
+        # Apply multiply-add with constants (broadcasted over the channel axis)
+        image_norm = image * self.scale.astype(work_dtype)
+        image_norm += self.offset.astype(work_dtype)
+        # Cast standardized image into desired output data type
+        if self.dtype is not None:
+            image_norm = image_norm.astype(self.dtype, copy=False)
+        # Return standardized image
         return image_norm
\ No newline at end of file
@@ -124,6 +124,18 @@ def predict_augmenting(model, prediction_generator, n_cycles=10, aggregate="mean
                             image_format=prediction_generator.image_format,
                             loader=prediction_generator.sample_loader,
                             workers=prediction_generator.workers,
+                            sample_cache=prediction_generator.sample_cache,
+                            standardize_batch=prediction_generator.standardize_batch,
+                            standardize_statistics=prediction_generator.standardize_statistics,
+                            resize_hint=prediction_generator.resize_hint,
+                            fuse_subfunctions=prediction_generator.fuse_subfunctions,
+                            subfunctions_batch=prediction_generator.subfunctions_batch,
+                            dtype=prediction_generator.dtype,
+                            executor=prediction_generator.executor,
+                            prefetch=prediction_generator.prefetch,
+                            batch_buffers=prediction_generator.batch_buffers,
+                            prepare_store=prediction_generator.prepare_store,
+                            prepare_mode=prediction_generator.prepare_mode,
                             **prediction_generator.kwargs)
 
     # Compute predictions with provided model
@@ -248,6 +248,18 @@ class Stacking:
                              "image_format": temp_dg.image_format,
                              "loader": temp_dg.sample_loader,
                              "workers": temp_dg.workers,
+                             "sample_cache": temp_dg.sample_cache,
+                             "standardize_batch": temp_dg.standardize_batch,
+                             "standardize_statistics": temp_dg.standardize_statistics,
+                             "resize_hint": temp_dg.resize_hint,
+                             "fuse_subfunctions": temp_dg.fuse_subfunctions,
+                             "subfunctions_batch": temp_dg.subfunctions_batch,
+                             "dtype": temp_dg.dtype,
+                             "executor": temp_dg.executor,
+                             "prefetch": temp_dg.prefetch,
+                             "batch_buffers": temp_dg.batch_buffers,
+                             "prepare_store": temp_dg.prepare_store,
+                             "prepare_mode": temp_dg.prepare_mode,
                              "kwargs": temp_dg.kwargs
             }
 
@@ -356,6 +368,18 @@ class Stacking:
                              "image_format": temp_dg.image_format,
                              "loader": temp_dg.sample_loader,
                              "workers": temp_dg.workers,
+                             "sample_cache": temp_dg.sample_cache,
+                             "standardize_batch": temp_dg.standardize_batch,
+                             "standardize_statistics": temp_dg.standardize_statistics,
+                             "resize_hint": temp_dg.resize_hint,
+                             "fuse_subfunctions": temp_dg.fuse_subfunctions,
+                             "subfunctions_batch": temp_dg.subfunctions_batch,
+                             "dtype": temp_dg.dtype,
+                             "executor": temp_dg.executor,
+                             "prefetch": temp_dg.prefetch,
+                             "batch_buffers": temp_dg.batch_buffers,
+                             "prepare_store": temp_dg.prepare_store,
+                             "prepare_mode": temp_dg.prepare_mode,
                              "kwargs": temp_dg.kwargs
             }
 
@@ -466,6 +490,18 @@ class Stacking:
                              "image_format": temp_dg.image_format,
                              "loader": temp_dg.sample_loader,
                              "workers": temp_dg.workers,
+                             "sample_cache": temp_dg.sample_cache,
+                             "standardize_batch": temp_dg.standardize_batch,
+                             "standardize_statistics": temp_dg.standardize_statistics,
+                             "resize_hint": temp_dg.resize_hint,
+                             "fuse_subfunctions": temp_dg.fuse_subfunctions,
+                             "subfunctions_batch": temp_dg.subfunctions_batch,
+                             "dtype": temp_dg.dtype,
+                             "executor": temp_dg.executor,
+                             "prefetch": temp_dg.prefetch,
+                             "batch_buffers": temp_dg.batch_buffers,
+                             "prepare_store": temp_dg.prepare_store,
+                             "prepare_mode": temp_dg.prepare_mode,
                              "kwargs": temp_dg.kwargs
             }
 
@@ -584,6 +620,18 @@ def __training_process__(queue, model_paras, data_train, data_val,
                                  image_format=datagen_paras["image_format"],
                                  loader=datagen_paras["loader"],
                                  workers=datagen_paras["workers"],
+                                 sample_cache=datagen_paras["sample_cache"],
+                                 standardize_batch=datagen_paras["standardize_batch"],
+                                 standardize_statistics=datagen_paras["standardize_statistics"],
+                                 resize_hint=datagen_paras["resize_hint"],
+                                 fuse_subfunctions=datagen_paras["fuse_subfunctions"],
+                                 subfunctions_batch=datagen_paras["subfunctions_batch"],
+                                 dtype=datagen_paras["dtype"],
+                                 executor=datagen_paras["executor"],
+                                 prefetch=datagen_paras["prefetch"],
+                                 batch_buffers=datagen_paras["batch_buffers"],
+                                 prepare_store=datagen_paras["prepare_store"],
+                                 prepare_mode=datagen_paras["prepare_mode"],
                                  **datagen_paras["kwargs"])
     # Build validation DataGenerator
     nn_val_gen = DataGenerator(val_x,
@@ -603,6 +651,18 @@ def __training_process__(queue, model_paras, data_train, data_val,
                                image_format=datagen_paras["image_format"],
                                loader=datagen_paras["loader"],
                                workers=datagen_paras["workers"],
+                               sample_cache=datagen_paras["sample_cache"],
+                               standardize_batch=datagen_paras["standardize_batch"],
+                               standardize_statistics=datagen_paras["standardize_statistics"],
+                               resize_hint=datagen_paras["resize_hint"],
+                               fuse_subfunctions=datagen_paras["fuse_subfunctions"],
+                               subfunctions_batch=datagen_paras["subfunctions_batch"],
+                               dtype=datagen_paras["dtype"],
+                               executor=datagen_paras["executor"],
+                               prefetch=datagen_paras["prefetch"],
+                               batch_buffers=datagen_paras["batch_buffers"],
+                               prepare_store=datagen_paras["prepare_store"],
+                               prepare_mode=datagen_paras["prepare_mode"],
                                **datagen_paras["kwargs"])
     # Create NeuralNetwork
     model = NeuralNetwork(**model_paras)
@@ -634,6 +694,18 @@ def __prediction_process__(queue, model_paras, path_model, data_test,
                                 image_format=datagen_paras["image_format"],
                                 loader=datagen_paras["loader"],
                                 workers=datagen_paras["workers"],
+                                sample_cache=datagen_paras["sample_cache"],
+                                standardize_batch=datagen_paras["standardize_batch"],
+                                standardize_statistics=datagen_paras["standardize_statistics"],
+                                resize_hint=datagen_paras["resize_hint"],
+                                fuse_subfunctions=datagen_paras["fuse_subfunctions"],
+                                subfunctions_batch=datagen_paras["subfunctions_batch"],
+                                dtype=datagen_paras["dtype"],
+                                executor=datagen_paras["executor"],
+                                prefetch=datagen_paras["prefetch"],
+                                batch_buffers=datagen_paras["batch_buffers"],
+                                prepare_store=datagen_paras["prepare_store"],
+                                prepare_mode=datagen_paras["prepare_mode"],
                                 **datagen_paras["kwargs"])
     # Create NeuralNetwork
     model = NeuralNetwork(**model_paras)
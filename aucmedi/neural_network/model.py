@@ -270,6 +270,8 @@ class NeuralNetwork:
 
         Args:
             training_generator (DataGenerator):     A data generator which will be used for training.
+                                                    A `tf.data.Dataset` from `DataGenerator.as_tf_dataset()` is also supported
+                                                    (requires `repeat=True` if iterations are provided).
             validation_generator (DataGenerator):   A data generator which will be used for validation.
             epochs (int):                           Number of epochs. A single epoch is defined as one iteration through
                                                     the complete data set.
@@ -282,7 +284,8 @@ class NeuralNetwork:
             history (dict):                   A history dictionary from a Keras history object which contains several logs.
         """
         # Adjust number of iterations in training DataGenerator to allow repitition
-        if iterations is not None : training_generator.set_length(iterations)
+        if iterations is not None and hasattr(training_generator, "set_length"):
+            training_generator.set_length(iterations)
         # Running a standard training process
         if not transfer_learning:
             # Run training process with the Keras fit function
@@ -333,7 +336,8 @@ class NeuralNetwork:
             # Return combined history objects
             history_out = history
         # Reset number of iterations of the training DataGenerator
-        if iterations is not None : training_generator.reset_length()
+        if iterations is not None and hasattr(training_generator, "reset_length"):
+            training_generator.reset_length()
         # Return fitting history
         return history_out
 
@@ -347,6 +351,7 @@ class NeuralNetwork:
 
         Args:
             prediction_generator (DataGenerator):   A data generator which will be used for inference.
+                                                    A `tf.data.Dataset` from `DataGenerator.as_tf_dataset()` is also supported.
 
         Returns:
             preds (numpy.ndarray):                  A NumPy array of predictions formatted with shape (n_samples, n_labels).
@@ -22,6 +22,6 @@
 """ [aucmedi.utils][] is a collection of small functions and classes which make
     common tasks shorter and easier.
 
-The core features of utils are the [Class Weight computation][aucmedi.utils.class_weights]
-and [Visualizer][aucmedi.utils.visualizer] functions.
+The core features of utils are the [Class Weight computation][aucmedi.utils.class_weights],
+[Dataset Statistics][aucmedi.utils.dataset_statistics] and [Visualizer][aucmedi.utils.visualizer] functions.
 """
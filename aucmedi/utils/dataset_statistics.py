@@ -0,0 +1,264 @@
+#==============================================================================#
+#  Author:       Dominik Müller                                                #
+#  Copyright:    2024 IT-Infrastructure for Translational Medical Research,    #
+#                University of Augsburg                                        #
+#                                                                              #
+#  This program is free software: you can redistribute it and/or modify        #
+#  it under the terms of the GNU General Public License as published by        #
+#  the Free Software Foundation, either version 3 of the License, or           #
+#  (at your option) any later version.                                         #
+#                                                                              #
+#  This program is distributed in the hope that it will be useful,             #
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of              #
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the               #
+#  GNU General Public License for more details.                                #
+#                                                                              #
+#  You should have received a copy of the GNU General Public License           #
+#  along with this program.  If not, see <http://www.gnu.org/licenses/>.       #
+#==============================================================================#
+#-----------------------------------------------------#
+#                   Library imports                   #
+#-----------------------------------------------------#
+# External libraries
+import numpy as np
+import json
+
+#-----------------------------------------------------#
+#          Streaming Dataset Statistics Class         #
+#-----------------------------------------------------#
+class DatasetStatistics():
+    """ A streaming collector for dataset-wide intensity statistics per channel.
+
+    The statistics are accumulated in a single pass via Welford's algorithm and partial
+    statistics (e.g. computed by different workers) can be merged via Chan's parallel algorithm.
+    Percentiles are estimated on a random subsample of voxels from each image, which is kept in a
+    fixed-size reservoir via weighted reservoir sampling (Efraimidis & Spirakis). Thus, the memory
+    consumption is bounded independent of the number of images.
+
+    The resulting statistics can be passed to the dataset-wide standardization of the
+    [Standardize][aucmedi.data_processing.subfunctions.standardize] Subfunction (`mode="dataset"`).
+
+    ???+ example
+        ```python
+        stats = DatasetStatistics()
+        for image in images:
+            stats.update(image)
+        stats.save("dataset_statistics.json")
+        ```
+    """
+    # Number of voxels per chunk for the float64 reduction of an image
+    chunk_size = 65536
+
+    def __init__(self, n_subsample=1000, n_reservoir=100000):
+        """ Initialization function for creating an empty statistics collector.
+
+        Args:
+            n_subsample (int):          Number of randomly selected voxels per image and channel
+                                        for the percentile estimation.
+            n_reservoir (int):          Maximum number of voxels per channel which are kept in the reservoir
+                                        for the percentile estimation.
+        """
+        self.n_subsample = n_subsample
+        self.n_reservoir = n_reservoir
+        self.count = 0
+        self.mean = None
+        self.m2 = None
+        self.min = None
+        self.max = None
+        self.subsample = None
+        self.subsample_keys = None
+
+    #---------------------------------------------#
+    #              Streaming Update               #
+    #---------------------------------------------#
+    def update(self, image, seed=None):
+        """ Add an image with channels as last axis to the statistics.
+
+        Args:
+            image (numpy.ndarray):      Image encoded as NumPy matrix with channels as last axis.
+            seed (int):                 Seed for the voxel subsample of the percentile estimation.
+        """
+        # Flatten image to voxels per channel (view without casting the image)
+        voxels = np.reshape(image, (-1, image.shape[-1]))
+        # Compute statistics of the image with float64 accumulation
+        partial = DatasetStatistics(self.n_subsample)
+        partial.count = voxels.shape[0]
+        partial.mean = np.add.reduce(voxels, axis=0, dtype=np.float64) / \
+                       partial.count
+        # Sum squared deviations in chunks to bound the float64 working memory
+        partial.m2 = np.zeros(voxels.shape[-1], dtype=np.float64)
+        for i in range(0, voxels.shape[0], self.chunk_size):
+            deviation = voxels[i:i+self.chunk_size] - partial.mean
+            partial.m2 += np.add.reduce(np.square(deviation, out=deviation),
+                                        axis=0)
+        partial.min = np.min(voxels, axis=0).astype(np.float64)
+        partial.max = np.max(voxels, axis=0).astype(np.float64)
+        # Draw random voxel subsample for percentile estimation
+        if self.n_subsample:
+            rng = np.random.default_rng(seed)
+            size = min(self.n_subsample, voxels.shape[0])
+            selection = rng.choice(voxels.shape[0], size=size, replace=False)
+            partial.subsample = voxels[selection].astype(np.float64)
+            # Assign reservoir keys weighted by the number of represented voxels
+            weight = voxels.shape[0] / size
+            partial.subsample_keys = np.log(rng.random(size)) / weight
+        # Merge image statistics into the statistics
+        self.merge(partial)
+
+    def merge(self, other):
+        """ Merge the partial statistics of another collector into the statistics.
+
+        Args:
+            other (DatasetStatistics):  Collector with partial statistics.
+        """
+        if other.count == 0 : return
+        if self.count == 0:
+            self.count = other.count
+            self.mean = other.mean.copy()
+            self.m2 = other.m2.copy()
+            self.min = other.min.copy()
+            self.max = other.max.copy()
+        else:
+            # Combine mean & sum of squared deviations (Chan et al.)
+            count = self.count + other.count
+            delta = other.mean - self.mean
+            self.mean = self.mean + delta * (other.count / count)
+            self.m2 = self.m2 + other.m2 + \
+                      np.square(delta) * (self.count * other.count / count)
+            self.count = count
+            # Combine minimum & maximum
+            self.min = np.minimum(self.min, other.min)
+            self.max = np.maximum(self.max, other.max)
+        # Combine reservoirs by keeping the voxels with the largest keys
+        if other.subsample is None : return
+        if self.subsample is None:
+            subsample = other.subsample
+            keys = other.subsample_keys
+        else:
+            subsample = np.concatenate([self.subsample, other.subsample])
+            keys = np.concatenate([self.subsample_keys, other.subsample_keys])
+        if self.n_reservoir and len(keys) > self.n_reservoir:
+            selection = np.argpartition(-keys, self.n_reservoir)
+            selection = selection[:self.n_reservoir]
+            (subsample, keys) = (subsample[selection], keys[selection])
+        self.subsample = subsample
+        self.subsample_keys = keys
+
+    #---------------------------------------------#
+    #               Result Handling               #
+    #---------------------------------------------#
+    def get_statistics(self, percentiles=[0.5, 99.5]):
+        """ Compute the dataset statistics per channel and across all channels.
+
+        Args:
+            percentiles (list of float):    Percentiles which should be estimated (in range [0, 100]).
+        Returns:
+            statistics (dict):              Dictionary with the number of voxels per channel (`count`),
+                                            the lists `mean`, `std`, `min`, `max` with a value per channel,
+                                            the estimated `percentiles` per channel and the `mean_global`
+                                            & `std_global` across all channels.
+        """
+        if self.count == 0:
+            raise ValueError("DatasetStatistics: No image was added to the statistics!")
+        # Compute standard deviation per channel
+        std = np.sqrt(self.m2 / self.count)
+        # Combine channels for global mean & standard deviation
+        mean_global = np.mean(self.mean)
+        m2_global = np.sum(self.m2) + \
+                    np.sum(np.square(self.mean - mean_global)) * self.count
+        std_global = np.sqrt(m2_global / (self.count * len(self.mean)))
+        # Estimate percentiles per channel
+        perc = {}
+        if self.subsample is not None and percentiles:
+            values = np.percentile(self.subsample, percentiles, axis=0)
+            for p, value in zip(percentiles, values):
+                perc[str(p)] = value.tolist()
+        # Return statistics
+        return {"count": int(self.count),
+                "mean": self.mean.tolist(),
+                "std": std.tolist(),
+                "min": self.min.tolist(),
+                "max": self.max.tolist(),
+                "percentiles": perc,
+                "mean_global": float(mean_global),
+                "std_global": float(std_global)}
+
+    def save(self, path, percentiles=[0.5, 99.5]):
+        """ Store the dataset statistics as JSON file.
+
+        Args:
+            path (str):                     Path to the JSON file.
+            percentiles (list of float):    Percentiles which should be estimated (in range [0, 100]).
+        Returns:
+            statistics (dict):              Dictionary with the stored dataset statistics.
+        """
+        statistics = self.get_statistics(percentiles)
+        with open(path, "w") as fd:
+            json.dump(statistics, fd, indent=2)
+        return statistics
+
+    @staticmethod
+    def load(path):
+        """ Load dataset statistics from a JSON file.
+
+        Args:
+            path (str):                     Path to the JSON file.
+        Returns:
+            statistics (dict):              Dictionary with the dataset statistics.
+        """
+        with open(path, "r") as fd:
+            return json.load(fd)
+
+#-----------------------------------------------------#
+#          Dataset Statistics of DataGenerator        #
+#-----------------------------------------------------#
+def compute_dataset_statistics(datagen, percentiles=[0.5, 99.5], path=None,
+                               n_subsample=1000, n_reservoir=100000):
+    """ Function for computing dataset-wide intensity statistics in a single pass over the samples
+        of a [DataGenerator][aucmedi.data_processing.data_generator.DataGenerator].
+
+    Each sample is loaded and processed by the Subfunctions and resizing of the DataGenerator
+    (without augmentation and standardization). If the DataGenerator uses a thread pool, the samples are
+    processed in parallel and the partial statistics are merged in sample order.
+
+    ???+ example
+        ```python
+        datagen = DataGenerator(samples, "volumes/", loader=sitk_loader, resize=None,
+                                standardize_mode=None, workers=8)
+        stats = compute_dataset_statistics(datagen, path="dataset_statistics.json")
+
+        # Apply dataset-wide standardization
+        train_gen = DataGenerator(samples, "volumes/", loader=sitk_loader, resize=None,
+                                  standardize_mode="dataset", standardize_statistics=stats)
+        ```
+
+    Args:
+        datagen (DataGenerator):        DataGenerator for which the statistics of all samples should be computed.
+        percentiles (list of float):    Percentiles which should be estimated (in range [0, 100]).
+        path (str):                     Path to a JSON file for storing the statistics. If `None`, nothing is stored.
+        n_subsample (int):              Number of randomly selected voxels per image and channel
+                                        for the percentile estimation.
+        n_reservoir (int):              Maximum number of voxels per channel which are kept in the reservoir
+                                        for the percentile estimation.
+    Returns:
+        statistics (dict):              Dictionary with the dataset statistics
+                                        (see [DatasetStatistics.get_statistics()][aucmedi.utils.dataset_statistics.DatasetStatistics.get_statistics]).
+    """
+    # Compute partial statistics of a single sample
+    def compute_sample(index):
+        img = datagen.preprocess_image(index, prepared_image=datagen.prepare_images,
+                                       run_aug=False, run_standardize=False)
+        partial = DatasetStatistics(n_subsample, n_reservoir)
+        partial.update(img, seed=index)
+        return partial
+    # Accumulate statistics over all samples
+    stats = DatasetStatistics(n_subsample, n_reservoir)
+    if datagen.workers > 1 and datagen.executor == "thread":
+        partials = datagen.__get_pool__().imap(compute_sample,
+                                                range(0, datagen.n))
+    else : partials = map(compute_sample, range(0, datagen.n))
+    for partial in partials:
+        stats.merge(partial)
+    # Store statistics
+    if path is not None : return stats.save(path, percentiles)
+    else : return stats.get_statistics(percentiles)
@@ -23,6 +23,7 @@
 import unittest
 import numpy as np
 import random
+from multiprocessing.pool import ThreadPool
 #Internal libraries
 from aucmedi import ImageAugmentation, VolumeAugmentation, BatchgeneratorsAugmentation
 
@@ -100,6 +101,18 @@ class AugmentationTEST(unittest.TestCase):
         data_augRGB = data_aug.apply(self.imgRGB2d)
         self.assertFalse(np.array_equal(data_augRGB, self.imgRGB2d))
 
+    # Seeded Augmentation
+    def test_IMAGE_seed(self):
+        data_aug = ImageAugmentation(flip=False, scale=False)
+        state = np.random.get_state()
+        data_augA = data_aug.apply(self.imgRGB2d, seed=7)
+        data_augB = data_aug.apply(self.imgRGB2d, seed=7)
+        data_augC = data_aug.apply(self.imgRGB2d, seed=8)
+        self.assertTrue(np.array_equal(data_augA, data_augB))
+        self.assertFalse(np.array_equal(data_augA, data_augC))
+        # Global random state remains untouched
+        self.assertTrue(np.array_equal(np.random.get_state()[1], state[1]))
+
     #-------------------------------------------------#
     #               Volume Functionality              #
     #-------------------------------------------------#
@@ -154,6 +167,18 @@ class AugmentationTEST(unittest.TestCase):
         data_augRGB = data_aug.apply(self.imgRGB3d)
         self.assertFalse(np.array_equal(data_augRGB, self.imgRGB3d))
 
+    # Seeded Augmentation
+    def test_VOLUME_seed(self):
+        data_aug = VolumeAugmentation()
+        state = np.random.get_state()
+        data_augA = data_aug.apply(self.imgRGB3d, seed=7)
+        data_augB = data_aug.apply(self.imgRGB3d, seed=7)
+        data_augC = data_aug.apply(self.imgRGB3d, seed=8)
+        self.assertTrue(np.array_equal(data_augA, data_augB))
+        self.assertFalse(np.array_equal(data_augA, data_augC))
+        # Global random state remains untouched
+        self.assertTrue(np.array_equal(np.random.get_state()[1], state[1]))
+
     #-------------------------------------------------#
     #          Batchgenerators Functionality          #
     #-------------------------------------------------#
@@ -195,3 +220,23 @@ class AugmentationTEST(unittest.TestCase):
         data_aug.build()
         data_augRGB = data_aug.apply(self.imgRGB3d)
         self.assertFalse(np.array_equal(data_augRGB, self.imgRGB3d))
+
+    # Seeded Augmentation
+    def test_BATCHGENERATORS_seed(self):
+        data_aug = BatchgeneratorsAugmentation(image_shape=(16,16,16))
+        data_augA = data_aug.apply(self.imgRGB3d, seed=7)
+        data_augB = data_aug.apply(self.imgRGB3d, seed=7)
+        data_augC = data_aug.apply(self.imgRGB3d, seed=8)
+        self.assertTrue(np.array_equal(data_augA, data_augB))
+        self.assertFalse(np.array_equal(data_augA, data_augC))
+
+    # Seeded Augmentation across threads
+    def test_BATCHGENERATORS_seed_threads(self):
+        data_aug = BatchgeneratorsAugmentation(image_shape=(16,16,16))
+        seeds = list(range(0, 16))
+        data_aug_seq = [data_aug.apply(self.imgRGB3d, seed=s) for s in seeds]
+        with ThreadPool(4) as pool:
+            data_aug_mt = pool.map(lambda s: data_aug.apply(self.imgRGB3d, seed=s),
+                                   seeds)
+        for img_seq, img_mt in zip(data_aug_seq, data_aug_mt):
+            self.assertTrue(np.array_equal(img_seq, img_mt))
@@ -25,10 +25,17 @@ import numpy as np
 import tempfile
 from PIL import Image
 import os
+import json
 import shutil
+from multiprocessing import shared_memory
 #Internal libraries
 from aucmedi import DataGenerator
 from aucmedi.data_processing.io_loader import numpy_loader
+from aucmedi.data_processing.io_cache import DiskCache, MemoryCache
+from aucmedi.data_processing.augmentation import VolumeAugmentation, \
+                                                  BatchgeneratorsAugmentation
+from aucmedi.data_processing.subfunctions import Padding, Crop, Clip, Standardize, \
+                                                  Chromer, ColorConstancy
 
 #-----------------------------------------------------#
 #               Unittest: Data Generator              #
@@ -164,10 +171,117 @@ class DataGeneratorTEST(unittest.TestCase):
             self.assertTrue(len(batch), 2)
             self.assertTrue(np.array_equal(batch[1].shape, (5, 4)))
 
+    #-------------------------------------------------#
+    #            Application with Data Type           #
+    #-------------------------------------------------#
+    def test_RUN_dtype(self):
+        for dtype, mode in [("float32", "z-score"), ("float16", "torch"),
+                            ("uint8", "grayscale"), ("uint8", None)]:
+            data_gen = DataGenerator(self.sampleList_rgb_2D, self.tmp_data.name,
+                                     labels=self.labels_ohe, grayscale=False,
+                                     batch_size=5, dtype=dtype,
+                                     standardize_mode=mode)
+            batch = data_gen[0]
+            self.assertEqual(batch[0].dtype, np.dtype(dtype))
+            self.assertTrue(np.array_equal(batch[0].shape, (5, 224, 224, 3)))
+        self.assertRaises(ValueError, DataGenerator, self.sampleList_rgb_2D,
+                          self.tmp_data.name, dtype="uint8",
+                          standardize_mode="z-score")
+
     #-------------------------------------------------#
     #     Application Functionality with Metadata     #
     #-------------------------------------------------#
     # Usage: Metadata for inference
+    def test_RUN_standardizeBatch(self):
+        for mode in ["z-score", "minmax", "tf"]:
+            data_gen_ref = DataGenerator(self.sampleList_rgb_2D,
+                                         self.tmp_data.name, grayscale=False,
+                                         labels=self.labels_ohe, batch_size=10,
+                                         standardize_mode=mode,
+                                         dtype="float32")
+            for workers, executor, batch_buffers in [(1, "thread", 0),
+                                                     (2, "thread", 2),
+                                                     (2, "process", 0)]:
+                with DataGenerator(self.sampleList_rgb_2D, self.tmp_data.name,
+                                   grayscale=False, labels=self.labels_ohe,
+                                   batch_size=10, standardize_mode=mode,
+                                   dtype="float32", standardize_batch=True,
+                                   workers=workers, executor=executor,
+                                   batch_buffers=batch_buffers) as data_gen:
+                    for i in range(0, 6):
+                        batch = data_gen[i]
+                        batch_ref = data_gen_ref[i]
+                        self.assertEqual(batch[0].dtype, np.float32)
+                        self.assertTrue(np.allclose(batch[0], batch_ref[0],
+                                                    atol=1e-5))
+                        self.assertTrue(np.array_equal(batch[1], batch_ref[1]))
+
+    def test_RUN_fusedSubfunctions(self):
+        sf_list = [Padding(mode="square"), Crop(shape=(12, 12)),
+                   Clip(min=20, max=220), Standardize(mode="minmax")]
+        data_gen_ref = DataGenerator(self.sampleList_rgb_2D,
+                                     self.tmp_data.name, grayscale=False,
+                                     labels=self.labels_ohe, batch_size=10,
+                                     subfunctions=sf_list, resize=(8, 8))
+        data_gen = DataGenerator(self.sampleList_rgb_2D, self.tmp_data.name,
+                                 grayscale=False, labels=self.labels_ohe,
+                                 batch_size=10, subfunctions=sf_list,
+                                 resize=(8, 8), fuse_subfunctions=True)
+        self.assertIsNotNone(data_gen.sf_pipeline)
+        for i in range(0, 3):
+            self.assertTrue(np.array_equal(data_gen[i][0], data_gen_ref[i][0]))
+
+    def test_RUN_batchSubfunctions(self):
+        sf_list = [Padding(mode="square"), Crop(shape=(12, 12)),
+                   Clip(min=20, max=220), Standardize(mode="minmax")]
+        data_gen_ref = DataGenerator(self.sampleList_rgb_2D,
+                                     self.tmp_data.name, grayscale=False,
+                                     labels=self.labels_ohe, batch_size=10,
+                                     subfunctions=sf_list, resize=(8, 8))
+        for workers in [1, 4]:
+            data_gen = DataGenerator(self.sampleList_rgb_2D, self.tmp_data.name,
+                                     grayscale=False, labels=self.labels_ohe,
+                                     batch_size=10, subfunctions=sf_list,
+                                     resize=(8, 8), subfunctions_batch=True,
+                                     workers=workers)
+            self.assertTrue(data_gen.subfunctions_batch)
+            for i in range(0, 3):
+                self.assertTrue(np.allclose(data_gen[i][0], data_gen_ref[i][0]))
+
+    def test_RUN_broadcastChromer(self):
+        data_gen_ref = DataGenerator(self.sampleList_gray_2D, self.tmp_data.name,
+                                     grayscale=True, labels=self.labels_ohe,
+                                     batch_size=10, resize=(8, 8),
+                                     subfunctions=[Chromer(target="rgb")])
+        data_gen = DataGenerator(self.sampleList_gray_2D, self.tmp_data.name,
+                                 grayscale=True, labels=self.labels_ohe,
+                                 batch_size=10, resize=(8, 8),
+                                 subfunctions=[Chromer(target="rgb",
+                                                       broadcast=True,
+                                                       validate=False)],
+                                 sample_cache=MemoryCache())
+        for i in range(0, 3):
+            batch = data_gen[i][0]
+            self.assertTrue(np.array_equal(batch.shape[1:], (8, 8, 3)))
+            self.assertTrue(np.array_equal(batch, data_gen_ref[i][0]))
+        # Broadcast view is kept in the cache and until batch assembly
+        cache = MemoryCache()
+        data_gen = DataGenerator(self.sampleList_gray_2D, self.tmp_data.name,
+                                 grayscale=True, batch_size=5, resize=None,
+                                 standardize_mode=None,
+                                 subfunctions=[Chromer(target="rgb",
+                                                       broadcast=True,
+                                                       validate=False)],
+                                 sample_cache=cache)
+        for epoch in range(0, 2):
+            for i in range(0, 5):
+                batch = data_gen[i][0]
+                self.assertTrue(np.array_equal(batch.shape[1:], (16, 16, 3)))
+                self.assertTrue(np.array_equal(batch[..., 0], batch[..., 2]))
+        self.assertEqual(cache.size, 25 * 16 * 16 * batch.itemsize)
+        img = data_gen.preprocess_image(0)
+        self.assertEqual(img.strides[-1], 0)
+
     def test_RUN_Metadata_noLabel(self):
         data_gen = DataGenerator(self.sampleList_rgb_2D, self.tmp_data.name,
                                  metadata=self.metadata, grayscale=False,
@@ -204,6 +318,229 @@ class DataGeneratorTEST(unittest.TestCase):
             self.assertTrue(len(batch), 2)
             self.assertTrue(np.array_equal(batch[1].shape, (5, 4)))
 
+    def test_MP_persistentPool(self):
+        with DataGenerator(self.sampleList_rgb_2D, self.tmp_data.name,
+                           labels=self.labels_ohe, shuffle=True,
+                           grayscale=False, batch_size=5, workers=5) as data_gen:
+            self.assertIsNone(data_gen.pool)
+            batch = data_gen[0]
+            pool = data_gen.pool
+            self.assertIsNotNone(pool)
+            data_gen.on_epoch_end()
+            for i in range(1, 10):
+                batch = data_gen[i]
+                self.assertTrue(np.array_equal(batch[1].shape, (5, 4)))
+            self.assertIs(data_gen.pool, pool)
+        self.assertIsNone(data_gen.pool)
+
+    def test_MP_processExecutor(self):
+        data_gen_seq = DataGenerator(self.sampleList_rgb_2D, self.tmp_data.name,
+                                     labels=self.labels_ohe,
+                                     grayscale=False, batch_size=5)
+        with DataGenerator(self.sampleList_rgb_2D, self.tmp_data.name,
+                           labels=self.labels_ohe, grayscale=False,
+                           batch_size=5, workers=2,
+                           executor="process") as data_gen:
+            for i in range(0, 10):
+                batch = data_gen[i]
+                batch_seq = data_gen_seq[i]
+                self.assertTrue(np.array_equal(batch[0].shape, (5, 224, 224, 3)))
+                self.assertTrue(np.allclose(batch[0], batch_seq[0]))
+                self.assertTrue(np.array_equal(batch[1], batch_seq[1]))
+            # Shared memory batch array is allocated once and reused
+            self.assertEqual(len(data_gen.batch_shm_free), 1)
+            self.assertEqual(len(data_gen.batch_buffer_finalizers), 1)
+            shm_name = data_gen.batch_shm_free[0].name
+        self.assertEqual(data_gen.batch_shm_free, [])
+        self.assertRaises(FileNotFoundError, shared_memory.SharedMemory,
+                          name=shm_name)
+        self.assertRaises(ValueError, DataGenerator, self.sampleList_rgb_2D,
+                          self.tmp_data.name, executor="gpu")
+
+    def test_MP_processExecutor_randomState(self):
+        data_aug = BatchgeneratorsAugmentation(image_shape=(16, 16, 16))
+        samples = [self.sampleList_gray_3D[0]] * 16
+        with DataGenerator(samples, self.tmp_data.name, grayscale=True,
+                           batch_size=16, two_dim=False, loader=numpy_loader,
+                           resize=None, standardize_mode=None,
+                           data_aug=data_aug, workers=4,
+                           executor="process") as data_gen:
+            batch = data_gen[0][0]
+        unique = np.unique(batch.reshape(16, -1), axis=0)
+        self.assertEqual(len(unique), 16)
+
+    def test_MP_prefetch(self):
+        data_gen_seq = DataGenerator(self.sampleList_rgb_2D, self.tmp_data.name,
+                                     labels=self.labels_ohe, shuffle=True,
+                                     seed=123, grayscale=False, batch_size=5)
+        with DataGenerator(self.sampleList_rgb_2D, self.tmp_data.name,
+                           labels=self.labels_ohe, shuffle=True, seed=123,
+                           grayscale=False, batch_size=5, workers=2,
+                           prefetch=2) as data_gen:
+            for epoch in range(0, 2):
+                for i in range(0, 5):
+                    batch = data_gen[i]
+                    batch_seq = data_gen_seq[i]
+                    self.assertTrue(np.allclose(batch[0], batch_seq[0]))
+                    self.assertTrue(np.array_equal(batch[1], batch_seq[1]))
+                self.assertTrue(len(data_gen.prefetch_queue) == 0)
+                data_gen.on_epoch_end()
+                data_gen_seq.on_epoch_end()
+        self.assertIsNone(data_gen.prefetch_executor)
+
+    def test_MP_batchBuffers(self):
+        data_gen_seq = DataGenerator(self.sampleList_rgb_2D, self.tmp_data.name,
+                                     labels=self.labels_ohe, grayscale=False,
+                                     sample_weights=np.arange(25),
+                                     batch_size=10)
+        for workers, executor in [(1, "thread"), (2, "thread"), (2, "process")]:
+            with DataGenerator(self.sampleList_rgb_2D, self.tmp_data.name,
+                               labels=self.labels_ohe, grayscale=False,
+                               sample_weights=np.arange(25), batch_size=10,
+                               workers=workers, executor=executor,
+                               batch_buffers=2) as data_gen:
+                for i in range(0, 6):
+                    batch = data_gen[i]
+                    batch_seq = data_gen_seq[i]
+                    self.assertTrue(np.allclose(batch[0], batch_seq[0]))
+                    self.assertTrue(np.array_equal(batch[1], batch_seq[1]))
+                    self.assertTrue(np.array_equal(batch[2], batch_seq[2]))
+                self.assertEqual(len(data_gen.batch_buffer_ring), 2)
+        self.assertRaises(ValueError, DataGenerator, self.sampleList_rgb_2D,
+                          self.tmp_data.name, prefetch=2, batch_buffers=2)
+
+    def test_MP_seededAugmentation(self):
+        data_gen_seq = DataGenerator(self.sampleList_rgb_3D, self.tmp_data.name,
+                                     grayscale=False, batch_size=10,
+                                     two_dim=False, loader=numpy_loader,
+                                     resize=None, data_aug=VolumeAugmentation(),
+                                     shuffle=True, seed=42)
+        batches_seq = [data_gen_seq[i][0] for i in range(0, 3)]
+        data_gen_seq.on_epoch_end()
+        batches_seq_next = [data_gen_seq[i][0] for i in range(0, 3)]
+        for workers, executor in [(1, "thread"), (4, "thread"), (2, "process")]:
+            with DataGenerator(self.sampleList_rgb_3D, self.tmp_data.name,
+                               grayscale=False, batch_size=10, two_dim=False,
+                               loader=numpy_loader, resize=None,
+                               data_aug=VolumeAugmentation(), shuffle=True,
+                               seed=42, workers=workers,
+                               executor=executor) as data_gen:
+                for i in range(0, 3):
+                    self.assertTrue(np.array_equal(data_gen[i][0],
+                                                   batches_seq[i]))
+                # New augmentation in the next epoch
+                data_gen.on_epoch_end()
+                for i in range(0, 3):
+                    batch = data_gen[i][0]
+                    self.assertTrue(np.array_equal(batch, batches_seq_next[i]))
+                    self.assertFalse(np.array_equal(batch, batches_seq[i]))
+
+    def test_MP_customAugmentation(self):
+        # Custom augmentation without seed support
+        class FlipAugmentation():
+            def apply(self, image):
+                return np.flip(image, axis=0)
+        data_gen = DataGenerator(self.sampleList_rgb_3D, self.tmp_data.name,
+                                 grayscale=False, batch_size=10, two_dim=False,
+                                 loader=numpy_loader, resize=None,
+                                 standardize_mode=None, shuffle=False,
+                                 data_aug=FlipAugmentation(), seed=42)
+        img = numpy_loader(self.sampleList_rgb_3D[0], self.tmp_data.name,
+                           two_dim=False)
+        self.assertTrue(np.allclose(data_gen[0][0][0], np.flip(img, axis=0)))
+
+    def test_TFDATA_export(self):
+        for data_aug, shuffle in [(None, False), (VolumeAugmentation(), True)]:
+            data_gen = DataGenerator(self.sampleList_rgb_3D, self.tmp_data.name,
+                                     labels=self.labels_ohe,
+                                     metadata=self.metadata,
+                                     sample_weights=np.arange(25),
+                                     grayscale=False, batch_size=10,
+                                     two_dim=False, loader=numpy_loader,
+                                     resize=None, data_aug=data_aug,
+                                     shuffle=shuffle, seed=42)
+            dataset = data_gen.as_tf_dataset()
+            for epoch in range(0, 2):
+                batches = list(dataset.as_numpy_iterator())
+                self.assertEqual(len(batches), 3)
+                for i in range(0, 3):
+                    batch_seq = data_gen[i]
+                    self.assertTrue(np.allclose(batches[i][0][0],
+                                                batch_seq[0][0]))
+                    self.assertTrue(np.array_equal(batches[i][0][1],
+                                                   batch_seq[0][1]))
+                    self.assertTrue(np.array_equal(batches[i][1],
+                                                   batch_seq[1]))
+                    self.assertTrue(np.array_equal(batches[i][2],
+                                                   batch_seq[2]))
+                data_gen.on_epoch_end()
+        # Infinite dataset
+        data_gen = DataGenerator(self.sampleList_rgb_2D, self.tmp_data.name,
+                                 grayscale=False, batch_size=10)
+        dataset = data_gen.as_tf_dataset(repeat=True)
+        batches = list(dataset.take(5).as_numpy_iterator())
+        self.assertEqual([b[0].shape[0] for b in batches], [10, 10, 5, 10, 10])
+        self.assertTrue(np.allclose(batches[3][0], data_gen[0][0]))
+
+    def test_TFDATA_variableShape(self):
+        # Create images with varying shapes
+        tmp_data = tempfile.TemporaryDirectory(prefix="tmp.aucmedi.",
+                                               suffix=".data")
+        samples = []
+        for i, size in enumerate([12, 16, 20]):
+            img = np.random.rand(size, size+2, 8, 3) * 255
+            np.save(os.path.join(tmp_data.name, "sample_" + str(i) + ".npy"),
+                    img)
+            samples.append("sample_" + str(i))
+        # Export without resizing
+        data_gen = DataGenerator(samples, tmp_data.name, loader=numpy_loader,
+                                 image_format="npy", grayscale=False,
+                                 batch_size=1, resize=None, two_dim=False,
+                                 data_aug=VolumeAugmentation(), seed=0,
+                                 standardize_mode="tf")
+        dataset = data_gen.as_tf_dataset()
+        self.assertEqual(tuple(dataset.element_spec[0].shape),
+                         (None, None, None, None, 3))
+        batches = list(dataset.as_numpy_iterator())
+        for i, size in enumerate([12, 16, 20]):
+            self.assertEqual(batches[i][0].shape, (1, size, size+2, 8, 3))
+            self.assertTrue(np.allclose(batches[i][0], data_gen[i][0]))
+        tmp_data.cleanup()
+
+    def test_PrepareImages_memmap(self):
+        data_gen_ref = DataGenerator(self.sampleList_rgb_2D, self.tmp_data.name,
+                                     labels=self.labels_ohe, grayscale=False,
+                                     batch_size=5)
+        for workers, executor in [(1, "thread"), (5, "thread"), (2, "process")]:
+            with DataGenerator(self.sampleList_rgb_2D, self.tmp_data.name,
+                               labels=self.labels_ohe, prepare_images=True,
+                               prepare_store="memmap", grayscale=False,
+                               batch_size=5, workers=workers,
+                               executor=executor) as data_gen:
+                self.assertEqual(sorted(os.listdir(data_gen.prepare_dir)),
+                                 ["index.npy", "manifest.json",
+                                  "samples.npy"])
+                for i in range(0, 5):
+                    batch = data_gen[i]
+                    batch_ref = data_gen_ref[i]
+                    self.assertTrue(np.allclose(batch[0], batch_ref[0]))
+                    self.assertTrue(np.array_equal(batch[1], batch_ref[1]))
+        self.assertRaises(ValueError, DataGenerator, self.sampleList_rgb_2D,
+                          self.tmp_data.name, prepare_store="hdf5")
+
+    def test_PrepareImages_processExecutor(self):
+        with DataGenerator(self.sampleList_rgb_2D, self.tmp_data.name,
+                           labels=self.labels_ohe, prepare_images=True,
+                           grayscale=False, batch_size=5, workers=2,
+                           executor="process") as data_gen:
+            precprocessed_images = [f for f in os.listdir(data_gen.prepare_dir) \
+                                    if f.endswith(".pickle")]
+            self.assertEqual(len(precprocessed_images),
+                             len(self.sampleList_rgb_2D))
+            for i in range(0, 10):
+                batch = data_gen[i]
+                self.assertTrue(np.array_equal(batch[1].shape, (5, 4)))
+
     #-------------------------------------------------#
     #             Beforehand Preprocessing            #
     #-------------------------------------------------#
@@ -231,6 +568,149 @@ class DataGeneratorTEST(unittest.TestCase):
             self.assertTrue(np.array_equal(batch[1].shape, (5, 4)))
         shutil.rmtree(data_gen.prepare_dir)
 
+    def test_PrepareImages_resumable(self):
+        path_prepare = os.path.join(self.tmp_data.name, "prepare.resume")
+        sample_list = self.sampleList_rgb_2D[:10] + ["image.corrupt.png"]
+        for store in ["pickle", "memmap"]:
+            prepare_dir = path_prepare + "." + store
+            data_gen = DataGenerator(sample_list, self.tmp_data.name,
+                                     prepare_images=True, prepare_store=store,
+                                     prepare_dir=prepare_dir, grayscale=False,
+                                     batch_size=5, workers=2)
+            status = data_gen.prepare_status
+            self.assertEqual((status["prepared"], status["skipped"]), (10, 0))
+            self.assertEqual(list(status["failed"].keys()), [10])
+            with open(os.path.join(prepare_dir, "manifest.json"), "r") as fr:
+                manifest = json.load(fr)
+            self.assertEqual(manifest["failed"][0]["sample"],
+                             "image.corrupt.png")
+            batch = data_gen[0]
+            self.assertTrue(np.array_equal(batch[0].shape, (5, 224, 224, 3)))
+            data_gen.close()
+            # Resume preparation with already prepared samples
+            data_gen = DataGenerator(sample_list, self.tmp_data.name,
+                                     prepare_images=True, prepare_store=store,
+                                     prepare_dir=prepare_dir, grayscale=False,
+                                     batch_size=5)
+            status = data_gen.prepare_status
+            self.assertEqual((status["prepared"], status["skipped"]), (10, 10))
+            self.assertEqual(len(status["failed"]), 1)
+            data_gen.close()
+            # Resume with another sample order & configuration
+            for samples, resize in [(sample_list[:10][::-1], (224, 224)),
+                                    (sample_list[:10][::-1], (32, 32))]:
+                data_gen = DataGenerator(samples, self.tmp_data.name,
+                                         prepare_images=True,
+                                         prepare_store=store,
+                                         prepare_dir=prepare_dir,
+                                         grayscale=False, batch_size=5,
+                                         resize=resize)
+                self.assertEqual(data_gen.prepare_status["skipped"], 0)
+                data_gen_ref = DataGenerator(samples, self.tmp_data.name,
+                                             grayscale=False, batch_size=5,
+                                             resize=resize)
+                for i in range(0, 2):
+                    self.assertTrue(np.allclose(data_gen[i][0],
+                                                data_gen_ref[i][0]))
+                data_gen.close()
+
+    def test_PrepareImages_background(self):
+        data_gen_ref = DataGenerator(self.sampleList_rgb_2D, self.tmp_data.name,
+                                     labels=self.labels_ohe, grayscale=False,
+                                     batch_size=5)
+        for store, mode in [("pickle", "background"), ("memmap", "background"),
+                            ("pickle", "lazy"), ("memmap", "lazy")]:
+            with DataGenerator(self.sampleList_rgb_2D, self.tmp_data.name,
+                               labels=self.labels_ohe, prepare_images=True,
+                               prepare_store=store, prepare_mode=mode,
+                               grayscale=False, batch_size=5,
+                               workers=2) as data_gen:
+                for i in range(0, 5):
+                    batch = data_gen[i]
+                    self.assertTrue(np.allclose(batch[0], data_gen_ref[i][0]))
+                if mode == "background" : data_gen.prepare_thread.join()
+                else:
+                    status = data_gen.prepare()
+                    self.assertEqual(status["skipped"], 25)
+                for i in range(0, 5):
+                    batch = data_gen[i]
+                    self.assertTrue(np.allclose(batch[0], data_gen_ref[i][0]))
+                self.assertEqual(data_gen.prepare_status["prepared"], 25)
+
+    #-------------------------------------------------#
+    #                  Sample Caching                 #
+    #-------------------------------------------------#
+    def test_SampleCache_disk(self):
+        path_cache = os.path.join(self.tmp_data.name, "cache.disk")
+        data_gen_ref = DataGenerator(self.sampleList_rgb_2D, self.tmp_data.name,
+                                     labels=self.labels_ohe, grayscale=False,
+                                     batch_size=5, resize=(32, 32))
+        cache = DiskCache(path_cache)
+        data_gen = DataGenerator(self.sampleList_rgb_2D, self.tmp_data.name,
+                                 labels=self.labels_ohe, grayscale=False,
+                                 batch_size=5, resize=(32, 32),
+                                 sample_cache=cache)
+        for i in range(0, 10):
+            batch = data_gen[i]
+            self.assertTrue(np.allclose(batch[0], data_gen_ref[i][0]))
+        self.assertEqual((cache.hits, cache.misses), (25, 25))
+        # Reuse cache with another DataGenerator and identical configuration
+        cache_new = DiskCache(path_cache)
+        data_gen = DataGenerator(self.sampleList_rgb_2D, self.tmp_data.name,
+                                 labels=self.labels_ohe, grayscale=False,
+                                 batch_size=5, resize=(32, 32),
+                                 sample_cache=cache_new)
+        batch = data_gen[0]
+        self.assertEqual((cache_new.hits, cache_new.misses), (5, 0))
+        # Different configuration results into new cache entries
+        data_gen = DataGenerator(self.sampleList_rgb_2D, self.tmp_data.name,
+                                 labels=self.labels_ohe, grayscale=False,
+                                 batch_size=5, resize=(32, 32),
+                                 subfunctions=[Padding(mode="square")],
+                                 sample_cache=cache_new)
+        batch = data_gen[0]
+        self.assertEqual((cache_new.hits, cache_new.misses), (5, 5))
+        self.assertEqual(len(cache_new), 30)
+
+    def test_SampleCache_memory(self):
+        cache = MemoryCache()
+        data_gen = DataGenerator(self.sampleList_rgb_2D, self.tmp_data.name,
+                                 labels=self.labels_ohe, grayscale=False,
+                                 batch_size=5, resize=(32, 32), workers=2,
+                                 sample_cache=cache)
+        for i in range(0, 10):
+            batch = data_gen[i]
+            self.assertTrue(np.array_equal(batch[0].shape, (5, 32, 32, 3)))
+        self.assertEqual((cache.hits, cache.misses), (25, 25))
+        # Augmentation on read-only cached samples
+        cache = MemoryCache()
+        data_gen = DataGenerator(self.sampleList_rgb_3D, self.tmp_data.name,
+                                 grayscale=False, batch_size=5, two_dim=False,
+                                 loader=numpy_loader, resize=None,
+                                 data_aug=VolumeAugmentation(),
+                                 sample_cache=cache)
+        for i in range(0, 10):
+            batch = data_gen[i]
+        self.assertEqual((cache.hits, len(cache)), (25, 25))
+        # In-place standardization on read-only cached samples
+        cache = MemoryCache()
+        data_gen = DataGenerator(self.sampleList_rgb_2D, self.tmp_data.name,
+                                 grayscale=False, batch_size=5, resize=None,
+                                 subfunctions=[ColorConstancy(),
+                                               Clip(min=0, max=255)],
+                                 standardize_mode="tf", sample_cache=cache)
+        img_first = data_gen.preprocess_image(0)
+        img_second = data_gen.preprocess_image(0)
+        self.assertEqual(cache.hits, 1)
+        self.assertTrue(np.array_equal(img_first, img_second))
+        # Samples exceeding the cache size are not cached
+        cache = MemoryCache(max_size=1)
+        data_gen = DataGenerator(self.sampleList_rgb_2D, self.tmp_data.name,
+                                 grayscale=False, batch_size=5,
+                                 sample_cache=cache)
+        batch = data_gen[0]
+        self.assertEqual((cache.hits, len(cache)), (0, 0))
+
     #-------------------------------------------------#
     #                   Utilization                   #
     #-------------------------------------------------#
@@ -131,6 +131,31 @@ class EnsembleTEST(unittest.TestCase):
                                    n_cycles=1, aggregate="mean")
         self.assertTrue(np.array_equal(preds.shape, (3, 2)))
 
+    def test_Augmenting_forwardParameters(self):
+        # Record the DataGenerator which is rebuilt for inference
+        class RecordingModel:
+            def __init__(self, model):
+                self.model = model
+                self.input_shape = model.input_shape
+            def predict(self, prediction_generator):
+                self.generator = prediction_generator
+                return self.model.predict(prediction_generator)
+        model = RecordingModel(self.model3D)
+        datagen = DataGenerator(self.sampleList3D, self.tmp_data.name,
+                                batch_size=3, resize=None,
+                                data_aug=VolumeAugmentation(), grayscale=True,
+                                two_dim=False, subfunctions=[],
+                                standardize_mode="tf", loader=numpy_loader,
+                                dtype=np.float32, prefetch=1, batch_buffers=3)
+        preds = predict_augmenting(model, datagen, n_cycles=2, aggregate="mean")
+        self.assertTrue(np.array_equal(preds.shape, (3, 2)))
+        aug_gen = model.generator
+        self.assertEqual(aug_gen.dtype, np.float32)
+        self.assertEqual(aug_gen.prefetch, 1)
+        self.assertEqual(aug_gen.batch_buffers, 3)
+        self.assertEqual(aug_gen[0][0].dtype, np.float32)
+        aug_gen.close()
+
     #-------------------------------------------------#
     #                     Bagging                     #
     #-------------------------------------------------#
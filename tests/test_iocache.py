@@ -0,0 +1,181 @@
+#==============================================================================#
+#  Author:       Dominik Müller                                                #
+#  Copyright:    2024 IT-Infrastructure for Translational Medical Research,    #
+#                University of Augsburg                                        #
+#                                                                              #
+#  This program is free software: you can redistribute it and/or modify        #
+#  it under the terms of the GNU General Public License as published by        #
+#  the Free Software Foundation, either version 3 of the License, or           #
+#  (at your option) any later version.                                         #
+#                                                                              #
+#  This program is distributed in the hope that it will be useful,             #
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of              #
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the               #
+#  GNU General Public License for more details.                                #
+#                                                                              #
+#  You should have received a copy of the GNU General Public License           #
+#  along with this program.  If not, see <http://www.gnu.org/licenses/>.       #
+#==============================================================================#
+#-----------------------------------------------------#
+#                   Library imports                   #
+#-----------------------------------------------------#
+#External libraries
+import unittest
+import tempfile
+import pickle
+import os
+import numpy as np
+#Internal libraries
+from aucmedi.data_processing.io_cache import *
+
+#-----------------------------------------------------#
+#                 Unittest: IO Cache                  #
+#-----------------------------------------------------#
+class IOcacheTEST(unittest.TestCase):
+    # Create random imaging data
+    @classmethod
+    def setUpClass(self):
+        np.random.seed(1234)
+        # Initialize temporary directory
+        self.tmp_data = tempfile.TemporaryDirectory(prefix="tmp.aucmedi.",
+                                                    suffix=".data")
+        # Create 2D RGB data
+        self.images = [np.random.rand(16, 16, 3) * 255 for i in range(0, 10)]
+
+    #-------------------------------------------------#
+    #                  Memmap Store                   #
+    #-------------------------------------------------#
+    def test_MEMMAP_usage(self):
+        path_store = os.path.join(self.tmp_data.name, "memmap")
+        store = MemmapStore(path_store, n_samples=10)
+        self.assertFalse(0 in store)
+        for i in range(0, 8):
+            store.write(i, self.images[i])
+        self.assertTrue(7 in store)
+        self.assertFalse(8 in store)
+        self.assertTrue(np.array_equal(store.read(3), self.images[3]))
+        batch = store.read([5, 1, 2])
+        self.assertTrue(np.array_equal(batch, np.stack([self.images[5],
+                                                        self.images[1],
+                                                        self.images[2]])))
+        self.assertRaises(KeyError, store.read, 9)
+        self.assertRaises(ValueError, store.write, 9, self.images[0][:8])
+        # Reopen store via pickling and via path
+        store_pickled = pickle.loads(pickle.dumps(store))
+        self.assertTrue(np.array_equal(store_pickled.read(4), self.images[4]))
+        store_reopened = MemmapStore(path_store, n_samples=10)
+        self.assertEqual(store_reopened.shape, (16, 16, 3))
+        self.assertTrue(np.array_equal(store_reopened.read(6), self.images[6]))
+
+    #-------------------------------------------------#
+    #                   Disk Cache                    #
+    #-------------------------------------------------#
+    def test_DISKCACHE_usage(self):
+        path_cache = os.path.join(self.tmp_data.name, "disk")
+        cache = DiskCache(path_cache)
+        self.assertIsNone(cache.get("abcdef"))
+        cache.put("abcdef", self.images[0])
+        self.assertTrue("abcdef" in cache)
+        self.assertTrue(np.array_equal(cache.get("abcdef"), self.images[0]))
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+        # Reuse cache via a new instance
+        cache_new = pickle.loads(pickle.dumps(DiskCache(path_cache)))
+        self.assertTrue(np.array_equal(cache_new.get("abcdef"), self.images[0]))
+        cache.clear()
+        self.assertEqual(len(cache), 0)
+
+    def test_DISKCACHE_eviction(self):
+        path_cache = os.path.join(self.tmp_data.name, "disk_lru")
+        size = self.images[0].nbytes + 128
+        cache = DiskCache(path_cache, max_size=3*size)
+        for i in range(0, 3):
+            cache.put("key_" + str(i), self.images[i])
+            os.utime(cache.__get_path__("key_" + str(i)), (i, i))
+        # Mark first sample as recently used
+        cache.get("key_0")
+        cache.put("key_3", self.images[3])
+        self.assertEqual(len(cache), 3)
+        self.assertTrue("key_0" in cache)
+        self.assertFalse("key_1" in cache)
+
+    def test_DISKCACHE_formats(self):
+        # Compressed samples
+        cache = DiskCache(os.path.join(self.tmp_data.name, "disk_npz"),
+                          compress=True)
+        cache.put("abcdef", self.images[1])
+        self.assertTrue(cache.__get_path__("abcdef").endswith(".npz"))
+        self.assertTrue(np.array_equal(cache.get("abcdef"), self.images[1]))
+        self.assertEqual(len(cache), 1)
+        # Memory-mapped samples
+        cache = DiskCache(os.path.join(self.tmp_data.name, "disk_mmap"),
+                          mmap=True)
+        cache.put("abcdef", self.images[2])
+        image = cache.get("abcdef")
+        self.assertIsInstance(image, np.memmap)
+        self.assertTrue(np.array_equal(image, self.images[2]))
+        image += 1
+        self.assertTrue(np.array_equal(cache.get("abcdef"), self.images[2]))
+        self.assertRaises(ValueError, DiskCache, self.tmp_data.name,
+                          compress=True, mmap=True)
+
+    #-------------------------------------------------#
+    #               Shared Memory Cache               #
+    #-------------------------------------------------#
+    def test_SHAREDMEMORYCACHE_usage(self):
+        cache = SharedMemoryCache(capacity=3*self.images[0].nbytes + 128,
+                                  max_samples=5)
+        self.assertIsNone(cache.get("a"))
+        cache.put("a", self.images[0])
+        cache["b"] = self.images[1].astype(np.float32)
+        img = cache.get("a")
+        self.assertTrue(np.array_equal(img, self.images[0]))
+        self.assertFalse(img.flags.writeable)
+        self.assertEqual(cache["b"].dtype, np.float32)
+        self.assertEqual((cache.hits, cache.misses), (2, 1))
+        self.assertRaises(KeyError, cache.__getitem__, "c")
+        # Attach to the shared memory via pickling
+        cache_attached = pickle.loads(pickle.dumps(cache))
+        self.assertFalse(cache_attached.owner)
+        self.assertTrue(np.array_equal(cache_attached["a"], self.images[0]))
+        # Samples added afterwards are visible to attached caches
+        cache_attached.put("c", self.images[2])
+        self.assertTrue(np.array_equal(cache["c"], self.images[2]))
+        # Samples exceeding the capacity are not cached
+        cache.put("d", self.images[3])
+        self.assertEqual(len(cache_attached), 3)
+        self.assertFalse("d" in cache)
+        self.assertRaises(ValueError, cache.put, "e",
+                          np.empty((2,), dtype=object))
+        cache.clear()
+        self.assertEqual(len(cache_attached), 0)
+        self.assertFalse("a" in cache_attached)
+        del img
+        cache_attached.close()
+        cache.close()
+
+    #-------------------------------------------------#
+    #                  Memory Cache                   #
+    #-------------------------------------------------#
+    def test_MEMORYCACHE_usage(self):
+        cache = MemoryCache()
+        self.assertIsNone(cache.get("a"))
+        cache.put("a", self.images[0])
+        img = cache.get("a")
+        self.assertTrue(np.array_equal(img, self.images[0]))
+        self.assertFalse(img.flags.writeable)
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+        cache_pickled = pickle.loads(pickle.dumps(cache))
+        self.assertTrue("a" in cache_pickled)
+        cache.clear()
+        self.assertEqual((len(cache), cache.size), (0, 0))
+
+    def test_MEMORYCACHE_eviction(self):
+        cache = MemoryCache(max_size=3*self.images[0].nbytes)
+        for i in range(0, 3):
+            cache.put(str(i), self.images[i])
+        cache.get("0")
+        cache.put("3", self.images[3])
+        self.assertEqual(len(cache), 3)
+        self.assertTrue("0" in cache)
+        self.assertFalse("1" in cache)
+        self.assertEqual(cache.size, 3*self.images[0].nbytes)
@@ -29,6 +29,7 @@ import json
 import os
 #Internal libraries
 from aucmedi.data_processing.io_interfaces import *
+from aucmedi.data_processing.io_loader import pack_archive
 
 #-----------------------------------------------------#
 #               Unittest: IO Interfaces               #
@@ -234,3 +235,67 @@ class IOinterfacesTEST(unittest.TestCase):
                         ohe=True, col_sample="index")
         self.assertTrue(len(ds[0]), 25)
         self.assertTrue(len(ds[1]), 25)
+
+    #-------------------------------------------------#
+    #               Archive IO Interface              #
+    #-------------------------------------------------#
+    def test_Archive_directory(self):
+        # Create imaging data with subdirectories
+        tmp_data = tempfile.TemporaryDirectory(prefix="tmp.aucmedi.",
+                                               suffix=".data")
+        tmp_archive = tempfile.TemporaryDirectory(prefix="tmp.aucmedi.",
+                                                  suffix=".archive")
+        for i in range(0, 5):
+            os.mkdir(os.path.join(tmp_data.name, "class_" + str(i)))
+        for i in range(0, 25):
+            img = np.random.rand(16, 16, 3) * 255
+            img_pillow = Image.fromarray(img.astype(np.uint8))
+            index = "image.sample_" + str(i) + ".png"
+            label_dir = "class_" + str((i % 5))
+            path_sample = os.path.join(tmp_data.name, label_dir, index)
+            img_pillow.save(path_sample)
+        # Pack dataset into archive
+        ds_ref = directory_loader(tmp_data.name, self.aif, training=True)
+        pack_archive(ds_ref[0], tmp_data.name, tmp_archive.name,
+                     image_format=ds_ref[4])
+        # Run Directory IO on archive
+        ds = directory_loader(tmp_archive.name, self.aif, training=True)
+        self.assertEqual(ds[0], ds_ref[0])
+        self.assertTrue(np.array_equal(ds[1], ds_ref[1]))
+        self.assertEqual(ds[3], ds_ref[3])
+
+    def test_Archive_CSV(self):
+        # Create imaging data
+        tmp_data = tempfile.TemporaryDirectory(prefix="tmp.aucmedi.",
+                                               suffix=".data")
+        tmp_archive = tempfile.TemporaryDirectory(prefix="tmp.aucmedi.",
+                                                  suffix=".archive")
+        data = {}
+        for i in range(0, 25):
+            img = np.random.rand(16, 16, 3) * 255
+            img_pillow = Image.fromarray(img.astype(np.uint8))
+            index = "image.sample_" + str(i) + ".png"
+            data[index[:-4]] = np.random.randint(5)
+            path_sample = os.path.join(tmp_data.name, index)
+            img_pillow.save(path_sample)
+        # Create CSV data
+        tmp_csv = tempfile.NamedTemporaryFile(mode="w", prefix="tmp.aucmedi.",
+                                              suffix=".csv")
+        df = pd.DataFrame.from_dict(data, orient="index", columns=["class"])
+        df.index.name = "index"
+        df.to_csv(tmp_csv.name, index=True, header=True)
+        # Pack dataset into archive
+        pack_archive(list(data.keys())[:-1], tmp_data.name, tmp_archive.name,
+                     image_format="png")
+        # Run CSV IO on archive
+        self.assertRaises(Exception, csv_loader, path_data=tmp_csv.name,
+                          path_imagedir=tmp_archive.name,
+                          allowed_image_formats=self.aif, training=True,
+                          ohe=False, col_sample="index", col_class="class")
+        pack_archive(list(data.keys()), tmp_data.name, tmp_archive.name,
+                     image_format="png")
+        ds = csv_loader(path_data=tmp_csv.name, path_imagedir=tmp_archive.name,
+                        allowed_image_formats=self.aif, training=True,
+                        ohe=False, col_sample="index", col_class="class")
+        self.assertEqual(len(ds[0]), 25)
+        self.assertEqual(ds[4], "png")
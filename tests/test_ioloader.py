@@ -26,9 +26,16 @@ import tempfile
 from PIL import Image
 import SimpleITK as sitk
 import os
+import gc
+from multiprocessing import shared_memory
 #Internal libraries
 from aucmedi.data_processing.io_loader import *
 from aucmedi import DataGenerator
+from aucmedi.data_processing.subfunctions import Padding
+from aucmedi.data_processing.io_cache import DiskCache, MemoryCache, \
+                                            SharedMemoryCache
+from aucmedi.data_processing.io_loader.archive_loader import Archive, \
+                                                          ARCHIVE_INDEX
 
 #-----------------------------------------------------#
 #                 Unittest: IO Loader                 #
@@ -100,6 +107,37 @@ class IOloaderTEST(unittest.TestCase):
                                grayscale=False)
             self.assertTrue(np.array_equal(img.shape, self.img_2d_rgb.shape))
 
+    # Test for reduced-size decoding of JPEG images
+    def test_image_loader_targetShape(self):
+        # Create temporary directory
+        tmp_data = tempfile.TemporaryDirectory(prefix="tmp.aucmedi.",
+                                               suffix=".data")
+        # Create images
+        img = np.random.rand(128, 96, 3) * 255
+        img_pillow = Image.fromarray(img.astype(np.uint8))
+        img_pillow.save(os.path.join(tmp_data.name, "sample.jpg"))
+        img_pillow.save(os.path.join(tmp_data.name, "sample.png"))
+        # Load JPEG image with reduced scale
+        img = image_loader("sample", tmp_data.name, image_format="jpg",
+                           target_shape=(30, 20))
+        self.assertTrue(np.array_equal(img.shape, (32, 24, 3)))
+        img = image_loader("sample", tmp_data.name, image_format="jpg",
+                           grayscale=True, target_shape=(64, 40))
+        self.assertTrue(np.array_equal(img.shape, (64, 48, 1)))
+        # Load PNG image in full size
+        img = image_loader("sample", tmp_data.name, image_format="png",
+                           target_shape=(30, 20))
+        self.assertTrue(np.array_equal(img.shape, (128, 96, 3)))
+        # Check DataGenerator with resize hint
+        for subfunctions in [[], [Padding()]]:
+            data_gen = DataGenerator(["sample"], tmp_data.name,
+                                     image_format="jpg", resize=(30, 20),
+                                     subfunctions=subfunctions,
+                                     resize_hint=True, standardize_mode=None)
+            batch = data_gen[0]
+            self.assertTrue(np.array_equal(batch[0].shape, (1, 30, 20, 3)))
+        self.assertNotIn("target_shape", data_gen.loader_kwargs)
+
     #-------------------------------------------------#
     #                  NumPy Loader                   #
     #-------------------------------------------------#
@@ -183,6 +221,167 @@ class IOloaderTEST(unittest.TestCase):
                                grayscale=False, two_dim=False)
             self.assertTrue(np.array_equal(img.shape, self.img_3d_rgb.shape))
 
+    # Test for memory-mapped and strict loading
+    def test_numpy_loader_mmap(self):
+        # Create temporary directory
+        tmp_data = tempfile.TemporaryDirectory(prefix="tmp.aucmedi.",
+                                               suffix=".data")
+        path_sample = os.path.join(tmp_data.name, "image.npy")
+        np.save(path_sample, self.img_3d_rgb)
+        # Read-only memory map (default) as plain array
+        img = numpy_loader("image.npy", tmp_data.name, two_dim=False)
+        self.assertIs(type(img), np.ndarray)
+        self.assertFalse(img.flags.writeable)
+        self.assertTrue(np.array_equal(img, self.img_3d_rgb))
+        # Copy-on-write memory map and complete loading
+        img = numpy_loader("image.npy", tmp_data.name, two_dim=False,
+                           mmap_mode="c")
+        img[0] = 0
+        self.assertTrue(np.array_equal(np.load(path_sample), self.img_3d_rgb))
+        img = numpy_loader("image.npy", tmp_data.name, two_dim=False,
+                           mmap_mode=None)
+        self.assertNotIsInstance(img, np.memmap)
+        self.assertTrue(np.array_equal(img, self.img_3d_rgb))
+        # Object arrays require pickle
+        path_object = os.path.join(tmp_data.name, "object.npy")
+        np.save(path_object, self.img_3d_rgb.astype(object), allow_pickle=True)
+        img = numpy_loader("object.npy", tmp_data.name, two_dim=False)
+        self.assertTrue(np.array_equal(img, self.img_3d_rgb))
+        self.assertRaises(ValueError, numpy_loader, "object.npy",
+                          tmp_data.name, two_dim=False, allow_pickle=False)
+
+    #-------------------------------------------------#
+    #                 Archive Loader                  #
+    #-------------------------------------------------#
+    # Test for archives with encoded images
+    def test_archive_loader_encoded(self):
+        # Create temporary directories
+        tmp_data = tempfile.TemporaryDirectory(prefix="tmp.aucmedi.",
+                                               suffix=".data")
+        tmp_archive = tempfile.TemporaryDirectory(prefix="tmp.aucmedi.",
+                                                  suffix=".archive")
+        # Create dataset
+        sample_list = []
+        for i in range(0, 6):
+            img = np.random.rand(16, 16, 3) * 255
+            img_pillow = Image.fromarray(img.astype(np.uint8))
+            index = "image.sample_" + str(i)
+            img_pillow.save(os.path.join(tmp_data.name, index + ".png"))
+            sample_list.append(index)
+        # Pack archive into multiple shards
+        pack_archive(sample_list, tmp_data.name, tmp_archive.name,
+                     image_format="png", shard_size=1000)
+        self.assertTrue(len(os.listdir(tmp_archive.name)) > 2)
+        # Load images from archive
+        for index in sample_list:
+            for grayscale in [False, True]:
+                img = archive_loader(index, tmp_archive.name, image_format="png",
+                                     grayscale=grayscale)
+                img_ref = image_loader(index, tmp_data.name, image_format="png",
+                                       grayscale=grayscale)
+                self.assertTrue(np.array_equal(img, img_ref))
+        self.assertRaises(FileNotFoundError, archive_loader, "unknown",
+                          tmp_archive.name, image_format="png")
+        # Test DataGenerator with process pool
+        with DataGenerator(sample_list, tmp_archive.name, image_format="png",
+                           loader=archive_loader, resize=None, batch_size=2,
+                           standardize_mode=None, workers=2,
+                           executor="process") as data_gen:
+            for i in range(0, 3):
+                batch = data_gen[i]
+                self.assertTrue(np.array_equal(batch[0].shape, (2, 16, 16, 3)))
+
+    # Test for archives with arrays
+    def test_archive_loader_arrays(self):
+        # Create temporary directories
+        tmp_data = tempfile.TemporaryDirectory(prefix="tmp.aucmedi.",
+                                               suffix=".data")
+        tmp_archive = tempfile.TemporaryDirectory(prefix="tmp.aucmedi.",
+                                                  suffix=".archive")
+        # Create dataset
+        sample_list = []
+        for i in range(0, 6):
+            index = "3Dimage.sample_" + str(i) + ".npy"
+            np.save(os.path.join(tmp_data.name, index), self.img_3d_hu + i)
+            sample_list.append(index)
+        # Pack loaded arrays into archive
+        pack_archive(sample_list, tmp_data.name, tmp_archive.name,
+                     loader=numpy_loader, grayscale=True, two_dim=False)
+        # Load arrays from archive
+        for i, index in enumerate(sample_list):
+            img = archive_loader(index, tmp_archive.name, grayscale=True,
+                                 two_dim=False)
+            self.assertEqual(img.dtype, np.float32)
+            self.assertTrue(np.array_equal(img, self.img_3d_hu + i))
+        self.assertRaises(ValueError, archive_loader, sample_list[0],
+                          tmp_archive.name, grayscale=False, two_dim=False)
+
+    # Test for in-place processing of arrays from archives
+    def test_archive_loader_inplace(self):
+        # Create temporary directories
+        tmp_data = tempfile.TemporaryDirectory(prefix="tmp.aucmedi.",
+                                               suffix=".data")
+        tmp_archive = tempfile.TemporaryDirectory(prefix="tmp.aucmedi.",
+                                                  suffix=".archive")
+        # Create dataset
+        sample_list = []
+        for i in range(0, 4):
+            index = "3Dimage.sample_" + str(i) + ".npy"
+            np.save(os.path.join(tmp_data.name, index), self.img_3d_gray)
+            sample_list.append(index)
+        pack_archive(sample_list, tmp_data.name, tmp_archive.name,
+                     loader=numpy_loader, grayscale=True, two_dim=False)
+        img = archive_loader(sample_list[0], tmp_archive.name, grayscale=True,
+                             two_dim=False)
+        self.assertFalse(img.flags.writeable)
+        # Run multiple epochs with in-place standardization
+        data_gen = DataGenerator(sample_list, tmp_archive.name,
+                                 loader=archive_loader, resize=None,
+                                 two_dim=False, grayscale=True, batch_size=2,
+                                 standardize_mode="tf")
+        batch_ref = data_gen[0][0]
+        for epoch in range(0, 2):
+            for i in range(0, 2):
+                self.assertTrue(np.array_equal(data_gen[i][0], batch_ref))
+        # Archive data is not modified
+        img = archive_loader(sample_list[0], tmp_archive.name, grayscale=True,
+                             two_dim=False)
+        self.assertTrue(np.array_equal(img, self.img_3d_gray))
+
+    # Test for reopening modified archives
+    def test_archive_loader_revalidate(self):
+        # Create temporary directories
+        tmp_data = tempfile.TemporaryDirectory(prefix="tmp.aucmedi.",
+                                               suffix=".data")
+        tmp_archive = tempfile.TemporaryDirectory(prefix="tmp.aucmedi.",
+                                                  suffix=".archive")
+        # Create dataset
+        sample_list = []
+        for i in range(0, 3):
+            index = "3Dimage.sample_" + str(i) + ".npy"
+            np.save(os.path.join(tmp_data.name, index), self.img_3d_hu + i)
+            sample_list.append(index)
+        pack_archive(sample_list, tmp_data.name, tmp_archive.name,
+                     loader=numpy_loader, grayscale=True, two_dim=False)
+        archive = Archive.open(tmp_archive.name)
+        # Modification of the index is only checked explicitly
+        path_index = os.path.join(tmp_archive.name, ARCHIVE_INDEX)
+        stat = os.stat(path_index)
+        os.utime(path_index, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        for index in sample_list:
+            archive_loader(index, tmp_archive.name, grayscale=True,
+                           two_dim=False)
+            self.assertIs(Archive.open(tmp_archive.name), archive)
+        archive_reopened = Archive.open(tmp_archive.name, revalidate=True)
+        self.assertIsNot(archive_reopened, archive)
+        self.assertIs(Archive.open(tmp_archive.name, revalidate=True),
+                      archive_reopened)
+        # Repacking discards the opened archive
+        pack_archive(sample_list[:1], tmp_data.name, tmp_archive.name,
+                     loader=numpy_loader, grayscale=True, two_dim=False)
+        self.assertEqual(Archive.open(tmp_archive.name).listdir(),
+                         sample_list[:1])
+
     #-------------------------------------------------#
     #                   sITK Loader                   #
     #-------------------------------------------------#
@@ -301,6 +500,124 @@ class IOloaderTEST(unittest.TestCase):
             batch = data_gen[i]
             self.assertTrue(np.array_equal(batch[0].shape, (1, 18, 10, 10, 1)))
 
+    # Test for Region loading
+    def test_sitk_loader_Region(self):
+        # Create temporary directory
+        tmp_data = tempfile.TemporaryDirectory(prefix="tmp.aucmedi.",
+                                               suffix=".data")
+        # Create images
+        sample_list = []
+        for format in [".mha", ".nii"]:
+            index = "3Dimage.sample" + format
+            path_sample = os.path.join(tmp_data.name, index)
+            image_sitk = sitk.GetImageFromArray(self.img_3d_hu)
+            image_sitk.SetSpacing([0.5,1.5,2.0])
+            image_sitk.SetOrigin([-3.0,4.5,1.0])
+            sitk.WriteImage(image_sitk, path_sample)
+            sample_list.append(index)
+        # Compare region loading with cropping of the full volume
+        region = ((5, 3, 2), (20, 16, 6))
+        for index in sample_list:
+            for resampling in [(1.0,1.0,1.0), (2.0,0.5,0.5), None]:
+                img_full = sitk_loader(index, tmp_data.name,
+                                       resampling=resampling)
+                img_region = sitk_loader(index, tmp_data.name,
+                                         resampling=resampling,
+                                         region=((1, 2, 3), (8, 6, 4)))
+                self.assertTrue(np.array_equal(img_region.shape, (8, 6, 4, 1)))
+                self.assertTrue(np.allclose(img_region,
+                                            img_full[1:9, 2:8, 3:7],
+                                            atol=1e-4))
+            # Region loading via function
+            img_full = sitk_loader(index, tmp_data.name)
+            img_region = sitk_loader(index, tmp_data.name,
+                                     region=lambda shape: region)
+            self.assertTrue(np.allclose(img_region,
+                                        img_full[5:25, 3:19, 2:8],
+                                        atol=1e-4))
+            # Region outside of the volume
+            self.assertRaises(ValueError, sitk_loader, index, tmp_data.name,
+                              region=((30, 0, 0), (8, 8, 8)))
+        # Load region via DataGenerator
+        data_gen = DataGenerator(sample_list, tmp_data.name,
+                                 loader=sitk_loader, region=region,
+                                 resize=None, standardize_mode=None,
+                                 grayscale=True, batch_size=2)
+        batch = data_gen[0]
+        self.assertTrue(np.array_equal(batch[0].shape, (2, 20, 16, 6, 1)))
+
+    # Test for Resampling cache
+    def test_sitk_loader_ResamplingCache(self):
+        # Create temporary directories
+        tmp_data = tempfile.TemporaryDirectory(prefix="tmp.aucmedi.",
+                                               suffix=".data")
+        tmp_cache = tempfile.TemporaryDirectory(prefix="tmp.aucmedi.",
+                                                suffix=".cache")
+        cache = DiskCache(tmp_cache.name)
+        # Create image
+        index = "3Dimage.sample.mha"
+        image_sitk = sitk.GetImageFromArray(self.img_3d_hu)
+        image_sitk.SetSpacing([0.5,1.5,2.0])
+        sitk.WriteImage(image_sitk, os.path.join(tmp_data.name, index))
+        # Load images via cache
+        img = sitk_loader(index, tmp_data.name)
+        for i in range(0, 2):
+            img_cached = sitk_loader(index, tmp_data.name,
+                                     resampling_cache=cache)
+            self.assertTrue(np.array_equal(img_cached, img))
+        self.assertEqual((cache.hits, cache.misses, len(cache)), (1, 1, 1))
+        # Different resampling configuration results into a new entry
+        img_cached = sitk_loader(index, tmp_data.name, outside_value=-1,
+                                 resampling_cache=cache)
+        self.assertEqual(len(cache), 2)
+        # Crop region from cached volume
+        img_region = sitk_loader(index, tmp_data.name, resampling_cache=cache,
+                                 region=((1, 2, 3), (8, 6, 4)))
+        self.assertTrue(np.array_equal(img_region, img[1:9, 2:8, 3:7]))
+        # Modified file results into a new entry
+        sitk.WriteImage(image_sitk, os.path.join(tmp_data.name, index))
+        os.utime(os.path.join(tmp_data.name, index), (1, 1))
+        sitk_loader(index, tmp_data.name, resampling_cache=cache)
+        self.assertEqual(len(cache), 3)
+
+    # Test for Interpolators & Multi-Threading
+    def test_sitk_loader_Interpolation(self):
+        # Create temporary directory
+        tmp_data = tempfile.TemporaryDirectory(prefix="tmp.aucmedi.",
+                                               suffix=".data")
+        # Create image
+        index = "3Dimage.sample.mha"
+        image_sitk = sitk.GetImageFromArray(self.img_3d_hu)
+        image_sitk.SetSpacing([0.5,1.5,2.0])
+        sitk.WriteImage(image_sitk, os.path.join(tmp_data.name, index))
+        # Load image with each interpolator
+        img_linear = sitk_loader(index, tmp_data.name)
+        for interpolator in ["linear", "bspline", "nearest"]:
+            img = sitk_loader(index, tmp_data.name, interpolator=interpolator,
+                              threads=2)
+            self.assertTrue(np.array_equal(img.shape, (32, 24, 8, 1)))
+            if interpolator == "linear":
+                self.assertTrue(np.array_equal(img, img_linear))
+            else : self.assertFalse(np.array_equal(img, img_linear))
+        # Nearest neighbor only contains original intensities & outside value
+        img = sitk_loader(index, tmp_data.name, interpolator="nearest")
+        self.assertTrue(np.all(np.isin(img, np.append(self.img_3d_hu, 0))))
+        # Region loading with B-spline interpolation
+        img = sitk_loader(index, tmp_data.name, interpolator="bspline")
+        img_region = sitk_loader(index, tmp_data.name, interpolator="bspline",
+                                 region=((8, 6, 2), (16, 12, 4)))
+        self.assertTrue(np.allclose(img_region, img[8:24, 6:18, 2:6],
+                                    atol=1.0))
+        self.assertRaises(ValueError, sitk_loader, index, tmp_data.name,
+                          interpolator="cubic")
+        # Partition CPU cores via DataGenerator
+        data_gen = DataGenerator([index], tmp_data.name, loader=sitk_loader,
+                                 resize=None, standardize_mode=None,
+                                 grayscale=True, workers=2, threads="auto")
+        threads = max(1, (os.cpu_count() or 1) // 2)
+        self.assertEqual(data_gen.loader_kwargs["threads"], threads)
+        self.assertTrue(np.array_equal(data_gen[0][0][0], img_linear))
+
     #-------------------------------------------------#
     #                  Cache Loader                   #
     #-------------------------------------------------#
@@ -324,6 +641,90 @@ class IOloaderTEST(unittest.TestCase):
             batch = data_gen[i]
             self.assertTrue(np.array_equal(batch[0].shape, (2, 16, 16, 16, 1)))
 
+    # Test for the cheap configuration fingerprint of in-memory caches
+    def test_cache_loader_sampleCache(self):
+        sample_list = []
+        cache = {}
+        for i in range(0, 6):
+           index = "3Dimage.sample_" + str(i)
+           cache[index] = np.random.rand(64, 64, 64, 1)
+           sample_list.append(index)
+        # Images are identified by object and not hashed by content
+        configs = []
+        for i in range(0, 2):
+            data_gen = DataGenerator(sample_list, None, loader=cache_loader,
+                                     resize=None, two_dim=False,
+                                     standardize_mode=None, grayscale=True,
+                                     batch_size=2, cache=cache,
+                                     sample_cache=MemoryCache())
+            configs.append(data_gen.cache_config)
+            batch = data_gen[0]
+            self.assertTrue(np.array_equal(batch[0][1], cache[sample_list[1]]))
+        self.assertEqual(configs[0], configs[1])
+        self.assertIn("id=" + str(id(cache[sample_list[0]])), configs[0])
+        # Another image object results in another configuration
+        cache[sample_list[0]] = cache[sample_list[0]].copy()
+        data_gen = DataGenerator(sample_list, None, loader=cache_loader,
+                                 resize=None, two_dim=False,
+                                 standardize_mode=None, grayscale=True,
+                                 batch_size=2, cache=cache,
+                                 sample_cache=MemoryCache())
+        self.assertNotEqual(data_gen.cache_config, configs[0])
+
+    # Test for shared memory cache in worker processes
+    def test_cache_loader_SharedMemoryCache(self):
+        # Create shared memory cache
+        cache = SharedMemoryCache(capacity=4*self.img_3d_hu.nbytes + 256)
+        sample_list = []
+        for i in range(0, 4):
+            index = "3Dimage.sample_" + str(i)
+            cache.put(index, self.img_3d_hu + i)
+            sample_list.append(index)
+        # Test DataGenerator with worker processes
+        data_gen = DataGenerator(sample_list, None, loader=cache_loader,
+                                 resize=None, two_dim=False,
+                                 standardize_mode=None, grayscale=True,
+                                 batch_size=2, cache=cache, workers=2,
+                                 executor="process")
+        for i in range(0, 2):
+            batch = data_gen[i]
+            self.assertTrue(np.array_equal(batch[0][1],
+                                           self.img_3d_hu + 2*i + 1))
+        data_gen.close()
+        cache.close()
+
+    # Test for in-place standardization of shared memory samples and their release
+    def test_cache_loader_SharedMemoryCache_standardize(self):
+        # Create shared memory cache
+        img = np.float32(self.img_2d_rgb * 0.9)
+        cache = SharedMemoryCache(capacity=4*img.nbytes + 256)
+        sample_list = []
+        for i in range(0, 4):
+            index = "image.sample_" + str(i)
+            cache.put(index, img + i)
+            sample_list.append(index)
+        # Test DataGenerator with in-place standardization
+        for workers, executor in [(1, "thread"), (2, "process")]:
+            data_gen = DataGenerator(sample_list, None, loader=cache_loader,
+                                     resize=(16, 16), two_dim=True,
+                                     standardize_mode="tf", grayscale=False,
+                                     batch_size=2, cache=cache,
+                                     workers=workers, executor=executor)
+            for epoch in range(0, 2):
+                batch = data_gen[0]
+                self.assertTrue(np.allclose(batch[0][1], (img + 1) / 127.5 - 1))
+            self.assertTrue(np.array_equal(cache["image.sample_0"], img))
+        # Shared memory is released on shut down or garbage collection
+        shm_names = [shm.name for (buffer, shm) in data_gen.batch_buffer_ring]
+        self.assertEqual(len(shm_names), data_gen.batch_buffers)
+        data_gen.close()
+        shm_names.append(cache.name)
+        del data_gen, cache, batch
+        gc.collect()
+        for name in shm_names:
+            self.assertRaises(FileNotFoundError, shared_memory.SharedMemory,
+                              name=name)
+
     # Test for grayscale 2D images
     def test_cache_loader_2Dgray(self):
         # Create temporary directory
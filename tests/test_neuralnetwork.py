@@ -92,6 +92,18 @@ class NeuralNetworkTEST(unittest.TestCase):
                            epochs=4)
         self.assertTrue("loss" in hist and "val_loss" in hist)
 
+    def test_training_tfdata(self):
+        model = NeuralNetwork(n_labels=4, channels=3, input_shape=(32, 32))
+        hist = model.train(training_generator=self.datagen.as_tf_dataset(),
+                           validation_generator=self.datagen.as_tf_dataset(),
+                           epochs=2)
+        self.assertTrue("loss" in hist and "val_loss" in hist)
+        dataset = self.datagen.as_tf_dataset(repeat=True)
+        hist = model.train(training_generator=dataset, epochs=3, iterations=2)
+        self.assertTrue(len(hist["loss"]) == 3)
+        preds = model.predict(self.datagen.as_tf_dataset())
+        self.assertTrue(preds.shape == (10, 4))
+
     def test_training_transferlearning(self):
         model = NeuralNetwork(n_labels=4, channels=3, input_shape=(32, 32))
         model.tf_epochs = 2
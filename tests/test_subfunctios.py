@@ -22,8 +22,11 @@
 #External libraries
 import unittest
 import numpy as np
+import albumentations
+import volumentations
 #Internal libraries
 from aucmedi.data_processing.subfunctions import *
+from aucmedi.data_processing.subfunctions import sf_pipeline
 
 #-----------------------------------------------------#
 #               Unittest: Subfunctions                #
@@ -114,12 +117,93 @@ class SubfunctionsTEST(unittest.TestCase):
         img_ppRGB = sf.transform(self.img3Drgb.copy())
         self.assertTrue(np.array_equal(img_ppRGB.shape, (32, 8, 8, 3)))
 
+    def test_RESIZE_reference(self):
+        # 2D: Compare with albumentations
+        for interpolation in [0, 1, 3]:
+            for img in [self.img2Dgray, self.img2Drgb, np.uint8(self.img2Drgb)]:
+                sf = Resize(shape=(32, 8), interpolation=interpolation)
+                aug = albumentations.Compose([albumentations.Resize(
+                            height=32, width=8, interpolation=interpolation)])
+                img_ref = aug(image=img.copy())["image"]
+                img_pp = sf.transform(img.copy())
+                self.assertEqual(img_pp.dtype, img_ref.dtype)
+                self.assertTrue(np.array_equal(img_pp, img_ref))
+        # 3D: Compare with volumentations
+        for interpolation in [0, 1, 3]:
+            for img in [self.img3Dgray, self.img3Drgb]:
+                sf = Resize(shape=(32, 8, 20), interpolation=interpolation)
+                aug = volumentations.Compose([volumentations.Resize(
+                            shape=(32, 8, 20), interpolation=interpolation,
+                            always_apply=True)])
+                img_ref = aug(image=img.copy())["image"]
+                img_pp = sf.transform(img.copy())
+                self.assertEqual(img_pp.dtype, img_ref.dtype)
+                self.assertTrue(np.allclose(img_pp, img_ref, atol=1e-3))
+        # Skip resizing for matching shapes
+        sf = Resize(shape=(16, 24))
+        self.assertIs(sf.transform(self.img2Drgb), self.img2Drgb)
+        sf = Resize(shape=(16, 24, 32))
+        self.assertIs(sf.transform(self.img3Drgb), self.img3Drgb)
+
     #-------------------------------------------------#
     #             Subfunction: Standardize            #
     #-------------------------------------------------#
     def test_STANDARDIZE_create(self):
         sf = Standardize()
 
+    def test_STANDARDIZE_dtype(self):
+        img_uint8 = np.uint8(self.img2Drgb)
+        for mode in ["z-score", "minmax", "grayscale", "tf", "caffe", "torch"]:
+            for per_channel in [False, True]:
+                sf = Standardize(mode=mode, per_channel=per_channel,
+                                 dtype="float32")
+                img_pp = sf.transform(img_uint8.copy())
+                self.assertEqual(img_pp.dtype, np.float32)
+                sf_ref = Standardize(mode=mode, per_channel=per_channel)
+                img_ref = sf_ref.transform(np.float64(img_uint8))
+                self.assertTrue(np.allclose(img_pp, img_ref, atol=1e-4))
+        sf = Standardize(mode="z-score", dtype="float16")
+        self.assertEqual(sf.transform(img_uint8.copy()).dtype, np.float16)
+        sf = Standardize(mode="grayscale", dtype="uint8")
+        self.assertEqual(sf.transform(self.img3Dhu.copy()).dtype, np.uint8)
+
+    def test_STANDARDIZE_batch(self):
+        for data in [self.img2Drgb, self.img3Drgb]:
+            batch = np.stack([data, np.flip(data, axis=0) * 0.5], axis=0)
+            for mode in ["z-score", "minmax", "grayscale", "tf", "caffe", "torch"]:
+                for per_channel in [False, True]:
+                    for dtype in [None, "float32"]:
+                        sf = Standardize(mode=mode, per_channel=per_channel,
+                                         dtype=dtype)
+                        batch_pp = sf.transform_batch(batch.copy())
+                        batch_ref = np.stack([sf.transform(img.copy()) \
+                                              for img in batch], axis=0)
+                        self.assertEqual(batch_pp.dtype, batch_ref.dtype)
+                        self.assertTrue(np.allclose(batch_pp, batch_ref,
+                                                    atol=1e-4))
+        sf = Standardize(mode="tf")
+        self.assertRaises(ValueError, sf.transform_batch,
+                          np.expand_dims(self.img3Dhu, axis=0))
+
+    def test_STANDARDIZE_dataset(self):
+        stats = {"mean": [10.0, 20.0, 30.0], "std": [2.0, 4.0, 5.0],
+                 "mean_global": 20.0, "std_global": 10.0}
+        sf = Standardize(mode="dataset", statistics=stats, per_channel=True)
+        img_pp = sf.transform(self.img2Drgb.copy())
+        img_ref = (self.img2Drgb - np.array([10.0, 20.0, 30.0]) + sf.e) / \
+                  (np.array([2.0, 4.0, 5.0]) + sf.e)
+        self.assertEqual(img_pp.dtype, np.float32)
+        self.assertTrue(np.allclose(img_pp, img_ref, atol=1e-4))
+        sf = Standardize(mode="dataset", statistics=stats)
+        img_pp = sf.transform(self.img3Dgray.copy())
+        img_ref = (self.img3Dgray - 20.0 + sf.e) / (10.0 + sf.e)
+        self.assertTrue(np.allclose(img_pp, img_ref, atol=1e-4))
+        batch = np.stack([self.img3Dgray, self.img3Dhu], axis=0)
+        self.assertTrue(np.allclose(sf.transform_batch(batch),
+                                    (batch - 20.0 + sf.e) / (10.0 + sf.e),
+                                    atol=1e-4))
+        self.assertRaises(ValueError, Standardize, mode="dataset")
+
     def test_STANDARDIZE_transform(self):
         # Custom implementations
         for mode in ["z-score", "minmax", "grayscale"]:
@@ -220,6 +304,35 @@ class SubfunctionsTEST(unittest.TestCase):
         self.assertTrue(np.array_equal(img_filtered.shape, (16, 24, 32, 3)))
         self.assertRaises(ValueError, sf.transform, self.img2Dgray.copy())
 
+    def test_COLORCONSTANCY_options(self):
+        # Compute reference via Shades of Gray on full-size arrays
+        img = self.img3Drgb.astype(np.float64)
+        rgb_vec = np.power(np.mean(np.power(img, 6), axis=(0,1,2)), 1/6)
+        rgb_vec = rgb_vec / np.sqrt(np.sum(np.power(rgb_vec, 2.0)))
+        img_ref = img / (rgb_vec * np.sqrt(3))
+        # Streaming estimation
+        sf = ColorConstancy()
+        img_filtered = sf.transform(self.img3Drgb.copy())
+        self.assertEqual(img_filtered.dtype, np.float32)
+        self.assertTrue(np.allclose(img_filtered, img_ref, rtol=1e-4))
+        # Estimation on downsampled image
+        sf = ColorConstancy(downsample=2)
+        img_filtered = sf.transform(self.img3Drgb.copy())
+        self.assertTrue(np.array_equal(img_filtered.shape, (16, 24, 32, 3)))
+        self.assertTrue(np.allclose(img_filtered, img_ref, rtol=0.1))
+        # In place application
+        sf = ColorConstancy(inplace=True)
+        img_input = self.img3Drgb.copy()
+        img_filtered = sf.transform(img_input)
+        self.assertIs(img_filtered, img_input)
+        self.assertTrue(np.allclose(img_filtered, img_ref, rtol=1e-4))
+        # Subfunction state (part of the cache configuration) is not modified
+        sf = ColorConstancy()
+        state = dict(vars(sf))
+        sf.transform(self.img3Drgb.copy())
+        sf.transform(self.img2Drgb.copy())
+        self.assertEqual(vars(sf), state)
+
     #-------------------------------------------------#
     #                Subfunction: Clip                #
     #-------------------------------------------------#
@@ -295,3 +408,76 @@ class SubfunctionsTEST(unittest.TestCase):
         self.assertTrue(np.array_equal(img_filtered.shape, (16, 24, 32, 3)))
         self.assertRaises(ValueError, sf.transform, self.img3Dhu.copy())
         self.assertRaises(ValueError, sf.transform, self.img2Drgb.copy())
+
+    def test_CHROMER_options(self):
+        # Broadcasted RGB
+        sf = Chromer(target="rgb", broadcast=True)
+        img_filtered = sf.transform(self.img3Dgray)
+        img_ref = Chromer(target="rgb").transform(self.img3Dgray)
+        self.assertTrue(np.array_equal(img_filtered, img_ref))
+        self.assertFalse(img_filtered.flags.writeable)
+        self.assertTrue(np.shares_memory(img_filtered, self.img3Dgray))
+        self.assertRaises(ValueError, sf.transform, self.img3Dhu.copy())
+        # Disabled range validation
+        sf = Chromer(target="rgb", validate=False)
+        img_filtered = sf.transform(self.img3Dhu.copy())
+        self.assertTrue(np.array_equal(img_filtered.shape, (16, 24, 32, 3)))
+        self.assertRaises(ValueError, sf.transform, self.img2Drgb.copy())
+        sf = Chromer(target="grayscale", validate=False)
+        img_filtered = sf.transform(self.img2Drgb * 2)
+        self.assertTrue(np.array_equal(img_filtered.shape, (16, 24, 1)))
+
+    #-------------------------------------------------#
+    #            Fused Subfunction Pipeline           #
+    #-------------------------------------------------#
+    def test_PIPELINE_transform(self):
+        chains = [[Padding(mode="square"), Crop(shape=(20, 20))],
+                  [Padding(mode="edge", shape=(20, 30)), Crop(shape=(18, 12)),
+                   Clip(min=20, max=200), Standardize(mode="z-score")],
+                  [Crop(shape=(8, 12)), Clip(min=10), Padding(mode="square")],
+                  [Clip(max=150), Clip(min=50), Standardize(mode="grayscale")],
+                  [Padding(mode="minimum", shape=(20, 30)), Crop(shape=(10, 10))]]
+        for img in [self.img2Dgray, self.img2Drgb,
+                    np.uint8(self.img2Drgb)]:
+            for chain in chains:
+                # Compute sequential result
+                img_seq = img.copy()
+                for sf in chain : img_seq = sf.transform(img_seq)
+                # Compute fused result
+                img_input = img.copy()
+                pipeline = sf_pipeline.Subfunction_Pipeline(chain,
+                                                            resize=Resize((8, 8)))
+                img_fused = pipeline.transform(img_input)
+                self.assertTrue(np.array_equal(img_input, img))
+                img_seq = Resize((8, 8)).transform(img_seq)
+                self.assertEqual(img_fused.dtype, img_seq.dtype)
+                self.assertTrue(np.array_equal(img_fused, img_seq))
+        # Volumes
+        chain = [Padding(mode="constant", shape=(20, 20, 20)),
+                 Crop(shape=(18, 16, 24)), Clip(min=-200, max=300),
+                 Standardize(mode="minmax")]
+        img_seq = self.img3Dhu
+        for sf in chain : img_seq = sf.transform(img_seq)
+        pipeline = sf_pipeline.Subfunction_Pipeline(chain)
+        self.assertEqual(len(pipeline.stages), 2)
+        img_fused = pipeline.transform(self.img3Dhu)
+        self.assertEqual(img_fused.dtype, img_seq.dtype)
+        self.assertTrue(np.array_equal(img_fused, img_seq))
+
+    #-------------------------------------------------#
+    #             Batch-wise Transformation           #
+    #-------------------------------------------------#
+    def test_BATCH_transform(self):
+        sf_list = [Padding(mode="square"), Padding(mode="edge", shape=(20, 30)),
+                   Clip(min=20, max=200), Chromer(target="grayscale"),
+                   ColorConstancy(), Crop(shape=(8, 12)), Resize((8, 8))]
+        batch = np.stack([self.img2Drgb, self.img2Drgb * 0.5,
+                          np.flip(self.img2Drgb, axis=0)], axis=0)
+        for sf in sf_list:
+            batch_sf = sf.transform_batch(batch.copy())
+            self.assertEqual(batch_sf.shape[0], 3)
+            for i in range(0, 3):
+                img_sf = sf.transform(batch[i].copy())
+                self.assertEqual(batch_sf[i].shape, img_sf.shape)
+                self.assertEqual(batch_sf[i].dtype, img_sf.dtype)
+                self.assertTrue(np.allclose(batch_sf[i], img_sf, atol=1e-4))
@@ -28,6 +28,9 @@ import os
 from tensorflow.keras.callbacks import CSVLogger
 #Internal libraries
 from aucmedi.utils.callbacks import *
+from aucmedi.utils.dataset_statistics import *
+from aucmedi.data_processing.io_loader import numpy_loader
+from aucmedi.data_processing.subfunctions import Standardize
 from aucmedi import *
 
 #-----------------------------------------------------#
@@ -85,3 +88,107 @@ class UtilityTEST(unittest.TestCase):
         for key in hist_returned:
             self.assertTrue(key in hist_returned and key in hist_loaded)
             self.assertTrue(len(hist_returned[key]) == len(hist_loaded[key]))
+
+    #-------------------------------------------------#
+    #               Dataset Statistics                #
+    #-------------------------------------------------#
+    def test_DatasetStatistics_streaming(self):
+        images = [np.random.rand(8, 8, 8, 2) * 1000 - 200 for i in range(0, 5)]
+        voxels = np.concatenate([np.reshape(img, (-1, 2)) for img in images])
+        # Sequential update
+        stats = DatasetStatistics()
+        for img in images : stats.update(img)
+        res = stats.get_statistics(percentiles=[1, 50, 99])
+        self.assertEqual(res["count"], 5 * 8 * 8 * 8)
+        self.assertTrue(np.allclose(res["mean"], np.mean(voxels, axis=0)))
+        self.assertTrue(np.allclose(res["std"], np.std(voxels, axis=0)))
+        self.assertTrue(np.allclose(res["min"], np.min(voxels, axis=0)))
+        self.assertTrue(np.allclose(res["max"], np.max(voxels, axis=0)))
+        self.assertTrue(np.isclose(res["mean_global"], np.mean(voxels)))
+        self.assertTrue(np.isclose(res["std_global"], np.std(voxels)))
+        self.assertTrue(np.allclose(res["percentiles"]["50"],
+                                    np.median(voxels, axis=0), rtol=0.1))
+        # Merge of partial statistics
+        stats_a = DatasetStatistics()
+        stats_b = DatasetStatistics()
+        for img in images[:2] : stats_a.update(img)
+        for img in images[2:] : stats_b.update(img)
+        stats_a.merge(stats_b)
+        res_merged = stats_a.get_statistics()
+        self.assertTrue(np.allclose(res_merged["mean"], res["mean"]))
+        self.assertTrue(np.allclose(res_merged["std"], res["std"]))
+        # Persistence
+        path_json = os.path.join(self.tmp_data.name, "stats.json")
+        res_saved = stats.save(path_json)
+        self.assertEqual(DatasetStatistics.load(path_json), res_saved)
+        self.assertRaises(ValueError, DatasetStatistics().get_statistics)
+
+    def test_DatasetStatistics_reservoir(self):
+        images = [np.random.rand(8, 8, 8, 2) * 1000 - 200 for i in range(0, 20)]
+        voxels = np.concatenate([np.reshape(img, (-1, 2)) for img in images])
+        # Sequential update with bounded reservoir
+        stats = DatasetStatistics(n_subsample=100, n_reservoir=500)
+        for i, img in enumerate(images):
+            stats.update(img, seed=i)
+            self.assertTrue(len(stats.subsample) <= 500)
+        self.assertEqual(stats.subsample.shape, (500, 2))
+        res = stats.get_statistics(percentiles=[50])
+        self.assertTrue(np.allclose(res["percentiles"]["50"],
+                                    np.median(voxels, axis=0), rtol=0.2))
+        # Merge of partial reservoirs is independent of the merge order
+        partials = []
+        for i, img in enumerate(images):
+            partial = DatasetStatistics(n_subsample=100, n_reservoir=500)
+            partial.update(img, seed=i)
+            partials.append(partial)
+        stats_merged = DatasetStatistics(n_subsample=100, n_reservoir=500)
+        for partial in reversed(partials) : stats_merged.merge(partial)
+        self.assertEqual(stats_merged.get_statistics(percentiles=[50])["percentiles"],
+                         res["percentiles"])
+
+    def test_DatasetStatistics_chunked(self):
+        images = [np.uint16(np.random.rand(16, 16, 16, 3) * 60000),
+                  np.float32(np.random.rand(16, 16, 16, 3) * 1000 + 1e4)]
+        for img in images:
+            voxels = np.reshape(img, (-1, 3)).astype(np.float64)
+            original = img.copy()
+            # Reduction in chunks smaller than the image
+            stats = DatasetStatistics()
+            stats.chunk_size = 1000
+            stats.update(img)
+            res = stats.get_statistics()
+            self.assertTrue(np.array_equal(img, original))
+            self.assertTrue(np.allclose(res["mean"], np.mean(voxels, axis=0)))
+            self.assertTrue(np.allclose(res["std"], np.std(voxels, axis=0)))
+            self.assertTrue(np.array_equal(res["min"], np.min(voxels, axis=0)))
+            self.assertTrue(np.array_equal(res["max"], np.max(voxels, axis=0)))
+
+    def test_DatasetStatistics_datagen(self):
+        tmp_vol = tempfile.TemporaryDirectory(prefix="tmp.aucmedi.",
+                                              suffix=".data")
+        samples = []
+        for i in range(0, 6):
+            np.save(os.path.join(tmp_vol.name, "vol_" + str(i) + ".npy"),
+                    np.random.rand(8, 8, 8, 1) * 1000 - 500)
+            samples.append("vol_" + str(i) + ".npy")
+        res = []
+        for workers in [1, 3]:
+            datagen = DataGenerator(samples, tmp_vol.name, batch_size=3,
+                                    loader=numpy_loader, two_dim=False,
+                                    grayscale=True,
+                                    resize=None, standardize_mode=None,
+                                    workers=workers)
+            path_json = os.path.join(tmp_vol.name, "stats.json")
+            res.append(compute_dataset_statistics(datagen, path=path_json))
+            datagen.close()
+        self.assertEqual(res[0], res[1])
+        # Dataset-wide standardization
+        for stats in [res[0], path_json]:
+            datagen = DataGenerator(samples, tmp_vol.name, batch_size=6,
+                                    loader=numpy_loader, two_dim=False,
+                                    grayscale=True,
+                                    resize=None, standardize_mode="dataset",
+                                    standardize_statistics=stats)
+            batch = datagen[0][0]
+            self.assertTrue(abs(np.mean(batch)) < 0.01)
+            self.assertTrue(abs(np.std(batch) - 1.0) < 0.01)